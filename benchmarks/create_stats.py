@@ -0,0 +1,58 @@
+"""
+Times translating every stats entry of a full-sized _all_players() response into Stats with
+EspnApi.create_stats. Run with:
+
+    python -m benchmarks.create_stats
+"""
+import random
+import time
+
+from espn.baseball.baseball_api import BaseballApi
+
+NUM_PLAYERS = 1500
+ENTRIES_PER_PLAYER = 4
+# ESPN sends values for many stat ids that are not tracked, as well as the ones that are
+NUM_STAT_IDS = 80
+
+
+def all_players_response():
+    rng = random.Random(0)
+    return [
+        {
+            "id": player_id,
+            "player": {
+                "stats": [
+                    {
+                        "stats": {
+                            str(stat_id): rng.random() * 100
+                            for stat_id in range(NUM_STAT_IDS)
+                            if rng.random() < 0.6
+                        }
+                    }
+                    for _ in range(ENTRIES_PER_PLAYER)
+                ]
+            },
+        }
+        for player_id in range(NUM_PLAYERS)
+    ]
+
+
+def create_all_stats(api, players):
+    return [
+        api.create_stats(entry["stats"])
+        for player in players
+        for entry in player["player"]["stats"]
+    ]
+
+
+def main():
+    api = BaseballApi(None, 0, 0)
+    players = all_players_response()
+    start = time.time()
+    all_stats = create_all_stats(api, players)
+    elapsed = time.time() - start
+    print(f"created {len(all_stats)} Stats in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
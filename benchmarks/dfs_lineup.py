@@ -0,0 +1,83 @@
+"""
+Finds the best daily fantasy football lineup from a synthetic slate, whole, with the branch and
+bound search, reporting the time taken and the partial lineups searched and pruned. Then finds the
+best NUM_LINEUPS lineups within overlap and exposure limits. Run with:
+
+    python -m benchmarks.dfs_lineup
+"""
+import random
+import time
+
+from espn.football.football_position import FootballPosition
+from espn.football.football_slot import FootballSlot
+from footballdiehards.dfs_projection import DFSProjection
+from optimize.dfs_lineup import BranchAndBound, PlayerPool, best_lineups
+
+SALARY_CAP = 50000
+NUM_LINEUPS = 20
+MAX_OVERLAP = 6
+MAX_EXPOSURE = 0.5
+SLOTS = {
+    FootballSlot.QUARTER_BACK: 1,
+    FootballSlot.RUNNING_BACK: 2,
+    FootballSlot.WIDE_RECEIVER: 3,
+    FootballSlot.TIGHT_END: 1,
+    FootballSlot.FLEX: 1,
+    FootballSlot.DEFENSE: 1,
+}
+SLATE_SIZES = {
+    FootballPosition.QUARTER_BACK: 24,
+    FootballPosition.RUNNING_BACK: 45,
+    FootballPosition.WIDE_RECEIVER: 70,
+    FootballPosition.TIGHT_END: 30,
+    FootballPosition.DEFENSE: 16,
+}
+# roughly what each position's salary buys, in points per thousand dollars
+POINTS_PER_THOUSAND = {
+    FootballPosition.QUARTER_BACK: 2.8,
+    FootballPosition.RUNNING_BACK: 2.4,
+    FootballPosition.WIDE_RECEIVER: 2.3,
+    FootballPosition.TIGHT_END: 2.1,
+    FootballPosition.DEFENSE: 2.5,
+}
+
+
+def slate(seed=0):
+    """
+    :param int seed: seeds the players' salaries and projections
+    :return PlayerPool: every player on the slate, by position, best projection first
+    """
+    rng = random.Random(seed)
+    player_dict = dict()
+    for pos, size in SLATE_SIZES.items():
+        players = []
+        for i in range(size):
+            salary = rng.randrange(2500, 9500, 100)
+            projection = salary / 1000 * POINTS_PER_THOUSAND[pos] * rng.uniform(0.6, 1.4)
+            players.append(DFSProjection(f"{pos} {i}", pos, salary, projection))
+        player_dict[pos] = sorted(players, key=lambda p: p.projection, reverse=True)
+    return PlayerPool(player_dict)
+
+
+def main():
+    for seed in range(3):
+        pool = slate(seed)
+        start = time.time()
+        search = BranchAndBound(pool, SLOTS, SALARY_CAP)
+        lineup = search.best()
+        print(
+            f"slate {seed}: {time.time() - start:6.2f}s  {lineup.total_points():.1f} points for"
+            f" ${lineup.total_salary()}, {search.nodes} partial lineups, {search.prunes} pruned"
+        )
+
+    for seed in range(3):
+        projections = [p for players in slate(seed).player_dict.values() for p in players]
+        solution = best_lineups(
+            projections, SLOTS, SALARY_CAP, NUM_LINEUPS, MAX_OVERLAP, MAX_EXPOSURE
+        )
+        points = [lineup.total_points() for lineup in solution.lineups]
+        print(f"slate {seed}: {solution}, {max(points):.1f} to {min(points):.1f} points")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Compares the time to value a finished draft by adding up each team's Stats and valuing one stat at
+a time, as DraftStateEvaluator used to, with adding up rows of its projection table and valuing
+every team and stat at once. Then compares valuing a larger league on its own. Run with:
+
+    python -m benchmarks.draft_evaluation
+"""
+import random
+import timeit
+
+import numpy as np
+
+from benchmarks.draft_search import draft
+from draft.draft_state import DraftState
+from draft.draft_state_evaluator import STAT_STD_DEVS, accrued_values_in_league
+from draft.test_draft_state_evaluator import accrued_value_in_league
+from espn.baseball.baseball_stat import BaseballStat
+from stats import Stats
+
+REPEATS = 2000
+LEAGUE_SIZE = 12
+LEAGUE_STATS = list(STAT_STD_DEVS)
+
+
+def summed_stats(evaluator, lineup):
+    total_stats = Stats({}, BaseballStat)
+    for p in lineup.starters():
+        total_stats += evaluator.player_projections[p.name]
+    for p in lineup.benched():
+        total_stats += evaluator.player_projections[p.name]
+    return total_stats
+
+
+def values_by_stat(stat_values, is_reverse, std_devs):
+    values = [0] * len(stat_values)
+    for column in range(len(std_devs)):
+        values_for_stat = accrued_value_in_league(
+            [team_values[column] for team_values in stat_values],
+            is_reverse[column],
+            std_devs[column],
+        )
+        for i, val in enumerate(values_for_stat):
+            values[i] += val
+    return values
+
+
+def old_terminal_state_value(evaluator, state):
+    totals = [summed_stats(evaluator, lineup) for lineup in state.lineups]
+    return values_by_stat(
+        [
+            [stats.unrounded_value_for_stat(ss.stat) for ss in evaluator.scoring_settings]
+            for stats in totals
+        ],
+        evaluator.is_reverse,
+        evaluator.std_devs,
+    )
+
+
+def first_terminal_state_value(evaluator, state, game_info):
+    evaluator.lineup_totals.clear()
+    return evaluator.terminal_state_value(state, game_info)
+
+
+def drafted_state(state):
+    """
+    :param DraftState state: a draft to finish
+    :return DraftState: the draft finished by every team picking the best player for its next
+    open slot in turn, regardless of the picks the search would consider
+    """
+    while not state.is_terminal():
+        open_slots = state.open_slots(state.lineups[state.current_drafter])
+        state = state.advance_state(
+            next(
+                p
+                for p in state.ranked_players
+                if p not in state.drafted and DraftState.slot_to_fill(open_slots, p)
+            )
+        )
+    return state
+
+
+def report(label, seconds):
+    print(f"{label:<40} {seconds / REPEATS * 1e6:8.1f}us")
+
+
+def main():
+    game_info, state, evaluator = draft()
+    state = drafted_state(state)
+
+    report(
+        "terminal value, summing Stats",
+        timeit.timeit(lambda: old_terminal_state_value(evaluator, state), number=REPEATS),
+    )
+    report(
+        "terminal value, projection table",
+        timeit.timeit(
+            lambda: first_terminal_state_value(evaluator, state, game_info), number=REPEATS
+        ),
+    )
+    report(
+        "terminal value, lineups already totalled",
+        timeit.timeit(
+            lambda: evaluator.terminal_state_value(state, game_info), number=REPEATS
+        ),
+    )
+
+    rng = random.Random(0)
+    league_values = np.array(
+        [[rng.gauss(100, 30) for _ in LEAGUE_STATS] for _ in range(LEAGUE_SIZE)]
+    )
+    is_reverse = np.array([s in {BaseballStat.ERA, BaseballStat.WHIP} for s in LEAGUE_STATS])
+    std_devs = np.array([STAT_STD_DEVS[s] for s in LEAGUE_STATS])
+    print(f"valuing {LEAGUE_SIZE} teams in {len(LEAGUE_STATS)} stats:")
+    report(
+        "  one stat at a time",
+        timeit.timeit(
+            lambda: values_by_stat(league_values.tolist(), is_reverse, std_devs),
+            number=REPEATS,
+        ),
+    )
+    report(
+        "  every stat at once",
+        timeit.timeit(
+            lambda: accrued_values_in_league(league_values, is_reverse, std_devs),
+            number=REPEATS,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
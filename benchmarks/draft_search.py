@@ -0,0 +1,168 @@
+"""
+Searches the next picks of a synthetic three-team draft with max_n, with and without a
+transposition table, reporting the nodes searched and table hits, then compares searching deeper
+with a table in this process and across one process per core. Last it deepens the search for
+TIME_LIMIT seconds, reporting each depth. Run with:
+
+    python -m benchmarks.draft_search
+"""
+import os
+import random
+import time
+
+from draft.draft_game_info import DraftGameInfo
+from draft.draft_state import DraftState
+from draft.draft_state_evaluator import DraftStateEvaluator
+from espn.baseball.baseball_position import BaseballPosition
+from espn.baseball.baseball_slot import BaseballSlot
+from espn.baseball.baseball_stat import BaseballStat
+from lineup import Lineup
+from lineup_settings import LineupSettings
+from minimax.iterative_deepening import iterative_deepening
+from minimax.max_n import DepthCutoff, MaxNStats, TranspositionTable, max_n
+from minimax.parallel_max_n import parallel_max_n
+from player import Player
+from scoring_setting import ScoringSetting
+from stats import Stats
+
+NUM_TEAMS = 3
+SEARCH_DEPTH = 5
+PARALLEL_SEARCH_DEPTH = 6
+TIME_LIMIT = 10.0
+LINEUP_SETTINGS = LineupSettings(
+    {
+        BaseballSlot.OUTFIELD: 2,
+        BaseballSlot.SHORT: 1,
+        BaseballSlot.PITCHER: 2,
+        BaseballSlot.UTIL: 1,
+        BaseballSlot.BENCH: 1,
+    }
+)
+SCORING_SETTINGS = [
+    ScoringSetting(BaseballStat.R, False, 0),
+    ScoringSetting(BaseballStat.HR, False, 0),
+    ScoringSetting(BaseballStat.SB, False, 0),
+    ScoringSetting(BaseballStat.OBP, False, 0),
+    ScoringSetting(BaseballStat.K, False, 0),
+    ScoringSetting(BaseballStat.ERA, True, 0),
+]
+
+
+def _hitter(rng, i, slots, position):
+    player = Player(f"Hitter {i}", None, None, i, slots, position)
+    at_bats = rng.uniform(400, 600)
+    walks = rng.uniform(30, 80)
+    projection = Stats(
+        {
+            BaseballStat.AB: at_bats,
+            BaseballStat.H: at_bats * rng.uniform(0.22, 0.31),
+            BaseballStat.BB: walks,
+            BaseballStat.PA: at_bats + walks,
+            BaseballStat.R: rng.uniform(50, 110),
+            BaseballStat.HR: rng.uniform(5, 40),
+            BaseballStat.SB: rng.uniform(0, 30),
+        },
+        BaseballStat,
+    )
+    return player, projection
+
+
+def _pitcher(rng, i):
+    player = Player(
+        f"Pitcher {i}", None, None, i, BaseballSlot.pitcher(), BaseballPosition.STARTER
+    )
+    outs = rng.uniform(300, 600)
+    projection = Stats(
+        {
+            BaseballStat.OUTS: outs,
+            BaseballStat.ER: outs / 27 * rng.uniform(2.5, 5.0),
+            BaseballStat.K: outs * rng.uniform(0.6, 1.2),
+        },
+        BaseballStat,
+    )
+    return player, projection
+
+
+def draft(seed=0):
+    """
+    :param int seed: seeds the players' projections
+    :return tuple: the game info, the state with the second team to pick, and the evaluator
+    """
+    rng = random.Random(seed)
+    players = []
+    for i in range(16):
+        players.append(_hitter(rng, i, BaseballSlot.outfield(), BaseballPosition.LEFT))
+    for i in range(16, 24):
+        players.append(_hitter(rng, i, BaseballSlot.short(), BaseballPosition.SHORT))
+    for i in range(24, 36):
+        players.append(_pitcher(rng, i))
+    projections = {player.name: projection for player, projection in players}
+    ranked = sorted(
+        (player for player, _ in players),
+        key=lambda p: -(projections[p.name].get(BaseballStat.R, 0) + 5 * p.espn_id % 7),
+    )
+
+    # every stat shares out 1 + 2 + ... + NUM_TEAMS between the teams
+    max_value = NUM_TEAMS * (NUM_TEAMS + 1) // 2 * len(SCORING_SETTINGS)
+    game_info = DraftGameInfo(NUM_TEAMS, max_value, LINEUP_SETTINGS)
+    lineups = [Lineup(dict(), BaseballSlot) for _ in range(NUM_TEAMS)]
+    state = DraftState(game_info, ranked, set(), lineups, 0, True).advance_state(ranked[0])
+    evaluator = DraftStateEvaluator(projections, SCORING_SETTINGS, ranked)
+    return game_info, state, evaluator
+
+
+def search(label, depth=SEARCH_DEPTH, **kwargs):
+    game_info, state, evaluator = draft()
+    stats = MaxNStats()
+    start = time.time()
+    result = max_n(
+        state,
+        state.current_drafter,
+        game_info.max_value,
+        game_info,
+        evaluator,
+        0,
+        DepthCutoff(depth),
+        stats=stats,
+        **kwargs,
+    )
+    print(f"{label:<16} {time.time() - start:6.2f}s  {stats}")
+    return result
+
+
+def search_in_parallel(label, depth):
+    game_info, state, evaluator = draft()
+    stats = MaxNStats()
+    start = time.time()
+    result = parallel_max_n(
+        state,
+        state.current_drafter,
+        game_info,
+        evaluator,
+        answer_now=DepthCutoff(depth),
+        stats=stats,
+    )
+    print(f"{label:<16} {time.time() - start:6.2f}s  {stats}")
+    return result
+
+
+def main():
+    baseline = search("plain")
+    with_table = search("table", table=TranspositionTable())
+    assert baseline.values == with_table.values
+
+    print(f"depth {PARALLEL_SEARCH_DEPTH} on {os.cpu_count()} cores:")
+    serial = search("table", PARALLEL_SEARCH_DEPTH, table=TranspositionTable())
+    in_parallel = search_in_parallel("parallel, table", PARALLEL_SEARCH_DEPTH)
+    assert serial.values == in_parallel.values
+
+    game_info, state, evaluator = draft()
+    deepened = iterative_deepening(
+        state, state.current_drafter, game_info, evaluator, time_limit=TIME_LIMIT
+    )
+    for depth_result in deepened.depths:
+        print(depth_result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Compares the lineup search as it was, copying a Lineup for every partial lineup on a list used as
+a queue, with the search over an indexed roster, with and without memoizing equivalent partial
+lineups, on a realistic 13-hitter roster. Run with:
+
+    python -m benchmarks.lineup_search
+"""
+import copy
+import time
+from itertools import combinations
+
+from espn.baseball.baseball_slot import BaseballSlot
+from lineup import Lineup
+from lineup_settings import LineupSettings
+from player import Player
+
+
+def _hitter(name, espn_id, *slot_sets):
+    positions = set()
+    for slots in slot_sets:
+        positions |= slots
+    return Player(name, None, None, espn_id, positions, None)
+
+
+ROSTER = {
+    BaseballSlot.CATCHER: [_hitter("Catcher", 1, BaseballSlot.catcher())],
+    BaseballSlot.FIRST: [_hitter("First", 2, BaseballSlot.first())],
+    BaseballSlot.SECOND: [_hitter("Second", 3, BaseballSlot.second(), BaseballSlot.outfield())],
+    BaseballSlot.THIRD: [_hitter("Third", 4, BaseballSlot.third(), BaseballSlot.first())],
+    BaseballSlot.SHORT: [_hitter("Short", 5, BaseballSlot.short(), BaseballSlot.second())],
+    BaseballSlot.MIDDLE_INFIELD: [_hitter("Middle", 6, BaseballSlot.second())],
+    BaseballSlot.CORNER_INFIELD: [_hitter("Corner", 7, BaseballSlot.third())],
+    BaseballSlot.OUTFIELD: [
+        _hitter("Outfield 1", 8, BaseballSlot.outfield()),
+        _hitter("Outfield 2", 9, BaseballSlot.outfield()),
+        _hitter("Outfield 3", 10, BaseballSlot.outfield(), BaseballSlot.first()),
+    ],
+    BaseballSlot.UTIL: [_hitter("Util", 11, BaseballSlot.first())],
+    BaseballSlot.BENCH: [
+        _hitter("Bench 1", 12, BaseballSlot.outfield(), BaseballSlot.third()),
+        _hitter("Bench 2", 13, BaseballSlot.short(), BaseballSlot.outfield()),
+    ],
+}
+
+SETTINGS = LineupSettings(
+    {
+        BaseballSlot.CATCHER: 1,
+        BaseballSlot.FIRST: 1,
+        BaseballSlot.SECOND: 1,
+        BaseballSlot.THIRD: 1,
+        BaseballSlot.SHORT: 1,
+        BaseballSlot.MIDDLE_INFIELD: 1,
+        BaseballSlot.CORNER_INFIELD: 1,
+        BaseballSlot.OUTFIELD: 3,
+        BaseballSlot.UTIL: 1,
+        BaseballSlot.BENCH: 2,
+    }
+)
+
+
+class BaselineSearchNode:
+    def __init__(self, lineup, players_left, slots_left):
+        """
+        A partial lineup as the search used to represent it: a whole Lineup, with lists of the
+        players and a set of the slots that are left.
+        """
+        self.lineup = lineup
+        self.players_left = players_left
+        self.slots_left = slots_left
+
+    def successors(self, lineup_settings):
+        next_slot = self.slots_left.pop()
+        slot_count = lineup_settings.slot_counts.get(next_slot)
+        candidates = Lineup.candidates(next_slot, self.players_left)
+        possible_combos = list(combinations(candidates, slot_count))
+        if len(possible_combos) == 0:
+            return [BaselineSearchNode(self.lineup, self.players_left, self.slots_left.copy())]
+        successors = []
+        for players in possible_combos:
+            new_lineup = self.lineup.copy()
+            new_lineup.player_dict[next_slot] = players
+            players_left = [p for p in copy.copy(self.players_left) if p not in players]
+            successors.append(
+                BaselineSearchNode(new_lineup, players_left, self.slots_left.copy())
+            )
+        return successors
+
+
+def baseline_possible_lineups(current, lineup_settings, slots_to_fill, search_info):
+    """
+    The lineup search as it was: depth first over whole Lineups, deduplicating the lineups with
+    the same starters only once they are complete.
+    """
+    possible_starters = [p for p in current.players() if p not in current.injured()]
+    frontier = [
+        BaselineSearchNode(Lineup(dict(), current.slot_enum), possible_starters, set(slots_to_fill))
+    ]
+    max_starters = lineup_settings.total_for_slots(slots_to_fill)
+    all_starters = dict()
+    total_proc = 0
+    max_stack = 0
+    while len(frontier) != 0:
+        node = frontier.pop(0)
+        successors = node.successors(lineup_settings)
+        total_proc += 1
+        max_stack = max(max_stack, len(frontier))
+        for successor in successors:
+            starters = successor.lineup.starters()
+            if len(starters) == max_starters:
+                closest = all_starters.get(starters, successor.lineup)
+                if len(current.transitions(closest)) < len(current.transitions(successor.lineup)):
+                    all_starters[starters] = closest
+                else:
+                    all_starters[starters] = successor.lineup
+            elif len(successor.slots_left) != 0:
+                frontier.insert(0, successor)
+    search_info.update({"total": total_proc, "max_stack": max_stack})
+    return all_starters.values()
+
+
+def report(label, possible_lineups):
+    info = dict()
+    start = time.time()
+    lineups = list(possible_lineups(info))
+    elapsed = time.time() - start
+    print(
+        f"{label:<13} nodes={info['total']:<8} max stack={info['max_stack']:<6} "
+        f"starter sets={len(lineups):<4} time={elapsed:.3f}s"
+    )
+    return {lineup.starters(): len(LINEUP.transitions(lineup)) for lineup in lineups}
+
+
+LINEUP = Lineup(ROSTER, BaseballSlot)
+
+
+def main():
+    baseline = report(
+        "baseline",
+        lambda info: baseline_possible_lineups(
+            LINEUP, SETTINGS, BaseballSlot.hitting_slots(), info
+        ),
+    )
+    for memoize in [False, True]:
+        result = report(
+            f"memoize={memoize}",
+            lambda info, memoize=memoize: LINEUP.possible_lineups(
+                SETTINGS, BaseballSlot.hitting_slots(), memoize, info
+            ),
+        )
+        # the same starters, each as close to the current lineup
+        assert result == baseline
+
+
+if __name__ == "__main__":
+    main()
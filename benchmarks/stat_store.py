@@ -0,0 +1,75 @@
+"""
+Compares loading a full league-season of archived stats from the old pickle tree with loading it
+from the sqlite StatStore. Run with:
+
+    python -m benchmarks.stat_store
+"""
+import pickle
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from espn.football.football_stat import FootballStat
+from espn.stat_store import StatStore, migrate_pickles
+from stats import Stats
+
+YEAR = 2021
+LEAGUE_ID = 1
+NUM_TEAMS = 12
+NUM_PERIODS = 120
+
+
+def _stats(team_id, period):
+    return Stats(
+        {stat: float(team_id * period % (i + 7)) for i, stat in enumerate(FootballStat)},
+        FootballStat,
+    )
+
+
+def write_pickles(stats_home):
+    for team_id in range(1, NUM_TEAMS + 1):
+        team_dir = stats_home / str(YEAR) / str(LEAGUE_ID) / str(team_id)
+        team_dir.mkdir(parents=True)
+        for period in range(1, NUM_PERIODS + 1):
+            (team_dir / f"{period}-stats.p").write_bytes(pickle.dumps(_stats(team_id, period)))
+
+
+def load_pickles(stats_home):
+    """
+    The way the pickle StatStore retrieved a team's stats, for every team in the league.
+    """
+    league_stats = dict()
+    for team_dir in (stats_home / str(YEAR) / str(LEAGUE_ID)).iterdir():
+        all_stats = dict()
+        for file in team_dir.iterdir():
+            match = re.search("([0-9]*)-stats.p", file.parts[-1])
+            all_stats[int(match.group(1))] = pickle.load(file.open("rb"))
+        league_stats[int(team_dir.name)] = all_stats
+    return league_stats
+
+
+def timed(label, fn):
+    start = time.time()
+    result = fn()
+    print(f"{label:<8} {time.time() - start:.3f}s")
+    return result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        stats_home = Path(tmp) / "stats"
+        db_path = Path(tmp) / "stats.db"
+        write_pickles(stats_home)
+        migrate_pickles(stats_home, db_path)
+        store = StatStore(LEAGUE_ID, YEAR, db_path)
+
+        print(f"{NUM_TEAMS} teams x {NUM_PERIODS} scoring periods")
+        from_pickles = timed("pickles", lambda: load_pickles(stats_home))
+        from_sqlite = timed("sqlite", store.retrieve_league_stats)
+        assert from_pickles.keys() == from_sqlite.keys()
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Compares the throughput of adding, scaling and computing ratio stats with the dictionary-backed
+Stats that the array-backed Stats replaced. Run with:
+
+    python -m benchmarks.stats
+"""
+import random
+import timeit
+
+from espn.baseball.baseball_stat import BaseballStat
+from stats import Stats
+
+NUM_PROJECTIONS = 300
+REPEATS = 20
+
+
+class DictStats:
+    """
+    Stats as they were before being array-backed, limited to what is measured here.
+    """
+
+    def __init__(self, stat_dict, stat_enum):
+        self.stat_dict = stat_dict
+        self.stat_enum = stat_enum
+
+    def __add__(self, other):
+        combined = dict()
+        sum_stats = self.stat_enum.sum_stats()
+        for k in sum_stats:
+            combined[k] = self.stat_dict.get(k, 0.0) + other.stat_dict.get(k, 0.0)
+        return DictStats(combined, self.stat_enum)
+
+    def __mul__(self, other):
+        scaled = dict()
+        for k in self.stat_enum.sum_stats().intersection(self.stat_dict.keys()):
+            scaled[k] = self.stat_dict[k] * other
+        return DictStats(scaled, self.stat_enum)
+
+    def average(self):
+        return round(
+            self.stat_dict.get(
+                BaseballStat.AVG,
+                self.stat_dict.get(BaseballStat.H) / self.stat_dict.get(BaseballStat.AB),
+            ),
+            3,
+        )
+
+    def era(self):
+        total = self.stat_dict.get(BaseballStat.ERA)
+        if total:
+            return round(total, 3)
+        earned_runs = self.stat_dict.get(BaseballStat.ER, 0)
+        outs = self.stat_dict.get(BaseballStat.OUTS, 1.0)
+        return round(earned_runs * 27.0 / outs, 3)
+
+
+def projections(stats_class):
+    rng = random.Random(0)
+    return [
+        stats_class(
+            {stat: float(rng.randint(1, 600)) for stat in BaseballStat.sum_stats()},
+            BaseballStat,
+        )
+        for _ in range(NUM_PROJECTIONS)
+    ]
+
+
+def add_all(all_stats):
+    total = all_stats[0]
+    for stats in all_stats[1:]:
+        total = total + stats
+    return total
+
+
+def iadd_all(all_stats):
+    total = Stats({}, BaseballStat)
+    for stats in all_stats:
+        total.iadd(stats)
+    return total
+
+
+def scale_all(all_stats):
+    return [stats * 0.5 for stats in all_stats]
+
+
+def ratios(all_stats):
+    return [(stats.average(), stats.era()) for stats in all_stats]
+
+
+def timed(label, fn, all_stats):
+    seconds = timeit.timeit(lambda: fn(all_stats), number=REPEATS)
+    per_second = NUM_PROJECTIONS * REPEATS / seconds
+    print(f"{label:<12} {per_second:>12,.0f} ops/s")
+    return per_second
+
+
+def main():
+    old = projections(DictStats)
+    new = projections(Stats)
+    assert add_all(old).stat_dict == add_all(new).stat_dict == iadd_all(new).stat_dict
+    assert ratios(old) == ratios(new)
+
+    for label, fn in [("add", add_all), ("mul", scale_all), ("ratio", ratios)]:
+        before = timed(f"old {label}", fn, old)
+        after = timed(f"new {label}", fn, new)
+        print(f"{label} speedup: {after / before:.1f}x")
+    timed("new iadd", iadd_all, new)
+
+
+if __name__ == "__main__":
+    main()
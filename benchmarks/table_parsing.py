@@ -0,0 +1,212 @@
+"""
+Compares scraping the projections pages of FantasyPros, NumberFire, FantasySP and FootballDieHards
+by parsing the whole page with requests-html or BeautifulSoup and walking its rows, as the scrapers
+used to, with streaming just the projections table through lxml. The pages are synthetic, shaped
+like each site's, and replayed from an offline page cache. Run with:
+
+    python -m benchmarks.table_parsing
+"""
+import random
+import tempfile
+import timeit
+
+from bs4 import BeautifulSoup
+from requests_html import HTML
+
+from fantasypros.api import FantasyProsApi
+from fantasysp.api import FantasySPApi
+from footballdiehards.api import FbDieHardsApi
+from numberfire.api import NumberFireApi
+from scraping.page_cache import PageCache
+
+REPEATS = 5
+NUM_PLAYERS = 600
+FANTASY_PROS_URL = "https://www.fantasypros.com/mlb/projections/hitters.php"
+FANTASY_SP_URL = "https://www.fantasysp.com/projections/basketball/daily/"
+FB_DIE_HARDS_URL = (
+    "https://www.footballdiehards.com/fantasyfootball/dailygames/FanDuel-Salary-data.cfm"
+)
+
+
+def _page(table, rng):
+    """
+    :return str: a page holding the table between the navigation, scripts and other tables that
+    surround it on a real page
+    """
+    nav = "".join(f'<li><a class="nav" href="/{i}">Link {i}</a></li>' for i in range(300))
+    data = ",".join(str(rng.random()) for _ in range(2000))
+    script = f"<script>var data = [{data}];</script>"
+    footer = "<table><tbody>" + "".join(
+        f"<tr><td>Other {i}</td><td>{i}</td></tr>" for i in range(300)
+    ) + "</tbody></table>"
+    return f"<html><head>{script}</head><body><ul>{nav}</ul>{table}{footer}</body></html>"
+
+
+def fantasy_pros_page(rng):
+    rows = "".join(
+        f'<tr class="mpb-player-{i}"><td><a class="player-name" href="/p/{i}">Hitter {i}</a>'
+        f' <small>(NYY - 1B)</small></td>'
+        + "".join(f"<td>{rng.randrange(0, 600)}</td>" for _ in range(14))
+        + "</tr>"
+        for i in range(NUM_PLAYERS)
+    )
+    return _page(f'<table id="data"><thead><tr><th>Player</th></tr></thead>'
+                 f"<tbody>{rows}</tbody></table>", rng)
+
+
+NUMBER_FIRE_CLASSES = ["pa", "bb", "1b", "2b", "3b", "hr", "r", "rbi", "sb", "k"]
+
+
+def number_fire_page(rng):
+    rows = "".join(
+        f'<tr><td class="player"><a class="full" href="/p/{i}">Batter {i}</a>'
+        f'<a class="abbrev">B. {i}</a></td>'
+        + "".join(f'<td class="{cls}">\n {rng.uniform(0, 5):.2f} \n</td>'
+                  for cls in NUMBER_FIRE_CLASSES)
+        + "</tr>"
+        for i in range(NUM_PLAYERS)
+    )
+    return _page(
+        f'<table class="stat-table"><tbody class="stat-table__body">{rows}</tbody></table>', rng
+    )
+
+
+def fantasy_sp_page(rng):
+    rows = "".join(
+        f'<tr class="projection-player"><td><a href="/p/{i}">Baller {i}</a></td>'
+        + "".join(f'<td class="{cls}">{rng.uniform(1, 40):.1f}</td>'
+                  for cls in FantasySPApi.td_class_to_stat)
+        + "</tr>"
+        for i in range(NUM_PLAYERS)
+    )
+    return _page(f'<table class="table sortable"><tr><th>Player</th></tr>{rows}</table>', rng)
+
+
+def fb_die_hards_page(rng):
+    positions = ["QB", "RB", "WR", "TE"]
+    rows = "".join(
+        f"<tr><td>Player {i}</td><td>{rng.choice(positions)}</td><td>BUF</td><td>MIA</td>"
+        f"<td>${rng.randrange(4000, 9000, 100)}</td>"
+        f"<td>{'-' if i % 10 == 0 else format(rng.uniform(2, 25), '.1f')}</td></tr>"
+        for i in range(NUM_PLAYERS)
+    )
+    return _page(f"<table><tr><th>FanDuel</th></tr><tr><th>Name</th></tr>{rows}</table>", rng)
+
+
+def old_fantasy_pros(page_cache):
+    rows = HTML(html=page_cache.get("fantasypros", FANTASY_PROS_URL)).find("tbody", first=True)
+    results = {}
+    for row in rows.find("tr"):
+        links = row.find("a")
+        link = next(filter(lambda a: "player-name" in a.attrs.get("class", []), links), None)
+        if link is None:
+            continue
+        cells = row.find("td")
+        results[link.text] = [int(cells[i].text) for i in [1, 2, 3, 4, 5, 8, 11]]
+    return results
+
+
+def old_number_fire(page_cache):
+    def find_with_class(elt, target_class):
+        return next(
+            filter(lambda a: a.has_attr("class") and target_class in a["class"], elt)
+        ).text.strip()
+
+    page = BeautifulSoup(
+        page_cache.get("numberfire", NumberFireApi.baseball_url, variant=[None, None]),
+        features="lxml",
+    )
+    table = next(
+        filter(
+            lambda tbody: tbody.has_attr("class") and "stat-table__body" in tbody["class"],
+            page.find_all("tbody"),
+        )
+    )
+    results = {}
+    for row in table.find_all("tr"):
+        tds = row.find_all("td")
+        results[find_with_class(row.find_all("a"), "full")] = [
+            float(find_with_class(tds, cls)) for cls in NUMBER_FIRE_CLASSES[:-1]
+        ]
+    return results
+
+
+def old_fantasy_sp(page_cache):
+    page = HTML(html=page_cache.get("fantasysp", FANTASY_SP_URL))
+    table = next(filter(lambda elt: "sortable" in elt.attrs.get("class", []), page.find("table")))
+    results = {}
+    for row in filter(lambda elt: "projection-player" in elt.attrs.get("class", []),
+                      table.find("tr")):
+        values = dict()
+        for td in row.find("td"):
+            for cls in td.attrs.get("class", []):
+                stat = FantasySPApi.td_class_to_stat.get(cls)
+                if stat:
+                    values[stat] = float(td.text)
+        results[row.find("a")[0].text] = values
+    return results
+
+
+def old_fb_die_hards(page_cache):
+    rows = HTML(html=page_cache.get("footballdiehards", FB_DIE_HARDS_URL)).find("tr")
+    results = []
+    for r in rows[2:]:
+        cells = r.find("td")
+        if len(cells) > 5 and cells[5].text != "-":
+            results.append((cells[0].text, cells[1].text, int(cells[4].text[1:]),
+                            float(cells[5].text)))
+    return results
+
+
+def new_fantasy_pros(page_cache):
+    return FantasyProsApi(page_cache).year_hitter_projections()
+
+
+def new_number_fire(page_cache):
+    # pylint: disable=protected-access
+    return NumberFireApi(page_cache)._get_hitter_projections_from_current_page()
+
+
+def new_fantasy_sp(page_cache):
+    return FantasySPApi(page_cache).players()
+
+
+def new_fb_die_hards(page_cache):
+    return FbDieHardsApi(page_cache).players()
+
+
+def captured_pages(directory):
+    rng = random.Random(0)
+    page_cache = PageCache(directory)
+    page_cache.capture("fantasypros", FANTASY_PROS_URL, fantasy_pros_page(rng))
+    page_cache.capture(
+        "numberfire", NumberFireApi.baseball_url, number_fire_page(rng), variant=[None, None]
+    )
+    page_cache.capture("fantasysp", FANTASY_SP_URL, fantasy_sp_page(rng))
+    page_cache.capture("footballdiehards", FB_DIE_HARDS_URL, fb_die_hards_page(rng))
+    return PageCache(directory, offline=True)
+
+
+def report(label, old, new, page_cache):
+    # both ways find the same players
+    assert len(old(page_cache)) == len(new(page_cache))
+    old_seconds = timeit.timeit(lambda: old(page_cache), number=REPEATS) / REPEATS
+    new_seconds = timeit.timeit(lambda: new(page_cache), number=REPEATS) / REPEATS
+    print(
+        f"{label:<18} whole page {old_seconds * 1000:7.1f}ms"
+        f"  streamed table {new_seconds * 1000:6.1f}ms  {old_seconds / new_seconds:5.1f}x"
+    )
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        pages = captured_pages(directory)
+        print(f"parsing {NUM_PLAYERS} players from each site:")
+        report("FantasyPros", old_fantasy_pros, new_fantasy_pros, pages)
+        report("NumberFire", old_number_fire, new_number_fire, pages)
+        report("FantasySP", old_fantasy_sp, new_fantasy_sp, pages)
+        report("FootballDieHards", old_fb_die_hards, new_fb_die_hards, pages)
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,8 @@ DEV_LOGGING = {
         "espn.trade_finder": {},
         "espn.trade_store": {},
         "espn.stat_store": {},
+        "espn.response_cache": {},
+        "espn.http_session": {},
         "draft.draft_state_evaluator": {},
         "dump": {},
         "lineup": {},
@@ -35,6 +37,8 @@ DEV_LOGGING = {
         "config.team_reader": {},
         "config.password_reader": {},
         "minimax.max_n": {},
+        "minimax.iterative_deepening": {},
+        "minimax.parallel_max_n": {},
         "notifications": {},
         "notifications.client.dev": {},
         "notifications.client.pushed": {},
@@ -45,6 +49,7 @@ DEV_LOGGING = {
         "fantasysp.api": {},
         "rankings.rankings": {},
         "rankings.baseball": {},
+        "scraping.page_cache": {},
         "sleeper.api": {},
         "tasks.set_lineup": {},
         "tasks.notify_new_trades": {},
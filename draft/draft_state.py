@@ -1,4 +1,3 @@
-from copy import copy, deepcopy
 from itertools import islice
 from typing import List, Optional
 
@@ -19,11 +18,24 @@ class DraftState(GameState):
         current_player: int,
         is_next_larger,
     ):
+        """
+        A point in a draft: who has been drafted onto which team, and who drafts next.
+
+        States are never changed once made, so that advancing shares everything that the pick
+        does not change with the state it came from: the ranked players, the drafted players, the
+        other teams' Lineups and the drafting team's other slots are never copied.
+        :param game_info: the rules of the draft
+        :param ranked_players: every player, best first
+        :param drafted: every player drafted so far
+        :param lineups: each team's drafted players, by team index
+        :param current_player: the index of the team drafting next
+        :param is_next_larger: whether the team after that has the next larger index
+        """
         super().__init__()
         self.game_info = game_info
         self.ranked_players = ranked_players
-        self.lineups = lineups
-        self.drafted = drafted
+        self.lineups = tuple(lineups)
+        self.drafted = frozenset(drafted)
         self.current_drafter = current_player
         self.is_next_larger = is_next_larger
 
@@ -33,23 +45,22 @@ class DraftState(GameState):
         :param baseball_player: the baseball player chosen by the current drafter
         :return DraftState: the advanced state
         """
-        relevant_lineup = self.lineups[self.current_drafter]
+        drafter = self.current_drafter
+        relevant_lineup = self.lineups[drafter]
         slot = DraftState.slot_to_fill(
             self.open_slots(relevant_lineup), baseball_player
         )
-        successor_lineups = copy(self.lineups)
-        next_lineup = deepcopy(relevant_lineup)
-        current_in_slot = next_lineup.player_dict.get(slot, [])
-        current_in_slot.append(baseball_player)
-        next_lineup.player_dict[slot] = current_in_slot
-        successor_lineups[self.current_drafter] = next_lineup
-        # add player to copy of drafted
-        successor_drafted = copy(self.drafted)
-        successor_drafted.add(baseball_player)
+        # a new list for the filled slot only; the lists of the other slots are shared
+        next_player_dict = dict(relevant_lineup.player_dict)
+        next_player_dict[slot] = next_player_dict.get(slot, []) + [baseball_player]
+        next_lineup = Lineup(next_player_dict, relevant_lineup.slot_enum)
+        successor_lineups = (
+            self.lineups[:drafter] + (next_lineup,) + self.lineups[drafter + 1:]
+        )
         return DraftState(
             self.game_info,
             self.ranked_players,
-            successor_drafted,
+            self.drafted | {baseball_player},
             successor_lineups,
             self._next_player(),
             self._next_direction(),
@@ -63,6 +74,26 @@ class DraftState(GameState):
             new_states.append(self.advance_state(baseball_player))
         return new_states
 
+    def transposition_key(self):
+        """
+        Identifies this state by who has been drafted onto which team and who drafts next, so
+        that states reached by picking the same players in a different order share a key.
+        :return tuple: the key for this state
+        """
+        return (
+            self.drafted,
+            tuple(
+                frozenset(
+                    (slot, frozenset(players))
+                    for slot, players in lineup.player_dict.items()
+                    if len(players) > 0
+                )
+                for lineup in self.lineups
+            ),
+            self.current_drafter,
+            self.is_next_larger,
+        )
+
     def _next_player(self):
         if self.current_drafter == 0:
             return 1 if self.is_next_larger else 0
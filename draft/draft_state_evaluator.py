@@ -1,14 +1,18 @@
+import itertools
 import logging
-from functools import reduce
-from math import isclose, sqrt
-from statistics import NormalDist
+from functools import lru_cache, reduce
+from math import erf, isclose, sqrt
 from typing import List, Optional
+from weakref import WeakKeyDictionary
+
+import numpy as np
 
 from draft.draft_game_info import DraftGameInfo
 from draft.draft_state import DraftState, slot_value
 from espn.baseball.baseball_position import BaseballPosition
 from espn.baseball.baseball_slot import BaseballSlot
 from espn.baseball.baseball_stat import BaseballStat
+from espn.stat_registry import stat_registry
 from lineup import Lineup
 from lineup_settings import LineupSettings
 from minimax.state_evaluator import StateEvaluator
@@ -18,6 +22,29 @@ from stats import Stats
 
 LOGGER = logging.getLogger("draft.draft_state_evaluator")
 
+# how far apart teams' year-end totals of each stat tend to be
+STAT_STD_DEVS = {
+    BaseballStat.R: 50.0,
+    BaseballStat.RBI: 100.0,
+    BaseballStat.AVG: 0.003,
+    BaseballStat.AB: 1000.0,
+    BaseballStat.H: 200.0,
+    BaseballStat.HR: 40.0,
+    BaseballStat.SB: 10.0,
+    BaseballStat.BB: 50.0,
+    BaseballStat.OBP: 0.008,
+    BaseballStat.W: 7.0,
+    BaseballStat.K: 100.0,
+    BaseballStat.SV: 10.0,
+    BaseballStat.ER: 50.0,
+    BaseballStat.OUTS: 200.0,
+    BaseballStat.ERA: 0.01,
+    BaseballStat.WHIP: 0.008,
+}
+
+# names that ranking sources spell differently from projection sources
+NAME_REPLACEMENTS = {"Nicholas Castellanos": "Nick Castellanos"}
+
 
 class DraftStateEvaluator(StateEvaluator):
     def __init__(
@@ -37,24 +64,60 @@ class DraftStateEvaluator(StateEvaluator):
         self.players_ranked = players_ranked
         self.averages_cache = dict()
         self.total_heuristics = 0
+        # the ranked players who can play each slot, found the first time the slot is filled
+        self.eligible_by_slot = dict()
+        # each lineup's cumulative stat values; draft states share the Lineups that a pick leaves
+        # unchanged, so only the drafting team's are calculated for a new state
+        self.lineup_totals = WeakKeyDictionary()
+
+        # every player's projected values that add up over a year, one row per player
+        self.registry = stat_registry(BaseballStat)
+        self.projection_rows = {name: i for i, name in enumerate(player_projections)}
+        self.projection_vectors = np.array(
+            [proj.values * self.registry.sum_mask for proj in player_projections.values()]
+        ).reshape(len(player_projections), self.registry.size)
+
+        self.std_devs = np.array([STAT_STD_DEVS[ss.stat] for ss in scoring_settings])
+        self.is_reverse = np.array([ss.is_reverse for ss in scoring_settings], dtype=bool)
+
+    def __getstate__(self):
+        # the weak references to lineups cannot be pickled, but are only a cache
+        state = dict(self.__dict__)
+        del state["lineup_totals"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lineup_totals = WeakKeyDictionary()
+
+    def _eligible(self, slot):
+        eligible = self.eligible_by_slot.get(slot)
+        if eligible is None:
+            eligible = [p for p in self.players_ranked if p.can_play(slot)]
+            self.eligible_by_slot[slot] = eligible
+        return eligible
 
     def _get_projection(self, name: str) -> Optional[Stats]:
-        replaced_name = {"Nicholas Castellanos": "Nick Castellanos"}.get(name, name)
+        replaced_name = NAME_REPLACEMENTS.get(name, name)
 
         proj = self.player_projections.get(replaced_name)
         if proj is None:
             LOGGER.warning(f"NO PROJECTIONS FOR {name}")
         return proj
 
+    def _projection_row(self, name: str) -> Optional[int]:
+        row = self.projection_rows.get(NAME_REPLACEMENTS.get(name, name))
+        if row is None:
+            LOGGER.warning(f"NO PROJECTIONS FOR {name}")
+        return row
+
     # @timed(LOGGER)
     def heuristic(self, game_state: DraftState, game_info: DraftGameInfo):
         self.total_heuristics += 1
         if self.total_heuristics % 1000 == 0:
             LOGGER.info(f"Calculated {self.total_heuristics} heuristics")
         empty_slots = slots_to_fill(game_state.lineups, game_info.lineup_settings)
-        available_players = list(
-            filter(lambda p: p not in game_state.drafted, self.players_ranked)
-        )
+        drafted = game_state.drafted
 
         best_available = dict()
         players_taken = set()
@@ -64,28 +127,27 @@ class DraftStateEvaluator(StateEvaluator):
             lambda s: s != BaseballSlot.INJURED, slot_counts.keys()
         )
         for slot in sorted(draftable_slots, key=slot_value, reverse=True):
-            if (slot, empty_slots[slot]) in self.averages_cache.keys():
-                best_available[slot] = []
-                continue
             players_needed = empty_slots[slot]
-            available_index = 0
-            while players_needed > 0 and available_index < len(available_players):
-                next_best = available_players[available_index]
-                if next_best not in players_taken and next_best.can_play(slot):
-                    best_available[slot] = best_available.get(slot, []) + [next_best]
+            if players_needed <= 0:
+                continue
+            # scan only as far down the rankings as it takes to fill the slot
+            for next_best in self._eligible(slot):
+                if next_best not in drafted and next_best not in players_taken:
+                    best_available.setdefault(slot, []).append(next_best)
                     players_taken.add(next_best)
                     players_needed -= 1
-                available_index += 1
+                    if players_needed == 0:
+                        break
 
         averages = {}
         for slot, players in best_available.items():
-            averages_cache_key = (slot, empty_slots[slot])
+            # the average depends only on which players fill the slot, so states that leave the
+            # same players available share it, whatever order they are evaluated in
+            averages_cache_key = (slot, tuple(players))
             cached = self.averages_cache.get(averages_cache_key)
             if cached is not None:
                 averages[slot] = cached
                 continue
-            # self.averages_cache[(slot, len(players))] =
-            # self.averages_cache.get((slot, len(players)), 0) + 1
             projections = list(
                 map(self._get_projection, map(lambda p: p.name, players))
             )
@@ -102,7 +164,7 @@ class DraftStateEvaluator(StateEvaluator):
                 amount_to_add = (
                     averages.get(slot, Stats({}, BaseballStat)) * count_to_fill
                 )
-                so_far += amount_to_add
+                so_far.iadd(amount_to_add)
             totals += [so_far]
         return self.values_from_totals(game_info, totals)
 
@@ -111,51 +173,45 @@ class DraftStateEvaluator(StateEvaluator):
         return self.values_from_totals(game_info, totals)
 
     def values_from_totals(self, game_info, totals):
-        values = [0] * game_info.total_players
-        stat_std_devs = {
-            BaseballStat.R: 50.0,
-            BaseballStat.RBI: 100.0,
-            BaseballStat.AVG: 0.003,
-            BaseballStat.AB: 1000.0,
-            BaseballStat.H: 200.0,
-            BaseballStat.HR: 40.0,
-            BaseballStat.SB: 10.0,
-            BaseballStat.BB: 50.0,
-            BaseballStat.OBP: 0.008,
-            BaseballStat.W: 7.0,
-            BaseballStat.K: 100.0,
-            BaseballStat.SV: 10.0,
-            BaseballStat.ER: 50.0,
-            BaseballStat.OUTS: 200.0,
-            BaseballStat.ERA: 0.01,
-            BaseballStat.WHIP: 0.008,
-        }
-        for ss in self.scoring_settings:
-            values_for_stat = _accrued_value_in_league(
-                [stats.unrounded_value_for_stat(ss.stat) for stats in totals],
-                ss.is_reverse,
-                stat_std_devs[ss.stat],
-            )
-            for i, val in enumerate(values_for_stat):
-                values[i] += val
-        return values
+        stat_values = np.empty((game_info.total_players, len(self.scoring_settings)))
+        summed = np.array([stats.values for stats in totals])
+        for column, ss in enumerate(self.scoring_settings):
+            if ss.stat in self.registry.sum_stats:
+                stat_values[:, column] = summed[:, self.registry.index[ss.stat]]
+            else:
+                stat_values[:, column] = [
+                    stats.unrounded_value_for_stat(ss.stat) for stats in totals
+                ]
+        return accrued_values_in_league(stat_values, self.is_reverse, self.std_devs)
 
     def _cumulative_stats(self, lineup: Lineup):
         """
         Calculates an approximation of the final statistics of this lineup, assuming
         ideal management (setting lineups daily, etc.)
+
+        Lineups are remembered with their stats, so must not be changed once evaluated.
         :param Lineup lineup: the lineup to examine and use to calculate stats
-        :return Stats: the accumulated, year-end total stats
+        :return Stats: the accumulated, year-end total stats, free for the caller to change
         """
-        total_stats = Stats({}, BaseballStat)
-        for p in lineup.starters():
-            total_stats += self._get_projection(p.name) or Stats({}, BaseballStat)
-        for p in lineup.benched():
-            total_stats += self._get_projection(p.name) or Stats(
-                {}, BaseballStat
-            ) * self.likelihood(p, lineup)
-
-        return total_stats
+        total = self.lineup_totals.get(lineup)
+        if total is None:
+            starting_slots = lineup.slot_enum.starting_slots()
+            starters = set()
+            for slot, players in lineup.player_dict.items():
+                if slot in starting_slots:
+                    starters.update(players)
+            rows = [
+                self._projection_row(p.name)
+                for p in itertools.chain(starters, lineup.benched())
+            ]
+            total = self.projection_vectors[[row for row in rows if row is not None]].sum(
+                axis=0
+            )
+            self.lineup_totals[lineup] = total
+        # pylint: disable=protected-access
+        return Stats._from_array(
+            total.copy(), self.registry.sum_bits, BaseballStat, self.registry
+        )
 
     def likelihood(self, p, lineup):
         """
@@ -217,32 +273,34 @@ def slots_to_fill(lineups: List[Lineup], settings: LineupSettings) -> dict:
     return empty_counts
 
 
-def _accrued_value_in_league(
-    stat_values: List[float], is_reverse: bool, std_dev
+# the error function of every value in an array at once
+_erf = np.vectorize(erf, otypes=[float])
+
+
+@lru_cache(maxsize=None)
+def _pairs(num_teams):
+    return np.triu_indices(num_teams, 1)
+
+
+def accrued_values_in_league(
+    stat_values: np.ndarray, is_reverse: np.ndarray, std_devs: np.ndarray
 ) -> List[float]:
     """
-    Given a list of accrued stat values, calculates the worth of each of those values.
-
-    Worth is assigned as follows: best value gets n, worst value gets 1. From there, adjust
-    the worth of each value based on distance to neighbors.
-    :param std_dev:
-    :param stat_values:
-    :param is_reverse:
-    :return:
+    Calculates the worth of each team's accrued stat values, summed over every stat, for all
+    teams and stats at once.
+    :param stat_values: each team's value for each stat, a row per team and a column per stat
+    :param is_reverse: for each stat, whether lower values are better
+    :param std_devs: for each stat, its standard deviation
+    :return: each team's total worth
     """
-    result = [1] * len(stat_values)
-    # pylint: disable=consider-using-enumerate
-    for first in range(0, len(stat_values)):
-        for second in range(first + 1, len(stat_values)):
-            mean_1 = stat_values[first]
-            mean_2 = stat_values[second]
-            variance = 2 * pow(std_dev, 2)
-            first_minus_second = NormalDist(mean_1 - mean_2, sqrt(variance))
-            p_second_greater = first_minus_second.cdf(0)
-            if is_reverse:
-                result[second] += 1 - p_second_greater
-                result[first] += p_second_greater
-            else:
-                result[second] += p_second_greater
-                result[first] += 1 - p_second_greater
-    return result
+    num_teams, num_stats = stat_values.shape
+    signed = np.where(is_reverse, -stat_values, stat_values)
+    first, second = _pairs(num_teams)
+    # the difference of two normal distributions with the same deviation
+    scale = np.sqrt(2 * np.square(std_devs)) * sqrt(2)
+    erfs = np.zeros((num_teams, num_teams, num_stats))
+    erfs[first, second] = _erf((signed[first] - signed[second]) / scale)
+    erfs[second, first] = -erfs[first, second]
+    # every team is worth 1, plus the chance of beating each other team, for every stat
+    p_beating_others = (num_teams - 1 + erfs.sum(axis=1)) / 2
+    return (1 + p_beating_others).sum(axis=1).tolist()
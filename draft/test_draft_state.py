@@ -132,3 +132,45 @@ class TestDraftState(TestCase):
     def test__next_direction_returning(self):
         ds = DraftState(self.info, [], {}, [], 2, False)
         self.assertFalse(ds._next_direction())
+
+    def test_transposition_key_ignores_pick_order(self):
+        reordered = DraftState(
+            self.info,
+            self.state.ranked_players,
+            set(self.state.drafted),
+            [
+                Lineup(
+                    {
+                        BaseballSlot.UTIL: [PlayerTest.santana],
+                        BaseballSlot.OUTFIELD: [PlayerTest.braun, PlayerTest.yelich],
+                        BaseballSlot.SHORT: [],
+                    },
+                    BaseballSlot,
+                ),
+                self.l2,
+                self.l3,
+            ],
+            0,
+            True,
+        )
+        self.assertEqual(
+            self.state.transposition_key(), reordered.transposition_key()
+        )
+        child_keys = {child.transposition_key() for child in self.state.children()}
+        self.assertEqual(4, len(child_keys))
+        self.assertNotIn(self.state.transposition_key(), child_keys)
+
+    def test_advance_state_shares_unchanged_structure(self):
+        child = self.state.advance_state(PlayerTest.rizzo)
+
+        self.assertIs(self.state.lineups[1], child.lineups[1])
+        self.assertIs(self.state.lineups[2], child.lineups[2])
+        parent_dict = self.state.lineups[0].player_dict
+        child_dict = child.lineups[0].player_dict
+        self.assertIs(parent_dict[BaseballSlot.OUTFIELD], child_dict[BaseballSlot.OUTFIELD])
+        self.assertIs(PlayerTest.rizzo, child_dict[BaseballSlot.BENCH][0])
+        # the parent is unchanged
+        self.assertNotIn(BaseballSlot.BENCH, parent_dict)
+        self.assertNotIn(PlayerTest.rizzo, self.state.drafted)
+        self.assertIn(PlayerTest.rizzo, child.drafted)
+        self.assertEqual(len(self.state.drafted) + 1, len(child.drafted))
@@ -1,10 +1,194 @@
+import pickle
+import random
+from functools import reduce
+from math import erf, sqrt
+from statistics import NormalDist
 from unittest import TestCase
 
-from draft.draft_state_evaluator import rank_values, slots_to_fill
+import numpy as np
+
+from draft.draft_game_info import DraftGameInfo
+from draft.draft_state import DraftState, slot_value
+from draft.draft_state_evaluator import (
+    STAT_STD_DEVS,
+    DraftStateEvaluator,
+    _erf,
+    accrued_values_in_league,
+    rank_values,
+    slots_to_fill,
+)
 from draft.test_draft_state import TestDraftState
 from espn.baseball.baseball_slot import BaseballSlot
+from espn.baseball.baseball_stat import BaseballStat
+from lineup import Lineup
+from scoring_setting import ScoringSetting
+from stats import Stats
+from test.test_player import PlayerTest
+
+
+def accrued_value_in_league(stat_values, is_reverse, std_dev):
+    """
+    How the worth of one stat's values was calculated before every stat was valued at once: best
+    value gets n, worst value gets 1, and from there the worth of each value is adjusted based on
+    the distance to its neighbors.
+    """
+    result = [1] * len(stat_values)
+    # pylint: disable=consider-using-enumerate
+    for first in range(0, len(stat_values)):
+        for second in range(first + 1, len(stat_values)):
+            mean_1 = stat_values[first]
+            mean_2 = stat_values[second]
+            variance = 2 * pow(std_dev, 2)
+            first_minus_second = NormalDist(mean_1 - mean_2, sqrt(variance))
+            p_second_greater = first_minus_second.cdf(0)
+            if is_reverse:
+                result[second] += 1 - p_second_greater
+                result[first] += p_second_greater
+            else:
+                result[second] += p_second_greater
+                result[first] += 1 - p_second_greater
+    return result
+
+
+class ScanningEvaluator(DraftStateEvaluator):
+    """
+    The heuristic as it was before it was incremental: scanning every ranked player for those
+    available, adding up every lineup's Stats from scratch, and valuing one stat at a time. Slot
+    averages are cached by the players filling the slot, as they are now.
+    """
+
+    def heuristic(self, game_state, game_info):
+        empty_slots = slots_to_fill(game_state.lineups, game_info.lineup_settings)
+        available_players = list(
+            filter(lambda p: p not in game_state.drafted, self.players_ranked)
+        )
+        best_available = dict()
+        players_taken = set()
+        slot_counts = game_info.lineup_settings.slot_counts
+        draftable_slots = filter(lambda s: s != BaseballSlot.INJURED, slot_counts.keys())
+        for slot in sorted(draftable_slots, key=slot_value, reverse=True):
+            players_needed = empty_slots[slot]
+            available_index = 0
+            while players_needed > 0 and available_index < len(available_players):
+                next_best = available_players[available_index]
+                if next_best not in players_taken and next_best.can_play(slot):
+                    best_available[slot] = best_available.get(slot, []) + [next_best]
+                    players_taken.add(next_best)
+                    players_needed -= 1
+                available_index += 1
 
+        averages = {}
+        for slot, players in best_available.items():
+            averages_cache_key = (slot, tuple(players))
+            cached = self.averages_cache.get(averages_cache_key)
+            if cached is not None:
+                averages[slot] = cached
+                continue
+            slot_projections = [self._get_projection(p.name) for p in players]
+            average = reduce(Stats.__add__, slot_projections) / len(players)
+            averages[slot] = average
+            self.averages_cache[averages_cache_key] = average
 
+        totals = []
+        for lineup in game_state.lineups:
+            so_far = self._cumulative_stats(lineup)
+            for slot, count in slot_counts.items():
+                count_to_fill = count - len(lineup.player_dict.get(slot, []))
+                so_far += averages.get(slot, Stats({}, BaseballStat)) * count_to_fill
+            totals += [so_far]
+        return self.values_from_totals(game_info, totals)
+
+    def _cumulative_stats(self, lineup):
+        total_stats = Stats({}, BaseballStat)
+        for p in lineup.starters():
+            total_stats += self._get_projection(p.name) or Stats({}, BaseballStat)
+        for p in lineup.benched():
+            total_stats += self._get_projection(p.name) or Stats(
+                {}, BaseballStat
+            ) * self.likelihood(p, lineup)
+        return total_stats
+
+    def values_from_totals(self, game_info, totals):
+        values = [0] * game_info.total_players
+        for ss in self.scoring_settings:
+            values_for_stat = accrued_value_in_league(
+                [stats.unrounded_value_for_stat(ss.stat) for stats in totals],
+                ss.is_reverse,
+                STAT_STD_DEVS[ss.stat],
+            )
+            for i, val in enumerate(values_for_stat):
+                values[i] += val
+        return values
+
+
+hitters = [
+    PlayerTest.springer,
+    PlayerTest.segura,
+    PlayerTest.rosario,
+    PlayerTest.peraza,
+    PlayerTest.braun,
+    PlayerTest.yelich,
+    PlayerTest.rizzo,
+    PlayerTest.choo,
+    PlayerTest.santana,
+    PlayerTest.muncy,
+]
+pitchers = [PlayerTest.degrom, PlayerTest.morton, PlayerTest.glasnow, PlayerTest.kimbrel]
+ranked = [
+    PlayerTest.springer,
+    PlayerTest.degrom,
+    PlayerTest.segura,
+    PlayerTest.rosario,
+    PlayerTest.morton,
+    PlayerTest.peraza,
+    PlayerTest.braun,
+    PlayerTest.glasnow,
+    PlayerTest.yelich,
+    PlayerTest.rizzo,
+    PlayerTest.kimbrel,
+    PlayerTest.choo,
+    PlayerTest.santana,
+    PlayerTest.muncy,
+]
+
+
+def projections():
+    projected = dict()
+    for i, hitter in enumerate(hitters):
+        projected[hitter.name] = Stats(
+            {
+                BaseballStat.AB: 500.0 + 7 * i,
+                BaseballStat.H: 130.0 + 3 * (i % 4),
+                BaseballStat.BB: 40.0 + i,
+                BaseballStat.PA: 540.0 + 8 * i,
+                BaseballStat.R: 90.0 - 2 * i,
+                BaseballStat.HR: 20.0 + (i * 7) % 11,
+                BaseballStat.SB: 5.0 + (i * 5) % 9,
+            },
+            BaseballStat,
+        )
+    for i, pitcher in enumerate(pitchers):
+        projected[pitcher.name] = Stats(
+            {
+                BaseballStat.OUTS: 500.0 - 30 * i,
+                BaseballStat.ER: 60.0 + 4 * i,
+                BaseballStat.K: 200.0 - 15 * i,
+            },
+            BaseballStat,
+        )
+    return projected
+
+
+scoring_settings = [
+    ScoringSetting(BaseballStat.R, False, 0),
+    ScoringSetting(BaseballStat.HR, False, 0),
+    ScoringSetting(BaseballStat.OBP, False, 0),
+    ScoringSetting(BaseballStat.K, False, 0),
+    ScoringSetting(BaseballStat.ERA, True, 0),
+]
+
+
+# pylint: disable=protected-access
 class TestDraftStateEvaluator(TestCase):
     def test_rank_values_single_value(self):
         self.assertEqual(rank_values([1.0], False), [1.0])
@@ -35,3 +219,97 @@ class TestDraftStateEvaluator(TestCase):
             BaseballSlot.BENCH: 3,
         }
         self.assertEqual(d, slots_to_fill(lineups, TestDraftState.ls))
+
+    def test_heuristic_matches_scanning_every_player(self):
+        info = DraftGameInfo(2, 30, TestDraftState.ls)
+        lineups = [Lineup(dict(), BaseballSlot) for _ in range(2)]
+        level = [DraftState(info, ranked, set(), lineups, 0, True)]
+        states = list(level)
+        # every state of the first three picks, and then the lines of picks to the end of some
+        for _ in range(3):
+            level = [child for state in level for child in state.children()]
+            states += level
+        for state in level[::7]:
+            children = state.children()
+            while len(children) > 0:
+                states.append(children[-1])
+                children = children[-1].children()
+
+        incremental = DraftStateEvaluator(projections(), scoring_settings, ranked)
+        scanning = ScanningEvaluator(projections(), scoring_settings, ranked)
+        for state in states:
+            if state.is_terminal():
+                self.assert_values_close(
+                    scanning.terminal_state_value(state, info),
+                    incremental.terminal_state_value(state, info),
+                )
+            else:
+                self.assert_values_close(
+                    scanning.heuristic(state, info), incremental.heuristic(state, info)
+                )
+        self.assertEqual(scanning.averages_cache.keys(), incremental.averages_cache.keys())
+
+    def test_heuristic_independent_of_evaluation_order(self):
+        info = DraftGameInfo(2, 30, TestDraftState.ls)
+        lineups = [Lineup(dict(), BaseballSlot) for _ in range(2)]
+        level = [DraftState(info, ranked, set(), lineups, 0, True)]
+        states = []
+        for _ in range(3):
+            level = [child for state in level for child in state.children()]
+            states += level
+
+        in_order = DraftStateEvaluator(projections(), scoring_settings, ranked)
+        expected = [in_order.heuristic(state, info) for state in states]
+        shuffled = list(enumerate(states))
+        random.Random(3).shuffle(shuffled)
+        reordered = DraftStateEvaluator(projections(), scoring_settings, ranked)
+        for i, state in shuffled:
+            self.assertEqual(expected[i], reordered.heuristic(state, info))
+            # and again, once its averages are cached
+            self.assertEqual(expected[i], reordered.heuristic(state, info))
+
+    def test_pickles_without_lineup_totals(self):
+        evaluator = DraftStateEvaluator(projections(), scoring_settings, ranked)
+        evaluator._cumulative_stats(TestDraftState.l1)
+        self.assertEqual(1, len(evaluator.lineup_totals))
+        unpickled = pickle.loads(pickle.dumps(evaluator))
+        self.assertEqual(0, len(unpickled.lineup_totals))
+        self.assertEqual(ranked, unpickled.players_ranked)
+
+    def test_accrued_values_match_each_stat_accrued(self):
+        rng = random.Random(5)
+        settings = list(scoring_settings) + [ScoringSetting(BaseballStat.SB, False, 0)]
+        for num_teams in [1, 2, 3, 10]:
+            stat_values = [
+                [rng.gauss(100, 30) for _ in settings] for _ in range(num_teams)
+            ]
+            # a tie
+            stat_values[-1][0] = stat_values[0][0]
+            expected = [0] * num_teams
+            for column, ss in enumerate(settings):
+                accrued = accrued_value_in_league(
+                    [values[column] for values in stat_values],
+                    ss.is_reverse,
+                    STAT_STD_DEVS[ss.stat],
+                )
+                for i, val in enumerate(accrued):
+                    expected[i] += val
+            self.assert_values_close(
+                expected,
+                accrued_values_in_league(
+                    np.array(stat_values),
+                    np.array([ss.is_reverse for ss in settings]),
+                    np.array([STAT_STD_DEVS[ss.stat] for ss in settings]),
+                ),
+            )
+
+    def test_erf_matches_math_erf(self):
+        xs = np.concatenate([np.linspace(-7, 7, 1001), [0.0, -0.0, 1e-300, 100.0, -np.inf, np.inf]])
+        np.testing.assert_array_equal(_erf(xs), [erf(x) for x in xs])
+        self.assertTrue(np.isnan(_erf(np.array([np.nan]))[0]))
+        self.assertEqual((2, 3), _erf(np.zeros((2, 3))).shape)
+
+    def assert_values_close(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        for e, a in zip(expected, actual):
+            self.assertAlmostEqual(e, a, places=9)
@@ -0,0 +1,31 @@
+import asyncio
+import functools
+
+
+class AsyncEspnApi:
+    def __init__(self, espn, executor=None):
+        """
+        Wraps an EspnApi so that each of its public methods is a coroutine, run on a thread of the
+        given executor so that the event loop is free while waiting on ESPN. The wrapped EspnApi
+        shares its pooled session and response cache across those threads.
+
+        e.g. `stats = await AsyncEspnApi(espn).scoring_period_stats(3)`
+        :param EspnApi espn: the api to wrap
+        :param Executor executor: where calls are run, by default the event loop's own executor
+        """
+        self.espn = espn
+        self.executor = executor
+
+    def __getattr__(self, name):
+        attr = getattr(self.espn, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, functools.partial(attr, *args, **kwargs)
+            )
+
+        return call
@@ -23,15 +23,25 @@ LOGGER = logging.getLogger("espn.baseball.api")
 
 
 class BaseballApi(EspnApi):
-    def __init__(self, session_provider, league_id, team_id):
+    def __init__(
+            self, session_provider, league_id, team_id, response_cache=None, http_settings=None
+    ):
         """
         Provides programmatic access to ESPN's fantasy baseball API for the given league and team,
         making calls to the underlying ESPN object
         :param EspnApi espn: authenticated access to ESPN
         :param int league_id: the league to access
         :param int team_id: the team to access
+        :param ResponseCache response_cache: where responses are cached
+        :param HttpSettings http_settings: how connections to ESPN are made
         """
-        super().__init__(session_provider, league_id, team_id)
+        super().__init__(
+            session_provider,
+            league_id,
+            team_id,
+            response_cache=response_cache,
+            http_settings=http_settings,
+        )
 
     def _api_url_segment(self):
         return "flb"
@@ -44,29 +54,44 @@ class BaseballApi(EspnApi):
         :param int player_id: the ESPN id of the player to check
         :return bool: whether or not the player is pitching today
         """
-        player_resp = self._player_request(player_id)
-        player = self.roster_entry_to_player(player_resp)
-        LOGGER.info(f"checking start status for {player.name}")
+        return player_id in self.probable_pitchers([player_id])
+
+    def probable_pitchers(self, player_ids):
+        """
+        Finds which of the Players with the given player ids are probable starting pitchers today.
+        All players are requested at once, and the schedule and scoring period are only fetched
+        once, no matter how many players are checked.
+        :param list player_ids: the ESPN ids of the players to check
+        :return set: the ids of the players that are pitching today
+        """
+        player_ids = list(player_ids)
+        if len(player_ids) == 0:
+            return set()
+        player_resps = self._players_request(player_ids)
 
         # get pro team schedule
         # get game id for pro team for today
         # get player's starter status from roster entry
-
         pro_schedule = self.pro_team_schedule()
-        players_team_schedule = pro_schedule[player.pro_team_id]
-        team_games_today = players_team_schedule.get(self.scoring_period(), list())
-        game_ids = {g.game_id for g in team_games_today}
-
-        starter_status_by_game = player_resp["starterStatusByProGame"]
-
-        is_starter = False
-
-        for game in game_ids:
-            if starter_status_by_game.get(str(game), "") == "PROBABLE":
-                is_starter = True
+        scoring_period = self.scoring_period()
+
+        starters = set()
+        for player_resp in player_resps:
+            player = self.roster_entry_to_player(player_resp)
+            LOGGER.info(f"checking start status for {player.name}")
+            players_team_schedule = pro_schedule.get(player.pro_team_id, dict())
+            team_games_today = players_team_schedule.get(scoring_period, list())
+            game_ids = {g.game_id for g in team_games_today}
+
+            starter_status_by_game = player_resp.get("starterStatusByProGame", dict())
+            is_starter = any(
+                starter_status_by_game.get(str(game), "") == "PROBABLE" for game in game_ids
+            )
 
-        LOGGER.info(f"{player.name} {'is starting' if is_starter else 'is not starting'}")
-        return is_starter
+            LOGGER.info(f"{player.name} {'is starting' if is_starter else 'is not starting'}")
+            if is_starter:
+                starters.add(player.espn_id)
+        return starters
 
     def _slot_enum(self):
         return BaseballSlot
@@ -86,6 +111,8 @@ class BaseballApi(EspnApi):
             self.__password = ""
             self.__league_id = 0
             self.__team_id = 0
+            self.__response_cache = None
+            self.__http_settings = None
 
         def username(self, username):
             self.__username = username
@@ -103,9 +130,19 @@ class BaseballApi(EspnApi):
             self.__team_id = team_id
             return self
 
+        def response_cache(self, response_cache):
+            self.__response_cache = response_cache
+            return self
+
+        def http_settings(self, http_settings):
+            self.__http_settings = http_settings
+            return self
+
         def build(self):
             return BaseballApi(
                 EspnSessionProvider(self.__username, self.__password),
                 self.__league_id,
                 self.__team_id,
+                response_cache=self.__response_cache,
+                http_settings=self.__http_settings,
             )
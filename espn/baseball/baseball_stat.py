@@ -29,22 +29,15 @@ class BaseballStat(Enum):
     SV = "SV"
     STARTER = "STARTER"
 
+    # stats are looked up in dicts and sets constantly; members are singletons, so hash them by
+    # identity rather than with Enum's hash of the member name
+    __hash__ = object.__hash__
+
     def is_hitting_stat(self):
-        return self in {
-            BaseballStat.AB,
-            BaseballStat.H,
-            BaseballStat.AVG,
-            BaseballStat.HR,
-            BaseballStat.BB,
-            BaseballStat.PA,
-            BaseballStat.OBP,
-            BaseballStat.R,
-            BaseballStat.RBI,
-            BaseballStat.SB,
-        }
+        return self in hitting_stats_set
 
     def num_rounding_digits(self):
-        return 3 if self in {BaseballStat.AVG, BaseballStat.OBP} else 2
+        return 3 if self in three_digit_stats_set else 2
 
     @staticmethod
     def sum_stats():
@@ -52,37 +45,10 @@ class BaseballStat(Enum):
 
     @staticmethod
     def espn_stat_to_stat(stat_id):
-        return {
-            0: BaseballStat.AB,
-            1: BaseballStat.H,
-            2: BaseballStat.AVG,
-            5: BaseballStat.HR,
-            10: BaseballStat.BB,
-            16: BaseballStat.PA,
-            17: BaseballStat.OBP,
-            20: BaseballStat.R,
-            21: BaseballStat.RBI,
-            23: BaseballStat.SB,
-            34: BaseballStat.OUTS,  # can derive IP
-            35: BaseballStat.BATTERS,
-            36: BaseballStat.PITCHES,
-            37: BaseballStat.P_H,
-            39: BaseballStat.P_BB,
-            41: BaseballStat.WHIP,
-            42: BaseballStat.HBP,
-            44: BaseballStat.P_R,
-            45: BaseballStat.ER,
-            46: BaseballStat.P_HR,
-            47: BaseballStat.ERA,
-            48: BaseballStat.K,
-            53: BaseballStat.W,
-            54: BaseballStat.L,
-            57: BaseballStat.SV,
-            99: BaseballStat.STARTER,
-        }.get(stat_id)
+        return espn_stats.get(stat_id)
 
 
-sum_stats_set = {
+sum_stats_set = frozenset({
     BaseballStat.AB,
     BaseballStat.H,
     BaseballStat.HR,
@@ -104,4 +70,48 @@ sum_stats_set = {
     BaseballStat.W,
     BaseballStat.L,
     BaseballStat.SV,
+})
+
+hitting_stats_set = frozenset({
+    BaseballStat.AB,
+    BaseballStat.H,
+    BaseballStat.AVG,
+    BaseballStat.HR,
+    BaseballStat.BB,
+    BaseballStat.PA,
+    BaseballStat.OBP,
+    BaseballStat.R,
+    BaseballStat.RBI,
+    BaseballStat.SB,
+})
+
+three_digit_stats_set = frozenset({BaseballStat.AVG, BaseballStat.OBP})
+
+espn_stats = {
+    0: BaseballStat.AB,
+    1: BaseballStat.H,
+    2: BaseballStat.AVG,
+    5: BaseballStat.HR,
+    10: BaseballStat.BB,
+    16: BaseballStat.PA,
+    17: BaseballStat.OBP,
+    20: BaseballStat.R,
+    21: BaseballStat.RBI,
+    23: BaseballStat.SB,
+    34: BaseballStat.OUTS,  # can derive IP
+    35: BaseballStat.BATTERS,
+    36: BaseballStat.PITCHES,
+    37: BaseballStat.P_H,
+    39: BaseballStat.P_BB,
+    41: BaseballStat.WHIP,
+    42: BaseballStat.HBP,
+    44: BaseballStat.P_R,
+    45: BaseballStat.ER,
+    46: BaseballStat.P_HR,
+    47: BaseballStat.ERA,
+    48: BaseballStat.K,
+    53: BaseballStat.W,
+    54: BaseballStat.L,
+    57: BaseballStat.SV,
+    99: BaseballStat.STARTER,
 }
@@ -29,6 +29,8 @@ class BasketballApi(EspnApi):
             self.__password = ""
             self.__league_id = 0
             self.__team_id = 0
+            self.__response_cache = None
+            self.__http_settings = None
 
         def username(self, username):
             self.__username = username
@@ -50,10 +52,20 @@ class BasketballApi(EspnApi):
             self.__year = year
             return self
 
+        def response_cache(self, response_cache):
+            self.__response_cache = response_cache
+            return self
+
+        def http_settings(self, http_settings):
+            self.__http_settings = http_settings
+            return self
+
         def build(self):
             return BasketballApi(
                 EspnSessionProvider(self.__username, self.__password),
                 self.__league_id,
                 self.__team_id,
                 self.__year,
+                response_cache=self.__response_cache,
+                http_settings=self.__http_settings,
             )
@@ -18,23 +18,13 @@ class BasketballStat(Enum):
     POINTS = "PTS"
     TURNOVERS = "TO"
 
+    # stats are looked up in dicts and sets constantly; members are singletons, so hash them by
+    # identity rather than with Enum's hash of the member name
+    __hash__ = object.__hash__
+
     @staticmethod
     def sum_stats():
-        return {
-            BasketballStat.MINUTES,
-            BasketballStat.FGM,
-            BasketballStat.FGA,
-            BasketballStat.FTM,
-            BasketballStat.FTA,
-            BasketballStat.THREES,
-            BasketballStat.TWOS,
-            BasketballStat.REBOUNDS,
-            BasketballStat.ASSISTS,
-            BasketballStat.STEALS,
-            BasketballStat.BLOCKS,
-            BasketballStat.POINTS,
-            BasketballStat.TURNOVERS,
-        }
+        return sum_stats_set
 
     # pylint: disable=no-self-use
     def num_rounding_digits(self):
@@ -42,19 +32,38 @@ class BasketballStat(Enum):
 
     @staticmethod
     def espn_stat_to_stat(stat_id):
-        return {
-            0: BasketballStat.POINTS,
-            1: BasketballStat.BLOCKS,
-            2: BasketballStat.STEALS,
-            3: BasketballStat.ASSISTS,
-            6: BasketballStat.REBOUNDS,
-            11: BasketballStat.TURNOVERS,
-            13: BasketballStat.FGM,
-            14: BasketballStat.FGA,
-            15: BasketballStat.FTM,
-            16: BasketballStat.FTA,
-            17: BasketballStat.THREES,
-            19: BasketballStat.FGPCT,
-            20: BasketballStat.FTPCT,
-            40: BasketballStat.MINUTES,
-        }.get(stat_id)
+        return espn_stats.get(stat_id)
+
+
+sum_stats_set = frozenset({
+    BasketballStat.MINUTES,
+    BasketballStat.FGM,
+    BasketballStat.FGA,
+    BasketballStat.FTM,
+    BasketballStat.FTA,
+    BasketballStat.THREES,
+    BasketballStat.TWOS,
+    BasketballStat.REBOUNDS,
+    BasketballStat.ASSISTS,
+    BasketballStat.STEALS,
+    BasketballStat.BLOCKS,
+    BasketballStat.POINTS,
+    BasketballStat.TURNOVERS,
+})
+
+espn_stats = {
+    0: BasketballStat.POINTS,
+    1: BasketballStat.BLOCKS,
+    2: BasketballStat.STEALS,
+    3: BasketballStat.ASSISTS,
+    6: BasketballStat.REBOUNDS,
+    11: BasketballStat.TURNOVERS,
+    13: BasketballStat.FGM,
+    14: BasketballStat.FGA,
+    15: BasketballStat.FTM,
+    16: BasketballStat.FTA,
+    17: BasketballStat.THREES,
+    19: BasketballStat.FGPCT,
+    20: BasketballStat.FTPCT,
+    40: BasketballStat.MINUTES,
+}
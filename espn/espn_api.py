@@ -1,11 +1,15 @@
 import json
 import logging
+import threading
 import time
 from abc import abstractmethod, ABCMeta
-from typing import Dict, List
-
-import requests
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterator, List, Tuple
 
+from espn.http_session import RateLimiter, session_for_user
+from espn.response_cache import shared_cache
+from espn.stat_registry import stat_registry
 from espn.team_schedule import ProTeamGame
 from league import League
 from lineup import Lineup
@@ -17,6 +21,10 @@ from team import Team
 
 LOGGER = logging.getLogger("espn.api")
 
+# how many player requests player_stats makes at once, and how many it may start each second
+PLAYER_STATS_WORKERS = 8
+PLAYER_STATS_REQUESTS_PER_SECOND = 10.0
+
 
 class EspnApiException(Exception):
     """
@@ -37,19 +45,47 @@ def _draft_strategy_json(rankings: List[Player]):
 
 
 class EspnApi(metaclass=ABCMeta):
-    def __init__(self, session_provider, league_id, team_id, year=2022):
+    def __init__(
+            self,
+            session_provider,
+            league_id,
+            team_id,
+            year=2022,
+            response_cache=None,
+            http_settings=None,
+    ):
         """
         Programmatic access to ESPN's (undocumented) API, caching requests that do not need
         refreshing, and automatically fetching a token for the user/password combination.
 
         :param EspnSessionProvider session_provider: using a username and password, provides
         and stores session tokens
+        :param ResponseCache response_cache: where responses are cached, by default the cache on
+        disk shared by every EspnApi
+        :param HttpSettings http_settings: how connections are made, if this is the first EspnApi
+        for the user; every EspnApi for the same user shares one pooled session
         """
         self.session_provider = session_provider
         self.league_id = league_id
         self.team_id = team_id
         self.year = year
-        self.cache = dict()
+        self._cache = response_cache
+        self._http = None
+        self._http_settings = http_settings
+        self.espn_s2 = None
+        self.login_lock = threading.Lock()
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            self._cache = shared_cache()
+        return self._cache
+
+    @property
+    def http(self):
+        if self._http is None:
+            self._http = session_for_user(self.session_provider.username, self._http_settings)
+        return self._http
 
     @abstractmethod
     def _stat_enum(self):
@@ -77,25 +113,35 @@ class EspnApi(metaclass=ABCMeta):
     def _espn_request(
             self, method, url, payload, headers=None, check_cache=True, retries=1
     ):
-        if check_cache and url in self.cache.keys():
-            return self.cache.get(url)
+        # responses differ by user, e.g. only members of a private league may see it
+        user = self.session_provider.username
+        if check_cache:
+            cached = self.cache.get(method, url, headers, payload, user)
+            if cached is not None:
+                LOGGER.debug(f"using cached response to {method} {url}")
+                return cached
         LOGGER.info(f"making {method} request to {url} in with headers {headers}")
         start_time = time.time()
-        k = self.session_provider.get_session()
-        cookies = {"espn_s2": k}
+        with self.login_lock:
+            if self.espn_s2 is None:
+                self.espn_s2 = self.session_provider.get_session()
+            cookies = {"espn_s2": self.espn_s2}
         response = None
         if method == "GET":
-            response = requests.get(url, headers=headers or {}, cookies=cookies)
+            response = self.http.get(url, headers=headers or {}, cookies=cookies)
         if method == "POST":
-            response = requests.post(
+            response = self.http.post(
                 url, headers=headers or {}, cookies=cookies, json=payload
             )
         if response is None:
             LOGGER.error("Got no response")
             raise EspnApiException(url)
         if response.status_code == 401:
-            LOGGER.warning("request denied, logging in again.")
-            self.session_provider.refresh_session()
+            with self.login_lock:
+                # requests made at the same time are all denied, but only one needs to log in
+                if self.espn_s2 == cookies["espn_s2"]:
+                    LOGGER.warning("request denied, logging in again.")
+                    self.espn_s2 = self.session_provider.refresh_session()
             return self._espn_request(
                 method=method,
                 url=url,
@@ -104,21 +150,12 @@ class EspnApi(metaclass=ABCMeta):
                 check_cache=check_cache,
             )
         if not response.ok:
+            # failed requests worth trying again have already been retried by the session
             elapsed_time = start_time - time.time()
             LOGGER.error(
                 f"received {response.status_code} {response.reason}: {response.text} in "
                 f"{elapsed_time :.3f} seconds"
             )
-            if retries > 0:
-                LOGGER.info("retrying request")
-                return self._espn_request(
-                    method=method,
-                    url=url,
-                    payload=payload,
-                    headers=headers,
-                    check_cache=check_cache,
-                    retries=retries - 1,
-                )
             raise EspnApiException(url)
         if response.text is None or response.text == "":
             LOGGER.error(
@@ -136,7 +173,12 @@ class EspnApi(metaclass=ABCMeta):
             raise EspnApiException(url)
         end_time = time.time()
         LOGGER.info("finished after %(time).3fs", {"time": end_time - start_time})
-        self.cache[url] = response
+        # requests that skip the cache are not kept in it either
+        if check_cache:
+            self.cache.put(method, url, headers, payload, response, user)
+        if method == "POST":
+            # the league has changed, so responses about it can no longer be trusted
+            self.cache.invalidate(self._base_url())
         return response
 
     def _espn_get(self, url, headers=None, check_cache=True):
@@ -284,15 +326,15 @@ class EspnApi(metaclass=ABCMeta):
         return self.lineup_slot_counts_to_lineup_settings(settings)
 
     def create_stats(self, espn_stats_dict):
+        stat_enum = self._stat_enum()
+        espn_stats = stat_registry(stat_enum).espn_stats
         transformed_stats = dict()
-        for stat_id_str in espn_stats_dict.keys():
-            stat_id = int(stat_id_str)
-            stat = self._stat_enum().espn_stat_to_stat(stat_id)
+        for stat_id, stat_val in espn_stats_dict.items():
+            stat = espn_stats.get(stat_id)
             if stat:
-                stat_val = float(espn_stats_dict.get(stat_id_str))
-                transformed_stats[stat] = stat_val
+                transformed_stats[stat] = float(stat_val)
 
-        return Stats(transformed_stats, self._stat_enum())
+        return Stats(transformed_stats, stat_enum)
 
     def year_stats(self):
         """
@@ -335,7 +377,7 @@ class EspnApi(metaclass=ABCMeta):
                 )
                 continue
             stats = self.create_stats(stats_dict["stats"])
-            total_stats += stats
+            total_stats.iadd(stats)
         return total_stats
 
     def scoring_period_stats(self, scoring_period):
@@ -365,26 +407,67 @@ class EspnApi(metaclass=ABCMeta):
             for stat_dict in relevant_stats
         }
 
-    def player_stats(self) -> Dict[Player, Dict[int, Stats]]:
+    def player_stats(
+            self,
+            max_workers=PLAYER_STATS_WORKERS,
+            requests_per_second=PLAYER_STATS_REQUESTS_PER_SECOND,
+    ) -> Dict[Player, Dict[int, Stats]]:
         """
         Return all players' stats in all scoring periods.
 
-        Expensive! Requires a separate HTTP request for each individual player.
+        Expensive! Requires a separate HTTP request for each individual player, though they are
+        made concurrently; see stream_player_stats.
+        :param int max_workers: how many requests to make at once
+        :param float requests_per_second: the most requests to start each second
         :return dict: Dictionary mapping player to all of their stats, keyed by scoring period
         """
-        player_stats = {}
+        return dict(self.stream_player_stats(max_workers, requests_per_second))
+
+    def stream_player_stats(
+            self,
+            max_workers=PLAYER_STATS_WORKERS,
+            requests_per_second=PLAYER_STATS_REQUESTS_PER_SECOND,
+    ) -> Iterator[Tuple[Player, Dict[int, Stats]]]:
+        """
+        Fetches every player's stats in all scoring periods, making a request per player from a
+        pool of threads, and yields each player with their stats as soon as they arrive.
+
+        At most max_workers requests are in flight at once, and no more than requests_per_second
+        are started each second, to stay under ESPN's throttling.
+        :param int max_workers: how many requests to make at once
+        :param float requests_per_second: the most requests to start each second
+        :return generator: pairs of Player and their stats, keyed by scoring period
+        """
         players = self._all_players()
         LOGGER.info(f"Parsing stats for {len(players)} players")
-        for player_obj in players:
-            try:
-                full_player_obj = self._player_request(player_obj["id"])
-                player = self.roster_entry_to_player(full_player_obj)
-                player_stats[player] = self._season_stats_from_player_stats_array(
-                    full_player_obj["stats"]
-                )
-            except ValueError:
-                LOGGER.error(f"Could not parse player from {player_obj['player']}")
-        return player_stats
+        rate_limiter = RateLimiter(requests_per_second)
+
+        def fetch(player_id):
+            rate_limiter.wait()
+            return self._player_request(player_id)
+
+        remaining = iter(players)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # keep each thread busy without queueing every player up front
+            pending = {
+                executor.submit(fetch, p["id"]): p
+                for p in islice(remaining, max_workers * 2)
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    player_obj = pending.pop(future)
+                    next_obj = next(remaining, None)
+                    if next_obj is not None:
+                        pending[executor.submit(fetch, next_obj["id"])] = next_obj
+                    try:
+                        full_player_obj = future.result()
+                        player = self.roster_entry_to_player(full_player_obj)
+                        yield player, self._season_stats_from_player_stats_array(
+                            full_player_obj["stats"]
+                        )
+                    except ValueError:
+                        LOGGER.error(f"Could not parse player from {player_obj['player']}")
 
     def scoring_settings(self):
         info = self.all_info().json()
@@ -395,7 +478,7 @@ class EspnApi(metaclass=ABCMeta):
         return {setting.stat: setting.points for setting in self.scoring_settings()}
 
     def _json_to_scoring_setting(self, item):
-        stat = self._stat_enum().espn_stat_to_stat(item["statId"])
+        stat = stat_registry(self._stat_enum()).espn_stats.get(item["statId"])
         points = item["pointsOverrides"].get(16, item["points"])
         return ScoringSetting(stat, item["isReverseItem"], points)
 
@@ -412,9 +495,19 @@ class EspnApi(metaclass=ABCMeta):
         :param int player_id: the id of the player to make the request about
         :return dict: the parsed response from ESPN
         """
+        return self._players_request([player_id])[0]
+
+    def _players_request(self, player_ids):
+        """
+        Makes a single request to ESPN for all of the players with the given ids and returns the
+        raw responses (parsed from JSON).
+        :param list player_ids: the ids of the players to make the request about
+        :return list: the parsed response from ESPN for each player
+        """
         filter_header = {
             "players": {
-                "filterIds": {"value": [player_id]},
+                "filterIds": {"value": list(player_ids)},
+                "limit": len(player_ids),
                 "filterStatsForTopScoringPeriodIds": {
                     "value": 16,
                     "additionalValue": [
@@ -432,7 +525,7 @@ class EspnApi(metaclass=ABCMeta):
             {"X-Fantasy-Filter": json.dumps(filter_header)},
             check_cache=False,
         )
-        return resp.json()["players"][0]["player"]
+        return [p["player"] for p in resp.json()["players"]]
 
     def _all_players(self):
         filter_header = {
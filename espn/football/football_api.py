@@ -31,6 +31,8 @@ class FootballApi(EspnApi):
             self.__password = ""
             self.__league_id = 0
             self.__team_id = 0
+            self.__response_cache = None
+            self.__http_settings = None
             self.__year = 2021
 
         def username(self, username):
@@ -53,10 +55,20 @@ class FootballApi(EspnApi):
             self.__year = year
             return self
 
+        def response_cache(self, response_cache):
+            self.__response_cache = response_cache
+            return self
+
+        def http_settings(self, http_settings):
+            self.__http_settings = http_settings
+            return self
+
         def build(self):
             return FootballApi(
                 EspnSessionProvider(self.__username, self.__password),
                 self.__league_id,
                 self.__team_id,
                 self.__year,
+                response_cache=self.__response_cache,
+                http_settings=self.__http_settings,
             )
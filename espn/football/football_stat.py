@@ -46,10 +46,13 @@ class FootballStat(Enum):
     INT_TD = "INT TD"
     FP = "FANTASY POINTS"
 
+    # stats are looked up in dicts and sets constantly; members are singletons, so hash them by
+    # identity rather than with Enum's hash of the member name
+    __hash__ = object.__hash__
+
     @staticmethod
     def sum_stats():
-        # pylint: disable=unnecessary-comprehension
-        return {s for s in FootballStat}
+        return sum_stats_set
 
     # pylint: disable=no-self-use
     def num_rounding_digits(self):
@@ -57,39 +60,44 @@ class FootballStat(Enum):
 
     @staticmethod
     def espn_stat_to_stat(stat_id):
-        return {
-            3: FootballStat.YDS_PASS,
-            4: FootballStat.TD_PASS,
-            19: FootballStat.TWOPT_PASS,
-            24: FootballStat.YDS_RUSH,
-            25: FootballStat.TD_RUSH,
-            26: FootballStat.TWOPT_RUSH,
-            42: FootballStat.YDS_REC,
-            43: FootballStat.TD_REC,
-            44: FootballStat.TWOPT_REC,
-            53: FootballStat.REC,
-            72: FootballStat.FUML,
-            89: FootballStat.PT_0,
-            90: FootballStat.PT_6,
-            91: FootballStat.PT_13,
-            92: FootballStat.PT_17,
-            93: FootballStat.BLK_TD,
-            95: FootballStat.INT_DEF,
-            96: FootballStat.FUMR,
-            97: FootballStat.BLK,
-            98: FootballStat.SFT,
-            99: FootballStat.SK,
-            101: FootballStat.KR_TD,
-            102: FootballStat.PR_TD,
-            103: FootballStat.FR_TD,
-            104: FootballStat.INT_TD,
-            123: FootballStat.PT_34,
-            124: FootballStat.PT_45,
-            129: FootballStat.YA_199,
-            130: FootballStat.YA_299,
-            132: FootballStat.YA_399,
-            133: FootballStat.YA_449,
-            134: FootballStat.YA_499,
-            135: FootballStat.YA_549,
-            136: FootballStat.YA_550,
-        }.get(stat_id)
+        return espn_stats.get(stat_id)
+
+
+sum_stats_set = frozenset(FootballStat)
+
+espn_stats = {
+    3: FootballStat.YDS_PASS,
+    4: FootballStat.TD_PASS,
+    19: FootballStat.TWOPT_PASS,
+    24: FootballStat.YDS_RUSH,
+    25: FootballStat.TD_RUSH,
+    26: FootballStat.TWOPT_RUSH,
+    42: FootballStat.YDS_REC,
+    43: FootballStat.TD_REC,
+    44: FootballStat.TWOPT_REC,
+    53: FootballStat.REC,
+    72: FootballStat.FUML,
+    89: FootballStat.PT_0,
+    90: FootballStat.PT_6,
+    91: FootballStat.PT_13,
+    92: FootballStat.PT_17,
+    93: FootballStat.BLK_TD,
+    95: FootballStat.INT_DEF,
+    96: FootballStat.FUMR,
+    97: FootballStat.BLK,
+    98: FootballStat.SFT,
+    99: FootballStat.SK,
+    101: FootballStat.KR_TD,
+    102: FootballStat.PR_TD,
+    103: FootballStat.FR_TD,
+    104: FootballStat.INT_TD,
+    123: FootballStat.PT_34,
+    124: FootballStat.PT_45,
+    129: FootballStat.YA_199,
+    130: FootballStat.YA_299,
+    132: FootballStat.YA_399,
+    133: FootballStat.YA_449,
+    134: FootballStat.YA_499,
+    135: FootballStat.YA_549,
+    136: FootballStat.YA_550,
+}
@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+LOGGER = logging.getLogger("espn.http_session")
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+# statuses worth trying again, as ESPN throttles and occasionally falls over
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpSettings:
+    def __init__(
+            self,
+            pool_size=DEFAULT_POOL_SIZE,
+            connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+            read_timeout=DEFAULT_READ_TIMEOUT,
+            retries=DEFAULT_RETRIES,
+            backoff_factor=DEFAULT_BACKOFF_FACTOR,
+    ):
+        """
+        How connections to ESPN are made and kept alive.
+        :param int pool_size: the most connections kept open to each host
+        :param float connect_timeout: seconds to wait for a connection to be made
+        :param float read_timeout: seconds to wait for the server to respond
+        :param int retries: how many times a failed idempotent request is tried again
+        :param float backoff_factor: retries wait backoff_factor * 2^(retry - 1) seconds
+        """
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+
+    @property
+    def timeout(self):
+        return self.connect_timeout, self.read_timeout
+
+    def retry(self):
+        """
+        :return Retry: the retry policy for requests; POSTs are not retried, and once retries run
+        out the last response is returned rather than raised, so callers can handle it
+        """
+        return Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False,
+        )
+
+
+class PooledSession(requests.Session):
+    def __init__(self, settings=None):
+        """
+        A requests.Session that keeps connections alive in a pool, retrying failed requests and
+        timing out any request that does not set its own timeout.
+        :param HttpSettings settings: how connections are made
+        """
+        super().__init__()
+        self.settings = settings or HttpSettings()
+        adapter = HTTPAdapter(
+            pool_connections=self.settings.pool_size,
+            pool_maxsize=self.settings.pool_size,
+            max_retries=self.settings.retry(),
+        )
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    # every other argument is passed on as it is, so need not be listed
+    # pylint: disable=arguments-differ
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.settings.timeout)
+        return super().request(method, url, **kwargs)
+
+
+class RateLimiter:
+    def __init__(self, requests_per_second, clock=time.monotonic, sleep=time.sleep):
+        """
+        Spaces out requests made from any number of threads so that no more than the given number
+        start in any second.
+        :param float requests_per_second: the most requests to start per second, or None for no
+        limit
+        """
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self.next_start = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """
+        Blocks until the calling thread may make its request.
+        """
+        with self.lock:
+            now = self.clock()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        if start > now:
+            self.sleep(start - now)
+
+
+_sessions = dict()
+_sessions_lock = threading.Lock()
+
+
+def session_for_user(username, settings=None):
+    """
+    Returns the session shared by every EspnApi for the given user, creating it with the given
+    settings if there is none yet.
+    :param str username: the ESPN user making requests
+    :param HttpSettings settings: how connections are made, if the session must be created
+    :return PooledSession: the user's session
+    """
+    with _sessions_lock:
+        session = _sessions.get(username)
+        if session is None:
+            LOGGER.debug(f"creating HTTP session for {username}")
+            session = PooledSession(settings)
+            _sessions[username] = session
+        return session
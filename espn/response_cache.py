@@ -0,0 +1,311 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+LOGGER = logging.getLogger("espn.response_cache")
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+# how long a response may be reused, by the first URL fragment that it contains. The order
+# matters: the all-info URL also includes view=mSettings, but holds live scoring.
+DEFAULT_TTLS = [
+    ("proTeamSchedules", 12 * HOUR),
+    ("view=mLiveScoring", 5 * MINUTE),
+    ("view=mSettings", 6 * HOUR),
+    ("view=mRoster", 5 * MINUTE),
+    ("view=kona_player_info", 30),
+]
+# anything else, e.g. the league itself for the current scoring period
+DEFAULT_TTL = 5 * MINUTE
+
+# the most responses kept on disk, after which the least recently used are evicted
+DEFAULT_MAX_ENTRIES = 2000
+# where the shared cache is kept, next to this module rather than wherever tasks are run from
+DEFAULT_PATH = Path(__file__).resolve().parent / "cache" / "responses.db"
+
+
+def cache_key(method, url, headers, payload, user=None):
+    """
+    Identifies a request by everything that can change its response.
+    :param str method: the HTTP method, e.g. GET
+    :param str url: the requested URL
+    :param dict headers: the headers sent with the request, e.g. an X-Fantasy-Filter
+    :param payload: the JSON body sent with the request
+    :param str user: who the request is made as, since ESPN answers each user with what they
+    can see, e.g. their own private leagues
+    :return str: a hash of the request
+    """
+    request = json.dumps(
+        [method, url, headers or {}, payload or {}, user], sort_keys=True, default=str
+    )
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+
+class TtlPolicy:
+    def __init__(self, ttls=None, default_ttl=DEFAULT_TTL):
+        """
+        Decides how long the response to each request may be reused.
+        :param list ttls: pairs of URL fragment and the seconds that responses for URLs containing
+        it live for, where the first matching fragment wins
+        :param int default_ttl: the seconds that responses for any other URL live for
+        """
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+
+    def ttl(self, method, url):
+        """
+        :param str method: the HTTP method of the request
+        :param str url: the requested URL
+        :return int: the number of seconds the response can be reused for, 0 if it must not be
+        """
+        if method != "GET":
+            return 0
+        return next((ttl for (fragment, ttl) in self.ttls if fragment in url), self.default_ttl)
+
+
+class CachedResponse:
+    def __init__(self, status_code, text, reason=""):
+        """
+        The parts of a requests.Response that are kept in the cache.
+        :param int status_code: the HTTP status of the response
+        :param str text: the body of the response
+        :param str reason: the HTTP reason phrase
+        """
+        self.status_code = status_code
+        self.text = text
+        self.reason = reason
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.text)
+
+    @staticmethod
+    def from_response(response):
+        return CachedResponse(response.status_code, response.text, response.reason)
+
+
+class CacheMetrics:
+    def __init__(self):
+        """
+        Counts how a ResponseCache has been used.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.hits} hits, {self.misses} misses ({self.expired} expired), "
+            f"{self.evictions} evictions, {self.hit_rate():.0%} hit rate"
+        )
+
+
+class ResponseCache:
+    def __init__(self, ttl_policy=None, clock=time.time):
+        """
+        A cache of responses from ESPN, which keeps each response for as long as its TTL allows.
+        Subclasses decide where responses are stored.
+        :param TtlPolicy ttl_policy: how long responses may be reused
+        :param clock: returns the current time, in seconds
+        """
+        self.ttl_policy = ttl_policy or TtlPolicy()
+        self.clock = clock
+        self.metrics = CacheMetrics()
+        self.lock = threading.Lock()
+
+    def get(self, method, url, headers=None, payload=None, user=None):
+        """
+        :return CachedResponse: the stored response for the request made as the user, or None if
+        it is not stored or has expired
+        """
+        key = cache_key(method, url, headers, payload, user)
+        with self.lock:
+            response, expired = self._lookup(key, self.clock())
+            if response is None:
+                self.metrics.misses += 1
+                if expired:
+                    self.metrics.expired += 1
+            else:
+                self.metrics.hits += 1
+        return response
+
+    def put(self, method, url, headers, payload, response, user=None):
+        """
+        Stores the response to the request made as the user, if its TTL allows it to be reused.
+        :param requests.Response response: the response to store
+        """
+        ttl = self.ttl_policy.ttl(method, url)
+        if ttl <= 0:
+            return
+        key = cache_key(method, url, headers, payload, user)
+        now = self.clock()
+        with self.lock:
+            self.metrics.evictions += self._store(
+                key, url, CachedResponse.from_response(response), now, now + ttl
+            )
+
+    def invalidate(self, url_prefix):
+        """
+        Forgets every response to a URL starting with the given prefix, e.g. after changing
+        the league with a POST.
+        :param str url_prefix: the start of the URLs to forget
+        """
+        with self.lock:
+            self._remove(url_prefix)
+
+    def _lookup(self, key, now):
+        """
+        :return tuple: the stored response (or None) and whether it was found but had expired
+        """
+        raise NotImplementedError()
+
+    def _store(self, key, url, response, now, expires_at):
+        """
+        :return int: the number of responses evicted to make room for this one
+        """
+        raise NotImplementedError()
+
+    def _remove(self, url_prefix):
+        raise NotImplementedError()
+
+
+class MemoryResponseCache(ResponseCache):
+    def __init__(self, ttl_policy=None, clock=time.time):
+        """
+        Keeps responses in memory, for the lifetime of the process.
+        """
+        super().__init__(ttl_policy, clock)
+        self.entries = dict()
+
+    def _lookup(self, key, now):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None, False
+        _, response, expires_at = entry
+        if expires_at <= now:
+            del self.entries[key]
+            return None, True
+        return response, False
+
+    def _store(self, key, url, response, now, expires_at):
+        self.entries[key] = (url, response, expires_at)
+        return 0
+
+    def _remove(self, url_prefix):
+        for key in [k for k, e in self.entries.items() if e[0].startswith(url_prefix)]:
+            del self.entries[key]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SqliteResponseCache(ResponseCache):
+    def __init__(
+            self, path, max_entries=DEFAULT_MAX_ENTRIES, ttl_policy=None, clock=time.time
+    ):
+        """
+        Keeps responses in a sqlite database on disk, so that they survive between runs, evicting
+        the least recently used once there are more than max_entries.
+        :param Path path: the database file, created if it does not exist
+        :param int max_entries: the most responses to keep
+        """
+        super().__init__(ttl_policy, clock)
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # shared by every thread using the cache, which is safe as all access holds the lock
+        self.connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " url TEXT NOT NULL,"
+                " status_code INTEGER NOT NULL,"
+                " reason TEXT NOT NULL,"
+                " body TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+            )
+
+    def _lookup(self, key, now):
+        row = self.connection.execute(
+            "SELECT status_code, reason, body, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None, False
+        status_code, reason, body, expires_at = row
+        with self.connection:
+            if expires_at <= now:
+                self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None, True
+            self.connection.execute(
+                "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+            )
+        return CachedResponse(status_code, body, reason), False
+
+    def _store(self, key, url, response, now, expires_at):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, url, status_code, reason, body, expires_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, response.status_code, response.reason or "", response.text,
+                 expires_at, now),
+            )
+            evicted = self.connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        if evicted > 0:
+            LOGGER.debug(f"evicted {evicted} responses from {self.path}")
+        return evicted
+
+    def _remove(self, url_prefix):
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM responses WHERE substr(url, 1, ?) = ?",
+                (len(url_prefix), url_prefix),
+            )
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+_shared_cache = None
+
+
+def shared_cache():
+    """
+    Returns the response cache on disk that every EspnApi shares by default, so that tasks run
+    back-to-back reuse each other's responses.
+    :return ResponseCache: the shared cache
+    """
+    # pylint: disable=global-statement
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = SqliteResponseCache(DEFAULT_PATH)
+    return _shared_cache
+
+
+def shared_cache_metrics():
+    """
+    :return CacheMetrics: how the shared cache has been used, or None if it has not been
+    """
+    return None if _shared_cache is None else _shared_cache.metrics
@@ -1,6 +1,8 @@
 import json
 import logging
+import threading
 import time
+from collections import defaultdict
 
 import requests
 
@@ -19,6 +21,16 @@ class LoginException(Exception):
 
 LOGGER = logging.getLogger("espn.api.espn_session_provider")
 
+# every provider for a user reads and writes the same session file, e.g. when teams are run at
+# once, so only one of them logs in or stores a session at a time
+_user_locks = defaultdict(threading.RLock)
+_user_locks_lock = threading.Lock()
+
+
+def _lock_for(username):
+    with _user_locks_lock:
+        return _user_locks[username]
+
 
 class EspnSessionProvider:
     LOGIN_URL = PROD_BASE_URL + "/guest/login?langPref=en-US"
@@ -63,13 +75,15 @@ class EspnSessionProvider:
         return key
 
     def get_session(self):
-        stored_val = self.session_store.retrieve_session(self.__session_key())
-        if stored_val:
-            LOGGER.info(f"Using stored session for user {self.username}")
-            return stored_val
-        return self.refresh_session()
+        with _lock_for(self.username):
+            stored_val = self.session_store.retrieve_session(self.__session_key())
+            if stored_val:
+                LOGGER.info(f"Using stored session for user {self.username}")
+                return stored_val
+            return self.refresh_session()
 
     def refresh_session(self):
-        session = self.__login()
-        self.session_store.store_session(self.__session_key(), session)
-        return session
+        with _lock_for(self.username):
+            session = self.__login()
+            self.session_store.store_session(self.__session_key(), session)
+            return session
@@ -0,0 +1,56 @@
+import numpy as np
+
+from espn.baseball import baseball_stat
+from espn.baseball.baseball_stat import BaseballStat
+from espn.basketball import basketball_stat
+from espn.basketball.basketball_stat import BasketballStat
+from espn.football import football_stat
+from espn.football.football_stat import FootballStat
+
+
+class StatRegistry:
+    def __init__(self, stat_enum, espn_stats, hitting_stats=frozenset()):
+        """
+        Everything about an enum of stats that is looked up while creating, combining and rounding
+        Stats, worked out once so that none of it is rebuilt per player or per stat.
+        :param stat_enum: the enum of stats
+        :param dict espn_stats: map of ESPN's stat id to the stat it identifies
+        :param frozenset hitting_stats: the stats that are accrued by hitters
+        """
+        self.stat_enum = stat_enum
+        # the fixed position of each stat in a Stats' array of values
+        self.members = tuple(stat_enum)
+        self.index = {stat: i for i, stat in enumerate(self.members)}
+        self.size = len(self.members)
+
+        self.sum_stats = frozenset(stat_enum.sum_stats())
+        # 1.0 where a stat is summed, 0.0 where it is dropped by adding or scaling
+        self.sum_mask = np.array([1.0 if s in self.sum_stats else 0.0 for s in self.members])
+        self.sum_bits = sum(1 << i for i, s in enumerate(self.members) if s in self.sum_stats)
+
+        self.rounding_digits = {stat: stat.num_rounding_digits() for stat in self.members}
+        self.hitting_stats = frozenset(hitting_stats)
+
+        # ESPN keys stats by string ids in stat objects, and by int ids in scoring settings
+        self.espn_stats = dict(espn_stats)
+        self.espn_stats.update({str(stat_id): stat for stat_id, stat in espn_stats.items()})
+
+
+_registries = {
+    registry.stat_enum: registry
+    for registry in (
+        StatRegistry(
+            BaseballStat, baseball_stat.espn_stats, baseball_stat.hitting_stats_set
+        ),
+        StatRegistry(BasketballStat, basketball_stat.espn_stats),
+        StatRegistry(FootballStat, football_stat.espn_stats),
+    )
+}
+
+
+def stat_registry(stat_enum):
+    """
+    :param stat_enum: the enum of stats
+    :return StatRegistry: the registry for that enum, shared by everything that uses it
+    """
+    return _registries[stat_enum]
@@ -1,82 +1,291 @@
+import json
 import logging
+import pickle
 import re
+import sqlite3
 from pathlib import Path
 
-import pickle
+from espn.baseball.baseball_stat import BaseballStat
+from espn.basketball.basketball_stat import BasketballStat
+from espn.football.football_stat import FootballStat
+from stats import Stats
 
 LOGGER = logging.getLogger("espn.stat_store")
 
+# where stats used to be pickled, as /{year}/{league_id}/{team_id}/{scoring-period}-stats.p
+PICKLE_STATS_HOME = Path(__file__).resolve().parent / "stats"
+# next to this module rather than wherever tasks are run from, which would start an empty database
+DEFAULT_DB_PATH = PICKLE_STATS_HOME / "stats.db"
+
+# the enums that stored stats may belong to, by name
+STAT_ENUMS = {e.__name__: e for e in (BaseballStat, BasketballStat, FootballStat)}
+
+
+def connect(db_path):
+    """
+    Opens the stats database at the given path, creating its table if necessary.
+
+    Each (team, scoring period) that has been archived has one row, holding its stat values as a
+    JSON object keyed by stat name, so a league's season is only a few thousand rows to read.
+    :param Path db_path: the database file
+    :return sqlite3.Connection: the open connection
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(db_path))
+    with connection:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS stats ("
+            " year INTEGER NOT NULL,"
+            " league_id INTEGER NOT NULL,"
+            " team_id INTEGER NOT NULL,"
+            " scoring_period INTEGER NOT NULL,"
+            " stat_enum TEXT NOT NULL,"
+            " stat_values TEXT NOT NULL,"
+            " PRIMARY KEY (year, league_id, team_id, scoring_period))"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            " year INTEGER NOT NULL,"
+            " league_id INTEGER NOT NULL,"
+            " scoring_period INTEGER NOT NULL,"
+            " PRIMARY KEY (year, league_id))"
+        )
+    return connection
+
+
+def _to_json(stats):
+    return json.dumps(
+        {stat.name: value for stat, value in stats.stat_dict.items() if value is not None}
+    )
+
+
+def _from_json(stat_enum_name, stat_values):
+    stat_enum = STAT_ENUMS[stat_enum_name]
+    members = stat_enum.__members__
+    return Stats(
+        {members[name]: value for name, value in json.loads(stat_values).items()}, stat_enum
+    )
+
 
 class StatStore:
-    def __init__(self, league_id, year):
+    def __init__(self, league_id, year, db_path=DEFAULT_DB_PATH):
         """
         Interface to a store of stats on disk for an ESPN league in a given year.
 
-        Stats are Stats objects, pickled and stored in the following format:
-
-        /espn/{year}/{league_id}/{team_id}/{scoring-period}-stats.p
+        Stats are kept in a sqlite database, keyed by league/team/scoring period, so that any
+        range of periods for a team, or the whole league's season, is read back with a single
+        query.
 
         :param int league_id: the league that this Store accesses
         :param int year: the year that this StatStore is working in
+        :param Path db_path: the database file shared by all leagues and years
         """
         self.league_id = league_id
         self.year = year
+        self.connection = connect(db_path)
 
-    @staticmethod
-    def check_dir(path):
+    def retrieve_stats(self, team_id):
         """
-        Checks that the given Path is an existing directory, creating it if necessary.
-        :param Path path: the path that should be a directory
-        :return Path: the created directory
+        Retrieves all stored stats for the given team, returning them as a dictionary
+        keyed by scoring period.
+        :param int team_id: the team for which to retrieve stats
+        :return dict: a dictionary mapping scoring period to Stats
         """
-        if not (path.exists() and path.is_dir()):
-            LOGGER.info(f"{path} does not exist, creating it now")
-            path.mkdir()
-        return path
+        return self.stats_for_periods(team_id)
 
-    def stat_dir(self, team_id):
+    def stats_for_periods(self, team_id, first_period=None, last_period=None):
         """
-        Returns the Path to the directory containing stats for the given team in this store.
-
-        Guaranteed to be an existing directory after this call.
-        :param int team_id: returns the directory for this team.
-        :return Path: the Path to this team's stats
+        Retrieves the stored stats for the given team in the given range of scoring periods.
+        :param int team_id: the team for which to retrieve stats
+        :param int first_period: the first scoring period to include, or None to start from the
+        first stored
+        :param int last_period: the last scoring period to include, or None to go through the last
+        stored
+        :return dict: a dictionary mapping scoring period to Stats
         """
-        stats_home = self.check_dir(Path("espn/stats"))
-        year_dir = self.check_dir(stats_home / str(self.year))
-        league_dir = self.check_dir(year_dir / str(self.league_id))
-        team_dir = self.check_dir(league_dir / str(team_id))
-        return team_dir
+        return self._query(
+            team_id, first_period, last_period
+        ).get(team_id, dict())
 
-    def retrieve_stats(self, team_id):
+    def retrieve_league_stats(self):
         """
-        Retrieves all stored stats for the given team, returning them as a dictionary
-        keyed by scoring period.
-        :param int team_id: the team for which to retrieve stats
-        :return dict: a dictionary mapping scoring period to Stats
+        Retrieves every team's stored stats for this league and year.
+        :return dict: a dictionary mapping team id to their Stats, keyed by scoring period
         """
+        return self._query()
+
+    def _query(self, team_id=None, first_period=None, last_period=None):
+        conditions = ["year = ?", "league_id = ?"]
+        params = [self.year, self.league_id]
+        if team_id is not None:
+            conditions.append("team_id = ?")
+            params.append(team_id)
+        if first_period is not None:
+            conditions.append("scoring_period >= ?")
+            params.append(first_period)
+        if last_period is not None:
+            conditions.append("scoring_period <= ?")
+            params.append(last_period)
+
         all_stats = dict()
-        team_stat_dir = self.stat_dir(team_id)
-        for file in team_stat_dir.iterdir():
-            file_name = file.parts[-1]
-            LOGGER.info(f"unpickling stats located at {file_name}")
-            match = re.search("([0-9]*)-stats.p", file_name)
-            scoring_period = int(match.group(1))
-            all_stats[scoring_period] = pickle.load(file.open("rb"))
+        for team, period, stat_enum_name, stat_values in self.connection.execute(
+                "SELECT team_id, scoring_period, stat_enum, stat_values FROM stats"
+                f" WHERE {' AND '.join(conditions)}",
+                params,
+        ):
+            all_stats.setdefault(team, dict())[period] = _from_json(stat_enum_name, stat_values)
         return all_stats
 
+    def stored_periods(self):
+        """
+        :return set: every (team id, scoring period) pair with stats stored for this league
+        """
+        return set(
+            self.connection.execute(
+                "SELECT team_id, scoring_period FROM stats WHERE year = ? AND league_id = ?",
+                (self.year, self.league_id),
+            )
+        )
+
+    def missing_periods(self, first_period, last_period, team_ids=None):
+        """
+        Finds the gaps in this store: the scoring periods in the given range for which some team
+        has no stats stored.
+        :param int first_period: the first scoring period to check
+        :param int last_period: the last scoring period to check
+        :param set team_ids: the teams that should have stats, by default every team with any
+        :return list: the scoring periods that are missing stats, in order
+        """
+        stored = self.stored_periods()
+        if team_ids is None:
+            team_ids = {team_id for (team_id, _) in stored}
+        return [
+            period
+            for period in range(first_period, last_period + 1)
+            if len(team_ids) == 0 or any((t, period) not in stored for t in team_ids)
+        ]
+
+    def watermark(self):
+        """
+        :return int: the scoring period through which every team's stats are stored, or None if
+        it has not been recorded
+        """
+        row = self.connection.execute(
+            "SELECT scoring_period FROM watermarks WHERE year = ? AND league_id = ?",
+            (self.year, self.league_id),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def update_watermark(self, complete_periods=()):
+        """
+        Advances the watermark past every following scoring period that has stats stored for all
+        teams, or is known to be complete, starting from the first stored period if there is no
+        watermark yet.
+        :param complete_periods: scoring periods whose stats were stored for every team in the
+        league at the time, such as periods just fetched whole, which are complete even if some
+        team has no stats for them, e.g. from before the team joined
+        :return int: the new watermark, or None if nothing is stored
+        """
+        stored = self.stored_periods()
+        if len(stored) == 0:
+            return None
+        team_ids = {team_id for (team_id, _) in stored}
+        complete_periods = set(complete_periods)
+        watermark = self.watermark()
+        if watermark is None:
+            watermark = min(period for (_, period) in stored) - 1
+        while watermark + 1 in complete_periods or all(
+                (t, watermark + 1) in stored for t in team_ids
+        ):
+            watermark += 1
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?)",
+                (self.year, self.league_id, watermark),
+            )
+        LOGGER.info(f"stats for league {self.league_id} stored through period {watermark}")
+        return watermark
+
     def store_stats(self, stats, team_id, scoring_period):
         """
-        Stores the given Stats for the team with the given scoring period, pickling the Stats
-        object and placing it on disk at the location indicated by the given info.
+        Stores the given Stats for the team with the given scoring period.
 
         Overwrites any existing Stats.
         :param Stats stats: the Stats to write to disk
         :param int team_id: the team to store the stats for
         :param int scoring_period: the scoring period that these Stats occurred in
         """
-        team_stats_dir = self.stat_dir(team_id)
-        file_name = f"{scoring_period}-stats.p"
-        stats_file = team_stats_dir / file_name
-        LOGGER.info(f"storing stats in file {file_name}")
-        stats_file.write_bytes(pickle.dumps(stats))
+        self.append({(team_id, scoring_period): stats})
+
+    def append(self, stats_by_team_period):
+        """
+        Stores many Stats at once, in a single transaction, overwriting any existing Stats for the
+        same team and scoring period.
+        :param dict stats_by_team_period: map of (team id, scoring period) to the Stats to store
+        """
+        LOGGER.info(
+            f"storing {len(stats_by_team_period)} stats for league {self.league_id} in {self.year}"
+        )
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO stats VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        self.year,
+                        self.league_id,
+                        team_id,
+                        scoring_period,
+                        stats.stat_enum.__name__,
+                        _to_json(stats),
+                    )
+                    for (team_id, scoring_period), stats in stats_by_team_period.items()
+                ],
+            )
+
+    def close(self):
+        self.connection.close()
+
+
+def migrate_pickles(stats_home=PICKLE_STATS_HOME, db_path=DEFAULT_DB_PATH):
+    """
+    Copies every pickled Stats under the given directory into the stats database, in the layout
+    that StatStore used to write:
+
+    {stats_home}/{year}/{league_id}/{team_id}/{scoring-period}-stats.p
+
+    The pickles are left where they are. Running this again overwrites the stats it copied.
+    :param Path stats_home: the directory that stats were pickled under
+    :param Path db_path: the database to copy them into
+    :return int: the number of Stats copied
+    """
+    stats_home = Path(stats_home)
+    to_store = dict()
+    for stats_file in stats_home.glob("*/*/*/*-stats.p"):
+        team_dir = stats_file.parent
+        league_dir = team_dir.parent
+        match = re.fullmatch("([0-9]+)-stats.p", stats_file.name)
+        dir_names = [team_dir.name, league_dir.name, league_dir.parent.name]
+        if match is None or not all(name.isdigit() for name in dir_names):
+            LOGGER.warning(f"skipping unrecognized file {stats_file}")
+            continue
+        store_key = (int(league_dir.parent.name), int(league_dir.name))
+        with stats_file.open("rb") as f:
+            stats = pickle.load(f)
+        to_store.setdefault(store_key, dict())[
+            (int(team_dir.name), int(match.group(1)))
+        ] = stats
+
+    migrated = 0
+    for (year, league_id), stats_by_team_period in to_store.items():
+        store = StatStore(league_id, year, db_path)
+        store.append(stats_by_team_period)
+        store.close()
+        migrated += len(stats_by_team_period)
+    LOGGER.info(f"migrated {migrated} pickled stats from {stats_home} to {db_path}")
+    return migrated
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    migrate_pickles()
@@ -2,9 +2,10 @@ import datetime
 import logging
 import time
 
-from requests_html import HTMLSession
+from requests_html import HTML, HTMLSession
 
 from espn.baseball.baseball_stat import BaseballStat
+from scraping.page_cache import shared_page_cache
 from stats import Stats
 
 LOGGER = logging.getLogger("fangraphs.api")
@@ -15,15 +16,19 @@ class FangraphsApi:
     Not useful anymore - they removed this page. 04-09-2022
     """
     @staticmethod
-    def hitter_projections():
+    def hitter_projections(page_cache=None):
         """
         Scrapes Fangraphs for today's projected stats for hitters
+        :param PageCache page_cache: where scraped pages are cached, by default the cache on disk
+        shared by every scraper
         :return: dictionary mapping hitter name to a Stats object
         """
-        session = HTMLSession()
+        page_cache = page_cache or shared_page_cache()
         start_time = time.time()
         LOGGER.info("retrieving hitting projections from Fangraphs")
-        r = session.post(
+        # the form data is part of the cache key, so a different page of the board is its own page
+        html = page_cache.get(
+            "fangraphs",
             "https://www.fangraphs.com/dailyprojections.aspx"
             "?pos=all"
             "&stats=bat"
@@ -31,6 +36,7 @@ class FangraphsApi:
             "&team=0"
             "&lg=all"
             "&players=0",
+            method="POST",
             data={
                 "__EVENTTARGET": "DFSBoard1$dg1",
                 "__EVENTARGUMENT": "FireCommand:DFSBoard1$dg1$ctl00;PageSize;1000",
@@ -44,7 +50,7 @@ class FangraphsApi:
         )
         # need event target, event argument and viewstate... :(
 
-        table = r.html.find("#DFSBoard1_dg1_ctl00", first=True)
+        table = HTML(html=html).find("#DFSBoard1_dg1_ctl00", first=True)
         body = table.find("tbody", first=True)
         tr = body.find("tr")
 
@@ -91,13 +97,16 @@ class FangraphsApi:
         return Stats(stats_dict, BaseballStat)
 
     @staticmethod
-    def pitcher_projections():
+    def pitcher_projections(page_cache=None):
         """
         Scrapes Fangraphs for today's projected stats for pitchers
+        :param PageCache page_cache: where scraped pages are cached, by default the cache on disk
+        shared by every scraper
         :return: dictionary mapping Pitcher name to a Stats object
         """
-        session = HTMLSession()
-        r = session.get(
+        page_cache = page_cache or shared_page_cache()
+        html = page_cache.get(
+            "fangraphs",
             "https://www.fangraphs.com/dailyprojections.aspx"
             "?pos=all"
             "&stats=pit"
@@ -107,7 +116,7 @@ class FangraphsApi:
             "&players=0"
         )
 
-        table = r.html.find("#DFSBoard1_dg1_ctl00", first=True)
+        table = HTML(html=html).find("#DFSBoard1_dg1_ctl00", first=True)
         body = table.find("tbody", first=True)
         tr = body.find("tr")
 
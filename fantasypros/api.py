@@ -1,14 +1,13 @@
 import logging
-import pickle
-from datetime import date
-from pathlib import Path
 from typing import Dict, List
 
-from requests_html import HTMLSession
+from requests_html import HTML
 
 from espn.baseball.baseball_stat import BaseballStat
 from espn.football.football_position import FootballPosition
 from espn.football.football_stat import FootballStat
+from scraping.page_cache import shared_page_cache
+from scraping.tables import Column, Table
 from stats import Stats
 from timing.timed import timed
 
@@ -16,22 +15,19 @@ LOGGER = logging.getLogger("fantasypros.api")
 
 
 class FantasyProsApi:
-    def __init__(self):
-        pass
-
-    @staticmethod
-    def _path_segment(url):
-        if "hitters" in url:
-            return "hitters"
-        if "pitchers" in url:
-            return "pitchers"
-        return None
+    def __init__(self, page_cache=None):
+        """
+        :param PageCache page_cache: where scraped pages are cached, by default the cache on disk
+        shared by every scraper
+        """
+        self.page_cache = page_cache or shared_page_cache()
 
     @timed(LOGGER)
+    def html(self, url):
+        return self.page_cache.get("fantasypros", url)
+
     def page(self, url):
-        session = HTMLSession()
-        r = session.get(url)
-        return r.html
+        return HTML(html=self.html(url))
 
     def table_rows(self, url):
         page = self.page(url)
@@ -53,17 +49,46 @@ class FantasyProsApi:
         rank_cell = cells[2]
         return int(rank_cell.text) if rank_cell is not None and rank_cell.text != '' else None
 
+    # the projections are in the first tbody, in rows with a link to the player
+    hitter_table = Table(
+        "tbody tr",
+        [
+            Column("name", "a.player-name", required=True),
+            Column("ab", 1, int),
+            Column("r", 2, int),
+            Column("hr", 3, int),
+            Column("rbi", 4, int),
+            Column("sb", 5, int),
+            Column("h", 8, int),
+            Column("bb", 11, int),
+        ],
+        until="tbody",
+    )
+    pitcher_table = Table(
+        "tbody tr",
+        [
+            Column("name", "a.player-name", required=True),
+            Column("ip", 1, float),
+            Column("k", 2, int),
+            Column("w", 3, int),
+            Column("sv", 4, int),
+            Column("er", 7, int),
+            Column("h", 8, int),
+            Column("bb", 9, int),
+        ],
+        until="tbody",
+    )
+
     @staticmethod
     def hitter_stats_from_row(row):
-        cells = row.find("td")
         stats_dict = {
-            BaseballStat.AB: int(cells[1].text),
-            BaseballStat.R: int(cells[2].text),
-            BaseballStat.HR: int(cells[3].text),
-            BaseballStat.RBI: int(cells[4].text),
-            BaseballStat.SB: int(cells[5].text),
-            BaseballStat.H: int(cells[8].text),
-            BaseballStat.BB: int(cells[11].text),
+            BaseballStat.AB: row.ab,
+            BaseballStat.R: row.r,
+            BaseballStat.HR: row.hr,
+            BaseballStat.RBI: row.rbi,
+            BaseballStat.SB: row.sb,
+            BaseballStat.H: row.h,
+            BaseballStat.BB: row.bb,
         }
         # approximate plate appearances as at-bats plus walks
         stats_dict[BaseballStat.PA] = (
@@ -73,44 +98,24 @@ class FantasyProsApi:
 
     @staticmethod
     def pitcher_stats_from_row(row):
-        cells = row.find("td")
         stats_dict = {
-            BaseballStat.OUTS: round(float(cells[1].text) * 3),
-            BaseballStat.K: int(cells[2].text),
-            BaseballStat.W: int(cells[3].text),
-            BaseballStat.SV: int(cells[4].text),
-            BaseballStat.ER: int(cells[7].text),
-            BaseballStat.P_H: int(cells[8].text),
-            BaseballStat.P_BB: int(cells[9].text),
+            BaseballStat.OUTS: round(row.ip * 3),
+            BaseballStat.K: row.k,
+            BaseballStat.W: row.w,
+            BaseballStat.SV: row.sv,
+            BaseballStat.ER: row.er,
+            BaseballStat.P_H: row.h,
+            BaseballStat.P_BB: row.bb,
         }
         return Stats(stats_dict, BaseballStat)
 
-    def year_projections(self, url, stats_from_row):
+    def year_projections(self, url, table, stats_from_row):
+        """
+        Scrape the given url for year-long projections, converting with the given function
+        :param Table table: the columns to take from each row of the projections
+        :return dict: dictionary of name to Stats object
         """
-                Scrape the given url for year-long projections, converting with the given function
-                :return dict: dictionary of name to Stats object
-                """
-        today = date.today()
-        date_string = str(today)
-        LOGGER.debug(f"Using date_str: {date_string}")
-        cache_key = f"fantasypros/{FantasyProsApi._path_segment(url)}/{date_string}.p"
-        LOGGER.debug(f"Looking in path {cache_key}")
-        cache_location = Path(cache_key)
-        if cache_location.exists():
-            f = cache_location.open("rb")
-            return pickle.load(f)
-
-        results = {}
-        for tr in self.table_rows(url):
-            name = FantasyProsApi.name_from_row(tr)
-            if name is None:
-                continue
-            stats = stats_from_row(tr)
-            results[name] = stats
-
-        f = cache_location.open("wb+")
-        pickle.dump(results, f)
-        return results
+        return {row.name: stats_from_row(row) for row in table.rows(self.html(url))}
 
     def year_hitter_projections(self):
         """
@@ -119,12 +124,14 @@ class FantasyProsApi:
         """
         return self.year_projections(
             "https://www.fantasypros.com/mlb/projections/hitters.php",
+            FantasyProsApi.hitter_table,
             FantasyProsApi.hitter_stats_from_row,
         )
 
     def year_pitcher_projections(self):
         return self.year_projections(
             "https://www.fantasypros.com/mlb/projections/pitchers.php",
+            FantasyProsApi.pitcher_table,
             FantasyProsApi.pitcher_stats_from_row,
         )
 
@@ -5,16 +5,23 @@ import time
 from requests_html import HTMLSession
 
 from espn.basketball.basketball_stat import BasketballStat
+from scraping.page_cache import shared_page_cache
+from scraping.tables import Column, Table
 from stats import Stats
 
 LOGGER = logging.getLogger("fantasysp.api")
 
 
 class FantasySPApi:
-    def __init__(self):
+    def __init__(self, page_cache=None):
+        """
+        :param PageCache page_cache: where scraped pages are cached, by default the cache on disk
+        shared by every scraper
+        """
         self.cache = None
+        self.page_cache = page_cache or shared_page_cache()
 
-    def page(self):
+    def html(self):
         if self.cache is not None:
             LOGGER.info("Using cached page")
             return self.cache
@@ -22,30 +29,24 @@ class FantasySPApi:
         start_time = time.time()
         LOGGER.info("Fetching daily projections page from FantasySP")
 
-        session = HTMLSession()
-        r = session.get("https://www.fantasysp.com/projections/basketball/daily/")
-        LOGGER.info(f"Rendering after {time.time() - start_time:.3f} seconds")
-        r.html.render(timeout=20)
-        LOGGER.info(f"Finished after {time.time() - start_time:.3f} seconds")
-        self.cache = r.html
-        return r.html
-
-    def table(self):
-        page = self.page()
-
-        return next(
-            filter(
-                lambda elt: "sortable" in elt.attrs.get("class", list()),
-                page.find("table"),
-            )
+        def render(r):
+            LOGGER.info(f"Rendering after {time.time() - start_time:.3f} seconds")
+            r.html.render(timeout=20)
+            return r.html.html
+
+        # the projections are filled in by scripts, so the page is cached once they have run
+        html = self.page_cache.get(
+            "fantasysp",
+            "https://www.fantasysp.com/projections/basketball/daily/",
+            session=HTMLSession(),
+            render=render,
         )
+        LOGGER.info(f"Finished after {time.time() - start_time:.3f} seconds")
+        self.cache = html
+        return self.cache
 
     def rows(self):
-        table = self.table()
-        return filter(
-            lambda elt: "projection-player" in elt.attrs.get("class", list()),
-            table.find("tr"),
-        )
+        return self.projections_table.rows(self.html())
 
     def players(self):
         return list(map(FantasySPApi.row_to_player, self.rows()))
@@ -65,16 +66,24 @@ class FantasySPApi:
         "proj-fgper": BasketballStat.FGPCT,
     }
 
+    # the projections are in the first sortable table, in cells named by the stat's class
+    projections_table = Table(
+        "table.sortable tr.projection-player",
+        [Column("name", "a")]
+        + [Column(cls.replace("-", "_"), f"td.{cls}", float) for cls in td_class_to_stat],
+        until="table.sortable",
+    )
+
     @staticmethod
     def row_to_player(row):
-        name = row.find("a")[0].text
-        tds = row.find("td")
-        s = Stats({}, BasketballStat)
-        for td in tds:
-            for cls in td.attrs.get("class", []):
-                stat = FantasySPApi.td_class_to_stat.get(cls)
-                if stat:
-                    s.stat_dict[stat] = float(td.text)
+        s = Stats(
+            {
+                stat: value
+                for stat, value in zip(FantasySPApi.td_class_to_stat.values(), row[1:])
+                if value is not None
+            },
+            BasketballStat,
+        )
         ft_pct = s.stat_dict[BasketballStat.FTPCT]
         if ft_pct > 0.0001:
             s.stat_dict[BasketballStat.FTA] = s.stat_dict[BasketballStat.FTM] / ft_pct * 100
@@ -87,7 +96,7 @@ class FantasySPApi:
             twos = points_from_twos / 2
             fg_made = twos + s.stat_dict[BasketballStat.THREES]
             s.stat_dict[BasketballStat.FGA] = fg_made / fg_pct * 100
-        return PlayerProjection(name, s)
+        return PlayerProjection(row.name, s)
 
 
 class PlayerProjection:
@@ -1,34 +1,55 @@
 import logging
 from typing import List
 
-from requests_html import HTMLSession
-
 from espn.football.football_position import position_from_text
 from footballdiehards.dfs_projection import DFSProjection
+from scraping.page_cache import shared_page_cache
+from scraping.tables import Column, Table
 from timing.timed import timed
 
 LOGGER = logging.getLogger("footballdiehards.api")
 
 
+def _salary(text):
+    # salaries are in dollars, e.g. $5000
+    return int(text[1:])
+
+
+def _projection(text):
+    # players without a projection have a dash instead
+    return None if text == "-" else float(text)
+
+
 class FbDieHardsApi:
 
+    def __init__(self, page_cache=None):
+        """
+        :param PageCache page_cache: where scraped pages are cached, by default the cache on disk
+        shared by every scraper
+        """
+        self.page_cache = page_cache or shared_page_cache()
+
+    # every row of the page after the two header rows is a player
+    salary_table = Table(
+        "tr",
+        [
+            Column("name", 0),
+            Column("position", 1, position_from_text),
+            Column("salary", 4, _salary),
+            Column("projection", 5, _projection, required=True),
+        ],
+        skip=2,
+    )
+
     @timed(LOGGER)
-    def page(self, url):
-        session = HTMLSession()
-        r = session.get(url)
-        return r.html
+    def html(self, url):
+        return self.page_cache.get("footballdiehards", url)
 
     def players(self) -> List[DFSProjection]:
-        page = self.page(
+        html = self.html(
             "https://www.footballdiehards.com/fantasyfootball/dailygames/FanDuel-Salary-data.cfm"
         )
-        rows = page.find('tr')
-        results = []
-        for r in rows[2:]:
-            cells = r.find('td')
-            if cells[5].text != "-":
-                results.append(DFSProjection(cells[0].text,
-                                             position_from_text(cells[1].text),
-                                             int(cells[4].text[1:]),
-                                             float(cells[5].text)))
-        return results
+        return [
+            DFSProjection(row.name, row.position, row.salary, row.projection)
+            for row in self.salary_table.rows(html)
+        ]
@@ -9,6 +9,21 @@ from lineup_transition import LineupTransition
 LOGGER = logging.getLogger("lineup")
 
 
+def requires_transition(from_slot, to_slot):
+    """
+    Checks if moving a player from one slot to another must be executed as a transition.
+    Pitchers and injured players are managed separately, so they never require one.
+    :param from_slot: the slot the player is currently in
+    :param to_slot: the slot the player is moving to
+    :return bool: True if the move requires a LineupTransition
+    """
+    return from_slot not in (
+        to_slot,
+        BaseballSlot.PITCHER,
+        BaseballSlot.INJURED,
+    )
+
+
 class Lineup:
     def __init__(self, player_dict, slot_enum):
         """
@@ -20,91 +35,91 @@ class Lineup:
         self.player_dict = player_dict
         self.slot_enum = slot_enum
 
-    def possible_lineups(self, lineup_settings, slots_to_fill):
+    def possible_lineups(self, lineup_settings, slots_to_fill, memoize=True, search_info=None):
         """
-        Calculates all possible sets of lineups that fill the given slots.
-         For each set of starting hitters, it calculates the lineup with that set
+        Generates all possible sets of lineups that fill the given slots.
+         For each set of starting hitters, it generates the lineup with that set
          of starters that is closest to this one.
-        Returns a set of such lineups.
+
+        Slots are filled one at a time, most constrained first, over a RosterIndex so that the
+        search only manipulates integers. Partial lineups are expanded fewest transitions first,
+        and no successor needs fewer transitions than its parent, so the first complete lineup
+        found with a set of starters is the closest one, and is yielded as soon as it is found.
+        When memoizing, partial lineups that have filled the same slots with the same players are
+        equivalent (they lead to the same starters), so only the first, closest, one is expanded.
         :param LineupSettings lineup_settings: the settings for the lineups to generate
         :param set slots_to_fill: the slots to fill up with players
-        :return set: set of lineups with all combinations of starters
+        :param bool memoize: whether to expand equivalent partial lineups only once
+        :param dict search_info: if given, filled with counts describing the search once it is done
+        :return generator: lineups with all combinations of starters, one per set of starters
         """
 
         # don't use injured players to build possible lineups
-        possible_starters = list(
-            filter(
-                lambda p: p not in self.injured(),
-                self.players()
-            )
-        )
+        injured = self.injured()
+        possible_starters = [p for p in self.players() if p not in injured]
 
-        initial_node = LineupSearchNode(
-            Lineup(dict(), self.slot_enum), possible_starters, slots_to_fill
+        slot_order = sorted(
+            slots_to_fill,
+            key=lambda s: (len(Lineup.candidates(s, possible_starters)), str(s)),
         )
-        # stack of nodes representing the frontier of the search graph
-        frontier = [initial_node]
+        roster = RosterIndex(possible_starters, slot_order, self)
+        # stacks of the nodes on the frontier of the search graph, by their transitions so far
+        frontier = [[LineupSearchNode.initial(roster)]]
+        frontier_size = 1
+        transitions = 0
+        # the slots filled and players remaining of every partial lineup expanded when memoizing
+        expanded = set()
         max_starters = lineup_settings.total_for_slots(slots_to_fill)
 
-        all_starters = dict()
+        # the players left over by every set of starters already generated
+        all_starters = set()
         total_proc = 0
-        max_stack = 0
-        total_stack = 0
+        max_stack = 1
 
         start_time = time.time()
         LOGGER.info("generating all possible lineups")
 
-        while len(frontier) != 0:
-            total_stack += len(frontier)
-            node = frontier.pop(0)
-            successors = node.successors(lineup_settings)
+        while transitions < len(frontier):
+            if len(frontier[transitions]) == 0:
+                transitions += 1
+                continue
+            node = frontier[transitions].pop()
+            frontier_size -= 1
+            if node.num_placed == max_starters:
+                if node.remaining not in all_starters:
+                    all_starters.add(node.remaining)
+                    yield node.lineup
+                continue
+            if memoize:
+                key = (len(node.placed), node.remaining)
+                if key in expanded:
+                    continue
+                expanded.add(key)
             total_proc += 1
             if total_proc % 1000 == 0:
                 LOGGER.debug(f"processed {total_proc}")
-            max_stack = max(max_stack, len(frontier))
-            for successor in successors:
-                starters = successor.lineup.starters()
-                if len(starters) == max_starters:
-                    self.add_lineup_to_unique_starters(successor.lineup, all_starters)
-                elif not successor.all_slots_filled():
-                    frontier.insert(0, successor)
+            for successor in node.successors(lineup_settings):
+                if successor.num_placed != max_starters and successor.all_slots_filled():
+                    continue
+                while len(frontier) <= successor.transitions:
+                    frontier.append([])
+                frontier[successor.transitions].append(successor)
+                frontier_size += 1
+            max_stack = max(max_stack, frontier_size)
         end_time = time.time()
         info_dict = {
             "starters": len(all_starters),
             "total": total_proc,
             "max_stack": max_stack,
-            "avg_stack": total_stack / float(total_proc),
             "elapsed": end_time - start_time,
         }
         LOGGER.info(
             "possible starting combos: %(starters)d / %(total)d lineups,"
-            " max stack: %(max_stack)d, avg stack: %(avg_stack).3f, time: %(elapsed).3fs",
+            " max stack: %(max_stack)d, time: %(elapsed).3fs",
             info_dict,
         )
-        return all_starters.values()
-
-    def add_players_for_slot(self, slot, count, remaining_players):
-        """
-        Generates all possible lineups that are the same as this one except
-        count players from remaining_players have been added in slot
-        :param BaseballSlot slot: the slot in which to add players
-        :param int count: the number of players to add
-        :param list remaining_players: the players from which to choose
-        :return: list of tuples, where each tuple is the new lineup and the remaining players
-        """
-        candidates = Lineup.candidates(slot, remaining_players)
-        possible_combos = list(combinations(candidates, count))
-        if len(possible_combos) == 0:
-            return [(self, remaining_players)]
-        new_lineups = []
-        # pylint: disable=cell-var-from-loop
-        for players in possible_combos:
-            l_copy = self.copy()
-            rem_copy = copy.copy(remaining_players)
-            rem_copy = list(filter(lambda p: p not in players, rem_copy))
-            l_copy.player_dict[slot] = players
-            new_lineups.append((l_copy, rem_copy))
-        return new_lineups
+        if search_info is not None:
+            search_info.update(info_dict)
 
     @staticmethod
     def candidates(slot, players):
@@ -130,6 +145,17 @@ class Lineup:
             all_players.extend(players_in_slot)
         return all_players
 
+    def slots_by_player(self):
+        """
+        Indexes this Lineup by player.
+        :return dict: map of each Player in this Lineup to the slot they are in
+        """
+        slots = dict()
+        for slot, players in self.player_dict.items():
+            for player in players:
+                slots[player] = slot
+        return slots
+
     def starters(self):
         starters = set()
         for slot, players in self.player_dict.items():
@@ -151,42 +177,9 @@ class Lineup:
         :param Lineup to_lineup: the Lineup to create transitions for
         :return list: the list of LineupTransitions necessary to move to the given Lineup
         """
-        transitions = []
-
-        for slot, players in self.player_dict.items():
-            for player in players:
-                # pylint: disable=cell-var-from-loop
-                if player not in to_lineup.player_dict.get(slot, []):
-                    to_slots = to_lineup.player_dict.keys()
-                    to_slot = next(
-                        filter(lambda s: player in to_lineup.player_dict[s], to_slots),
-                        self.slot_enum.BENCH,
-                    )
-                    if slot not in (
-                            to_slot,
-                            BaseballSlot.PITCHER,
-                            BaseballSlot.INJURED,
-                    ):
-                        transitions.append(LineupTransition(player, slot, to_slot))
-
-        return transitions
-
-    def add_lineup_to_unique_starters(self, lineup, all_starters):
-        """
-        Adds the given lineup to the given dictionary of starters to lineups.
-        If the lineup's starters are not in the map, it adds them to the map.
-        If they are, it will replace the current value with the given lineup if this
-        lineup requires fewer transitions to produce the given one.
-        :param Lineup lineup: the lineup to add to the dictionary
-        :param dict all_starters: the dictionary from starters to closest lineup
-        """
-        cur_lineup = all_starters.get(lineup.starters(), lineup)
-        cur_lineup_transitions = len(self.transitions(cur_lineup))
-        given_lineup_transitions = len(self.transitions(lineup))
-        if cur_lineup_transitions < given_lineup_transitions:
-            all_starters[lineup.starters()] = cur_lineup
-        else:
-            all_starters[lineup.starters()] = lineup
+        return transitions_between(
+            self.player_dict, to_lineup.slots_by_player(), self.slot_enum
+        )
 
     def __str__(self):
         result = ""
@@ -198,40 +191,198 @@ class Lineup:
         return result
 
 
+def transitions_between(player_dict, to_slots, slot_enum):
+    """
+    Finds the transitions that move every player from their slot in player_dict to their slot in
+    to_slots, in time linear in the size of the roster.
+    :param dict player_dict: map from slot to the players currently in it
+    :param dict to_slots: map from Player to the slot they are moving to
+    :param slot_enum: the enum of slots, whose BENCH is used for players that are not moving to one
+    :return list: the list of LineupTransitions necessary
+    """
+    transitions = []
+    for slot, players in player_dict.items():
+        for player in players:
+            to_slot = to_slots.get(player, slot_enum.BENCH)
+            if requires_transition(slot, to_slot):
+                transitions.append(LineupTransition(player, slot, to_slot))
+    return transitions
+
+
+class LineupDistances:
+    def __init__(self, current):
+        """
+        Computes the transitions needed to get from the current Lineup to others, memoized by the
+        identity of the other lineup. Meant to live for a single optimization run, over which the
+        lineups being compared are not modified.
+        :param Lineup current: the lineup that every transition starts from
+        """
+        self.current = current
+        self.hits = 0
+        self.misses = 0
+        # id of the lineup -> (the lineup, its transitions); holding on to the lineup keeps its id
+        # from being reused by another one
+        self._transitions = dict()
+
+    def transitions(self, to_lineup):
+        """
+        :param Lineup to_lineup: the Lineup to create transitions for
+        :return list: the list of LineupTransitions necessary to move to the given Lineup
+        """
+        cached = self._transitions.get(id(to_lineup))
+        if cached is not None:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        transitions = transitions_between(
+            self.current.player_dict, to_lineup.slots_by_player(), self.current.slot_enum
+        )
+        self._transitions[id(to_lineup)] = (to_lineup, transitions)
+        return transitions
+
+    def distance(self, to_lineup):
+        """
+        :param Lineup to_lineup: the Lineup to move to
+        :return int: the number of transitions necessary to move to the given Lineup
+        """
+        return len(self.transitions(to_lineup))
+
+
+class RosterIndex:
+    def __init__(self, players, slots, current_lineup):
+        """
+        A compact representation of a roster to search over. Players are indexed 0..N-1, so any
+        set of players is an integer bitmask, and eligibility for each slot is precomputed.
+        :param list players: the players that may be placed in a lineup
+        :param list slots: the slots to fill, in the order that they are filled
+        :param Lineup current_lineup: the lineup that players are currently in
+        """
+        self.players = players
+        self.slots = slots
+        self.slot_enum = current_lineup.slot_enum
+        current_slots = current_lineup.slots_by_player()
+        self.eligible = []
+        self.no_transition = []
+        for slot in slots:
+            eligible = 0
+            no_transition = 0
+            for i, player in enumerate(players):
+                if player.can_play(slot):
+                    eligible |= 1 << i
+                from_slot = current_slots.get(player, self.slot_enum.BENCH)
+                if not requires_transition(from_slot, slot):
+                    no_transition |= 1 << i
+            self.eligible.append(eligible)
+            self.no_transition.append(no_transition)
+
+    def all_players(self):
+        return (1 << len(self.players)) - 1
+
+    def players_in(self, mask):
+        """
+        :param int mask: a set of players as a bitmask
+        :return list: the Players in the given set
+        """
+        return [p for i, p in enumerate(self.players) if mask >> i & 1]
+
+    def to_lineup(self, placed):
+        """
+        Converts the players placed during a search back into a Lineup.
+        :param tuple placed: for each filled slot (in order), the bitmask of players placed in it
+        :return Lineup: the lineup with those players in those slots
+        """
+        player_dict = dict()
+        for slot, mask in zip(self.slots, placed):
+            player_dict[slot] = self.players_in(mask)
+        return Lineup(player_dict, self.slot_enum)
+
+
+def _bit_indices(mask):
+    indices = []
+    i = 0
+    while mask:
+        if mask & 1:
+            indices.append(i)
+        mask >>= 1
+        i += 1
+    return indices
+
+
+def _count_bits(mask):
+    return bin(mask).count("1")
+
+
 class LineupSearchNode:
-    def __init__(self, lineup, players_left, slots_left):
+    def __init__(self, roster, placed, remaining, num_placed, transitions):
         """
         Represents a node in a search of all possible lineups given a set of players.
-        :param Lineup lineup: lineup of players currently assigned to slots in this search
-        :param list players_left: list of players still available to be assigned
-        :param set slots_left: set of slots that have yet to be filled
+        :param RosterIndex roster: the indexed players and slots being searched over
+        :param tuple placed: bitmasks of the players placed in each slot filled so far
+        :param int remaining: bitmask of players still available to be assigned
+        :param int num_placed: how many players have been placed
+        :param int transitions: how many placed players need a transition to get to their slot
         """
-        self.lineup = lineup
-        self.players_left = players_left
-        self.slots_left = slots_left
+        self.roster = roster
+        self.placed = placed
+        self.remaining = remaining
+        self.num_placed = num_placed
+        self.transitions = transitions
+
+    @staticmethod
+    def initial(roster):
+        """
+        :param RosterIndex roster: the roster to search over
+        :return LineupSearchNode: the node where no slots have been filled yet
+        """
+        return LineupSearchNode(roster, (), roster.all_players(), 0, 0)
+
+    @property
+    def lineup(self):
+        return self.roster.to_lineup(self.placed)
+
+    @property
+    def players_left(self):
+        return self.roster.players_in(self.remaining)
 
     def successors(self, lineup_settings):
         """
         Returns a list of all successors of this node in the graph search.
 
-        Does so by picking a remaining slot, and generating all possible lineups
-        where that slot is filled with some subset of the remaining players.
-
-        Returns all
+        Does so by filling the next slot with every possible combination of the remaining
+        players eligible for it. If there are not enough players to fill it, the slot is left
+        empty.
         :param LineupSettings lineup_settings: the restrictions for making new lineups
         :return: a list of all successor nodes
         """
-        next_slot = self.slots_left.pop()
-        slot_count = lineup_settings.slot_counts.get(next_slot)
-        new_lineups = self.lineup.add_players_for_slot(
-            next_slot, slot_count, self.players_left
-        )
+        slot_index = len(self.placed)
+        slot = self.roster.slots[slot_index]
+        count = lineup_settings.slot_counts.get(slot, 0)
+        candidates = _bit_indices(self.roster.eligible[slot_index] & self.remaining)
+        if len(candidates) < count:
+            return [
+                LineupSearchNode(
+                    self.roster,
+                    self.placed + (0,),
+                    self.remaining,
+                    self.num_placed,
+                    self.transitions,
+                )
+            ]
+        needs_transition = ~self.roster.no_transition[slot_index]
         successors = []
-        for (new_lin, rem_players) in new_lineups:
-            rem_slots = self.slots_left.copy()
-            node = LineupSearchNode(new_lin, rem_players, rem_slots)
-            successors.append(node)
-
+        for combo in combinations(candidates, count):
+            mask = 0
+            for i in combo:
+                mask |= 1 << i
+            successors.append(
+                LineupSearchNode(
+                    self.roster,
+                    self.placed + (mask,),
+                    self.remaining & ~mask,
+                    self.num_placed + count,
+                    self.transitions + _count_bits(mask & needs_transition),
+                )
+            )
         return successors
 
     def all_slots_filled(self):
@@ -239,4 +390,4 @@ class LineupSearchNode:
         Checks if all slots have been filled for this node.
         :return boolean: True if there are no slots left
         """
-        return len(self.slots_left) == 0
+        return len(self.placed) == len(self.roster.slots)
@@ -10,3 +10,11 @@ class GameState:
 
     def is_terminal(self) -> bool:
         pass
+
+    def transposition_key(self):
+        """
+        Identifies this state regardless of the moves that led to it, so that its search result
+        can be reused. States that return None are always searched.
+        :return: a hashable key, or None
+        """
+        return None
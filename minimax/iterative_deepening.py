@@ -0,0 +1,180 @@
+import logging
+import time
+from typing import List
+
+from minimax.game_info import GameInfo
+from minimax.game_state import GameState
+from minimax.max_n import MaxNResult, MaxNStats, TranspositionTable, max_n
+from minimax.state_evaluator import StateEvaluator
+
+LOGGER = logging.getLogger("minimax.iterative_deepening")
+
+# seconds to search when no limit is given; a live draft's pick clock is 60-90 seconds
+DEFAULT_TIME_LIMIT = 45.0
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class DepthLimit:
+    def __init__(self, deadline=None, clock=time.monotonic):
+        """
+        The answer_now for a search in which depths count up to 0 at the search horizon, that
+        abandons the search with a SearchTimeout once the deadline passes.
+
+        Counting depth up to the horizon, rather than down from the root, makes a depth the number
+        of moves left to search, so results kept in a transposition table stay valid in searches
+        of other depths.
+        :param float deadline: when to stop searching, by the clock, or None to never stop
+        :param clock: the clock the deadline is measured by
+        """
+        self.deadline = deadline
+        self.clock = clock
+
+    def __call__(self, depth):
+        if self.deadline is not None and self.clock() >= self.deadline:
+            raise SearchTimeout()
+        return depth >= 0
+
+
+class DepthResult:
+    def __init__(self, depth, best_child, values, seconds, stats, complete):
+        """
+        What searching every move from the root to one depth found.
+        :param int depth: how many moves past the root were searched
+        :param GameState best_child: the best move found, or None if no move was searched
+        :param list values: the value of the best move for every player
+        :param float seconds: how long the search took
+        :param MaxNStats stats: the nodes searched
+        :param bool complete: whether every move was searched before the deadline
+        """
+        self.depth = depth
+        self.best_child = best_child
+        self.values = values
+        self.seconds = seconds
+        self.stats = stats
+        self.complete = complete
+
+    def __str__(self):
+        status = "complete" if self.complete else "timed out"
+        return f"depth {self.depth} {status} in {self.seconds:.2f}s: {self.stats}"
+
+
+class SearchResult:
+    def __init__(self, best_child, values, depths: List[DepthResult]):
+        """
+        :param GameState best_child: the best move found
+        :param list values: its value for every player, or None if no move finished searching
+        :param list depths: the result of each depth searched, shallowest first
+        """
+        self.best_child = best_child
+        self.values = values
+        self.depths = depths
+
+    @property
+    def depth(self):
+        """
+        :return int: the deepest depth searched for every move
+        """
+        complete = [d.depth for d in self.depths if d.complete]
+        return max(complete) if complete else 0
+
+
+def iterative_deepening(
+    node: GameState,
+    player: int,
+    game_info: GameInfo,
+    state_evaluator: StateEvaluator,
+    time_limit=DEFAULT_TIME_LIMIT,
+    max_depth=None,
+    table: TranspositionTable = None,
+    clock=time.monotonic,
+) -> SearchResult:
+    """
+    Searches the moves from the given state with max_n at depth 1, 2, 3... until the time limit
+    passes, so that there is always a best move ready.
+
+    Each move from the root is searched separately, without pruning between them, so that each has
+    its own value to order the next depth by: the best move so far is searched first, and if the
+    deadline passes partway through a depth, the best of the moves that were searched to it is
+    used. One transposition table is kept across depths.
+    :param node: the state to choose a move from
+    :param player: the player choosing the move
+    :param game_info: the rules that this game uses
+    :param state_evaluator: collection of functions to evaluate game states
+    :param float time_limit: seconds to search for
+    :param int max_depth: the deepest to search, or None to search until the time limit or until
+    the whole game has been searched
+    :param table: where results are remembered, by default a new table
+    :param clock: the clock the time limit is measured by
+    :return SearchResult: the best move, and what each depth found
+    """
+    if table is None:
+        table = TranspositionTable()
+    deadline = clock() + time_limit
+    children = node.children()
+    next_player = (player + 1) % game_info.total_players
+    best_child, best_values = next(iter(children), None), None
+    depths = []
+    previous_values = dict()
+
+    depth = 0
+    while len(children) > 0 and (max_depth is None or depth < max_depth):
+        depth += 1
+        # the best moves of the last depth first; the stable sort keeps the given order of ties
+        ordered = sorted(
+            range(len(children)),
+            key=lambda i: -previous_values[i][player] if previous_values else 0,
+        )
+        answer_now = DepthLimit(deadline, clock)
+        stats = MaxNStats()
+        start = clock()
+        values_by_child = dict()
+        cut_off = False
+        depth_best, depth_best_value, depth_best_values = None, float("-inf"), None
+        try:
+            for i in ordered:
+                result: MaxNResult = max_n(
+                    children[i],
+                    next_player,
+                    game_info.max_value,
+                    game_info,
+                    state_evaluator,
+                    1 - depth,
+                    answer_now,
+                    table,
+                    stats,
+                )
+                values_by_child[i] = result.values
+                cut_off = cut_off or result.cut_off
+                value = result.values[player]
+                # ties go to the move that comes first among the children, whichever order they
+                # were searched in, as they do in max_n
+                if value > depth_best_value or (value == depth_best_value and i < depth_best):
+                    depth_best, depth_best_value, depth_best_values = i, value, result.values
+            complete = True
+        except SearchTimeout:
+            complete = False
+
+        # a partial depth is only better informed if it searched the previous best move first
+        if ordered[0] in values_by_child:
+            best_child, best_values = children[depth_best], depth_best_values
+        depth_result = DepthResult(
+            depth,
+            children[depth_best] if depth_best is not None else None,
+            depth_best_values,
+            clock() - start,
+            stats,
+            complete,
+        )
+        LOGGER.info(str(depth_result))
+        depths.append(depth_result)
+        if not complete:
+            break
+        previous_values = values_by_child
+        if not cut_off:
+            # the whole game has been searched, so searching deeper would find the same
+            break
+
+    return SearchResult(best_child, best_values, depths)
@@ -1,4 +1,5 @@
 import logging
+from collections import OrderedDict
 from typing import List
 
 from minimax.game_info import GameInfo
@@ -7,14 +8,97 @@ from minimax.state_evaluator import StateEvaluator
 
 LOGGER = logging.getLogger("minimax.max_n")
 
+DEFAULT_TABLE_SIZE = 100000
+
 
 class MaxNResult:
-    def __init__(self, result_node, values: List[int]):
+    def __init__(self, result_node, values: List[int], exact=True, cut_off=False):
+        """
+        :param result_node: the leaf that the values come from
+        :param values: the value of the result for every player in the game
+        :param exact: whether these are the searched node's true values, rather than values that
+        only bound them because the node stopped searching its children early
+        :param cut_off: whether any state searched was valued by the heuristic, rather than the
+        game being searched to its end
+        """
         self.result_node = result_node
         self.values = values
+        self.exact = exact
+        self.cut_off = cut_off
+
+
+class MaxNStats:
+    def __init__(self):
+        """
+        Counts what a search with max_n did, in place of a global node counter, so that each
+        search can be reported on separately.
+        """
+        self.nodes = 0
+        self.prunes = 0
+        self.table_lookups = 0
+        self.table_hits = 0
+
+    def merge(self, other):
+        """
+        Adds the counts of another search, such as one of a subtree searched elsewhere.
+        :param MaxNStats other: the counts to add
+        """
+        self.nodes += other.nodes
+        self.prunes += other.prunes
+        self.table_lookups += other.table_lookups
+        self.table_hits += other.table_hits
+
+    @property
+    def hit_rate(self):
+        return self.table_hits / self.table_lookups if self.table_lookups else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.nodes} nodes, {self.prunes} prunes, "
+            f"{self.table_hits}/{self.table_lookups} table hits ({self.hit_rate:.1%})"
+        )
+
+
+class DepthCutoff:
+    def __init__(self, max_depth):
+        """
+        An answer_now that uses the heuristic from the given depth on. Unlike a lambda, it can be
+        pickled, to search in other processes.
+        :param int max_depth: the first depth to answer with the heuristic
+        """
+        self.max_depth = max_depth
 
+    def __call__(self, depth):
+        return depth >= self.max_depth
 
-max_n_total_nodes = 0
+
+class TranspositionTable:
+    def __init__(self, max_entries=DEFAULT_TABLE_SIZE):
+        """
+        Remembers the results of searched game states, so that a state reached again by a
+        different order of moves is not searched again. Once full, the least recently used
+        results are evicted.
+
+        A table is only valid for one answer_now: results depend on where the search stopped.
+        :param int max_entries: the most results to keep
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is not None:
+            self.entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
 
 
 def max_n(
@@ -25,6 +109,8 @@ def max_n(
     state_evaluator: StateEvaluator,
     depth,
     answer_now=lambda depth: False,
+    table: TranspositionTable = None,
+    stats: MaxNStats = None,
 ) -> MaxNResult:
     """
     Runs the MAX^N algorithm (expansion of minimax) to determine the value of the given game state
@@ -46,42 +132,85 @@ def max_n(
     :param game_info: the rules that this game uses, including total players, etc.
     :param state_evaluator: collection of functions to evaluate game states
     :param answer_now: whether to use the heuristic to rapidly determine an approximate answer
+    :param table: if given, where the results of states with a transposition key are remembered
+    :param stats: if given, counts the nodes searched, pruned, and found in the table
     :return: a tuple with a value for every player in the game, given the state and whose turn it is
     """
-    # pylint: disable=global-statement
-    global max_n_total_nodes
-    max_n_total_nodes += 1
-    if max_n_total_nodes % 1000 == 0:
-        LOGGER.info(f"Processed {max_n_total_nodes} nodes")
+    if stats is None:
+        stats = MaxNStats()
+    stats.nodes += 1
+    if stats.nodes % 1000 == 0:
+        LOGGER.info(f"Processed {stats.nodes} nodes")
+
+    key = None
+    if table is not None:
+        state_key = node.transposition_key()
+        if state_key is not None:
+            key = (state_key, player, depth)
+            stats.table_lookups += 1
+            cached = table.get(key)
+            if cached is not None:
+                stats.table_hits += 1
+                return cached
+
+    result = _max_n(
+        node,
+        player,
+        upper_bound,
+        game_info,
+        state_evaluator,
+        depth,
+        answer_now,
+        table,
+        stats,
+    )
+    if key is not None and result.exact:
+        table.put(key, result)
+    return result
+
+
+def _max_n(
+    node,
+    player,
+    upper_bound,
+    game_info,
+    state_evaluator,
+    depth,
+    answer_now,
+    table,
+    stats,
+):
     if node.is_terminal():
         return MaxNResult(node, state_evaluator.terminal_state_value(node, game_info))
     if answer_now(depth):
-        return MaxNResult(node, state_evaluator.heuristic(node, game_info))
+        return MaxNResult(node, state_evaluator.heuristic(node, game_info), cut_off=True)
 
     children = node.children()
     next_player_index = (player + 1) % game_info.total_players
-    best = max_n(
-        children[0],
-        next_player_index,
-        game_info.max_value,
-        game_info,
-        state_evaluator,
-        depth + 1,
-        answer_now,
-    )
-    for i, child in enumerate(children[1:]):
-        if best.values[player] >= upper_bound:
-            LOGGER.info(f"Pruned {i} at depth {depth}")
-            return best
-        current = max_n(
+
+    def search(child, bound):
+        return max_n(
             child,
             next_player_index,
-            game_info.max_value - best.values[player],
+            bound,
             game_info,
             state_evaluator,
             depth + 1,
             answer_now,
+            table,
+            stats,
         )
+
+    best = search(children[0], game_info.max_value)
+    cut_off = best.cut_off
+    for i, child in enumerate(children[1:]):
+        if best.values[player] >= upper_bound:
+            LOGGER.info(f"Pruned {i} at depth {depth}")
+            stats.prunes += 1
+            return MaxNResult(best.result_node, best.values, exact=False, cut_off=True)
+        # a child that pruned its own children cannot beat best: its values only bound it
+        current = search(child, game_info.max_value - best.values[player])
+        cut_off = cut_off or current.cut_off
         if current.values[player] > best.values[player]:
             best = current
-    return best
+    return MaxNResult(best.result_node, best.values, best.exact, cut_off)
@@ -0,0 +1,124 @@
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from minimax.game_info import GameInfo
+from minimax.game_state import GameState
+from minimax.max_n import (
+    DEFAULT_TABLE_SIZE,
+    DepthCutoff,
+    MaxNResult,
+    MaxNStats,
+    TranspositionTable,
+    max_n,
+)
+from minimax.state_evaluator import StateEvaluator
+
+LOGGER = logging.getLogger("minimax.parallel_max_n")
+
+
+def _search_child(child, player, game_info, state_evaluator, depth, answer_now, table_size):
+    stats = MaxNStats()
+    result = max_n(
+        child,
+        player,
+        game_info.max_value,
+        game_info,
+        state_evaluator,
+        depth,
+        answer_now,
+        TranspositionTable(table_size),
+        stats,
+    )
+    return result, stats
+
+
+def parallel_max_n(
+    node: GameState,
+    player: int,
+    game_info: GameInfo,
+    state_evaluator: StateEvaluator,
+    depth=0,
+    answer_now=DepthCutoff(math.inf),
+    executor=None,
+    max_workers=None,
+    stats: MaxNStats = None,
+    table_size=DEFAULT_TABLE_SIZE,
+) -> MaxNResult:
+    """
+    Runs max_n with each move from the given state searched in its own process, so that every core
+    is searching at once.
+
+    The moves are searched without pruning between them and the first move with the strictly
+    highest value for the player is chosen, the move that a serial max_n from the state chooses.
+    The state, evaluator and answer_now are sent to the other processes, so must be picklable; use
+    a DepthCutoff rather than a lambda. Each process keeps its own transposition table, so states
+    reached from more than one move are searched in each; with a single worker the moves are
+    instead searched in this process with one table, as nothing runs alongside to make up for it.
+    :param node: the state to choose a move from
+    :param player: the player choosing the move
+    :param game_info: the rules that this game uses
+    :param state_evaluator: collection of functions to evaluate game states
+    :param depth: the depth of the given state
+    :param answer_now: whether to use the heuristic to rapidly determine an approximate answer
+    :param executor: where to search, by default a new pool of max_workers processes
+    :param int max_workers: how many processes to search with, by default one per core; ignored
+    if an executor is given
+    :param stats: if given, counts the nodes searched in every process
+    :param int table_size: the most results each process's transposition table keeps
+    :return: the values of the best move for every player
+    """
+    if stats is None:
+        stats = MaxNStats()
+    single_worker = executor is None and (max_workers or os.cpu_count() or 1) <= 1
+    if single_worker or node.is_terminal() or answer_now(depth):
+        return max_n(
+            node,
+            player,
+            game_info.max_value,
+            game_info,
+            state_evaluator,
+            depth,
+            answer_now,
+            TranspositionTable(table_size),
+            stats,
+        )
+
+    children = node.children()
+    next_player = (player + 1) % game_info.total_players
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [
+            executor.submit(
+                _search_child,
+                child,
+                next_player,
+                game_info,
+                state_evaluator,
+                depth + 1,
+                answer_now,
+                table_size,
+            )
+            for child in children
+        ]
+        results = []
+        for future in futures:
+            result, child_stats = future.result()
+            stats.merge(child_stats)
+            results.append(result)
+    finally:
+        if own_executor:
+            executor.shutdown()
+    stats.nodes += 1
+    LOGGER.info(f"searched {len(children)} moves in parallel: {stats}")
+
+    best = results[0]
+    for result in results[1:]:
+        if result.values[player] > best.values[player]:
+            best = result
+    return MaxNResult(
+        best.result_node, best.values, best.exact, any(r.cut_off for r in results)
+    )
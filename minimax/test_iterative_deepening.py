@@ -0,0 +1,112 @@
+from unittest import TestCase
+
+from minimax.game_info import GameInfo
+from minimax.iterative_deepening import DepthLimit, SearchTimeout, iterative_deepening
+from minimax.test_max_n import BasicGame, BasicStateEvaluator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TimedStateEvaluator(BasicStateEvaluator):
+    def __init__(self, clock):
+        self.clock = clock
+        self.terminal_states = []
+
+    def terminal_state_value(self, game_state: BasicGame, game_info: GameInfo):
+        # every terminal state takes a second to value
+        self.clock.now += 1
+        self.terminal_states.append(game_state)
+        return game_state.values
+
+
+# two players; player 1 answers each of player 0's moves with the move best for player 1
+#           root
+#      b            a
+#   b1   b2      a1   a2
+state_a1 = BasicGame([2, 8], [])
+state_a2 = BasicGame([3, 7], [])
+state_b1 = BasicGame([5, 5], [])
+state_b2 = BasicGame([4, 6], [])
+# looks best at depth 1, but player 1 has a better reply to it
+state_a = BasicGame([6, 4], [state_a1, state_a2])
+state_b = BasicGame([3, 7], [state_b1, state_b2])
+root = BasicGame([], [state_b, state_a])
+
+
+class Test(TestCase):
+    game_info = GameInfo(2, 10)
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.evaluator = TimedStateEvaluator(self.clock)
+
+    def search(self, time_limit=100.0, max_depth=None):
+        return iterative_deepening(
+            root,
+            0,
+            self.game_info,
+            self.evaluator,
+            time_limit=time_limit,
+            max_depth=max_depth,
+            clock=self.clock,
+        )
+
+    def test_searches_until_game_is_exhausted(self):
+        result = self.search()
+        self.assertEqual(state_b, result.best_child)
+        self.assertEqual([4, 6], result.values)
+        self.assertEqual(2, result.depth)
+        self.assertEqual(state_a, result.depths[0].best_child)
+        self.assertEqual([True, True], [d.complete for d in result.depths])
+        self.assertEqual(4.0, result.depths[1].seconds)
+
+    def test_max_depth(self):
+        result = self.search(max_depth=1)
+        self.assertEqual(state_a, result.best_child)
+        self.assertEqual([6, 4], result.values)
+        self.assertEqual(1, len(result.depths))
+
+    def test_orders_moves_by_shallower_depth(self):
+        self.search()
+        self.assertEqual(
+            [state_a1, state_a2, state_b1, state_b2], self.evaluator.terminal_states
+        )
+
+    def test_ties_go_to_first_move(self):
+        # c ties b at depth 2, and is searched after it, having looked worse at depth 1
+        state_c = BasicGame([1, 9], [BasicGame([4, 6], [])])
+        tied_root = BasicGame([], [state_c, state_b])
+        result = iterative_deepening(
+            tied_root, 0, self.game_info, self.evaluator, max_depth=2, clock=self.clock
+        )
+        self.assertEqual(state_c, result.best_child)
+        self.assertEqual([4, 6], result.values)
+
+    def test_keeps_best_so_far_at_deadline(self):
+        # times out after a, the best move at depth 1, has been searched at depth 2
+        result = self.search(time_limit=2.0)
+        self.assertEqual(state_a, result.best_child)
+        self.assertEqual([2, 8], result.values)
+        self.assertEqual(1, result.depth)
+        self.assertFalse(result.depths[1].complete)
+
+    def test_has_a_move_before_any_depth_completes(self):
+        result = self.search(time_limit=0.0)
+        self.assertEqual(state_b, result.best_child)
+        self.assertIsNone(result.values)
+        self.assertEqual(0, result.depth)
+
+    def test_depth_limit(self):
+        clock = FakeClock()
+        answer_now = DepthLimit(deadline=1.0, clock=clock)
+        self.assertFalse(answer_now(-1))
+        self.assertTrue(answer_now(0))
+        clock.now = 1.0
+        with self.assertRaises(SearchTimeout):
+            answer_now(-1)
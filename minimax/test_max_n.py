@@ -3,7 +3,7 @@ from unittest import TestCase
 
 from minimax.game_info import GameInfo
 from minimax.game_state import GameState
-from minimax.max_n import max_n
+from minimax.max_n import MaxNStats, TranspositionTable, max_n
 from minimax.state_evaluator import StateEvaluator
 
 
@@ -28,6 +28,15 @@ class BasicStateEvaluator(StateEvaluator):
         return game_state.values
 
 
+class KeyedGame(BasicGame):
+    def __init__(self, key, values, children):
+        super().__init__(values, children)
+        self.key = key
+
+    def transposition_key(self):
+        return self.key
+
+
 class ExplodingGame(GameState):
     def children(self) -> List["GameState"]:
         raise ValueError
@@ -101,3 +110,47 @@ class Test(TestCase):
             state_a, 0, 9, self.game_info, self.state_evaluator, 0, lambda x: True
         ).values
         self.assertEqual([], vals_a)
+
+    def test_transposition_table_reuses_results(self):
+        # the same state is reached from both of player 0's moves
+        shared = KeyedGame(
+            "shared", [], [KeyedGame("x", [2, 3, 4], []), KeyedGame("y", [3, 2, 4], [])]
+        )
+        root = KeyedGame(
+            "root",
+            [],
+            [
+                KeyedGame("left", [], [shared]),
+                KeyedGame("right", [], [KeyedGame("shared", [], shared.children_list)]),
+            ],
+        )
+        table = TranspositionTable()
+        stats = MaxNStats()
+        with_table = max_n(
+            root, 0, 9, self.game_info, self.state_evaluator, 0, table=table, stats=stats
+        )
+        without_table = max_n(root, 0, 9, self.game_info, self.state_evaluator, 0)
+
+        self.assertEqual(without_table.values, with_table.values)
+        self.assertEqual(1, stats.table_hits)
+        self.assertEqual(7, stats.table_lookups)
+        self.assertEqual(6, len(table))
+
+    def test_transposition_table_evicts_least_recently_used(self):
+        table = TranspositionTable(max_entries=2)
+        table.put("a", 1)
+        table.put("b", 2)
+        table.get("a")
+        table.put("c", 3)
+        self.assertEqual(1, table.get("a"))
+        self.assertIsNone(table.get("b"))
+        self.assertEqual(2, len(table))
+
+    def test_pruned_results_are_not_stored(self):
+        table = TranspositionTable()
+        keyed_f = KeyedGame("f", [], [KeyedGame("g", [1, 7, 1], []), state_x, state_x])
+        vals_f = max_n(keyed_f, 1, 6, self.game_info, self.state_evaluator, 0, table=table)
+        self.assertEqual([1, 7, 1], vals_f.values)
+        self.assertFalse(vals_f.exact)
+        self.assertIsNone(table.get(("f", 1, 0)))
+        self.assertIsNotNone(table.get(("g", 2, 1)))
@@ -0,0 +1,65 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+from minimax.game_info import GameInfo
+from minimax.max_n import DepthCutoff, MaxNStats, max_n
+from minimax.parallel_max_n import parallel_max_n
+from minimax.test_iterative_deepening import root
+from minimax.test_max_n import BasicGame, BasicStateEvaluator
+
+# both moves are worth 5 to player 0, who takes the first
+tied = BasicGame([], [BasicGame([5, 1], []), BasicGame([5, 2], [])])
+
+
+class Test(TestCase):
+    game_info = GameInfo(2, 10)
+    state_evaluator = BasicStateEvaluator()
+
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ProcessPoolExecutor(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def search(self, node, answer_now=DepthCutoff(10), stats=None):
+        return parallel_max_n(
+            node,
+            0,
+            self.game_info,
+            self.state_evaluator,
+            answer_now=answer_now,
+            executor=self.executor,
+            stats=stats,
+        )
+
+    def test_matches_serial_search(self):
+        serial = max_n(root, 0, 10, self.game_info, self.state_evaluator, 0)
+        stats = MaxNStats()
+        parallel = self.search(root, stats=stats)
+        self.assertEqual(serial.values, parallel.values)
+        self.assertEqual([4, 6], parallel.values)
+        self.assertEqual(7, stats.nodes)
+
+    def test_single_worker_searches_in_process(self):
+        # a lambda cannot be sent to another process
+        parallel = parallel_max_n(
+            root, 0, self.game_info, self.state_evaluator, answer_now=lambda depth: False,
+            max_workers=1,
+        )
+        self.assertEqual([4, 6], parallel.values)
+
+    def test_takes_first_of_tied_moves(self):
+        self.assertEqual([5, 1], self.search(tied).values)
+
+    def test_depth_cutoff(self):
+        self.assertEqual([6, 4], self.search(root, DepthCutoff(1)).values)
+        self.assertTrue(self.search(root, DepthCutoff(1)).cut_off)
+        self.assertEqual([], self.search(root, DepthCutoff(0)).values)
+
+    def test_depth_cutoff_pickles(self):
+        answer_now = pickle.loads(pickle.dumps(DepthCutoff(3)))
+        self.assertFalse(answer_now(2))
+        self.assertTrue(answer_now(3))
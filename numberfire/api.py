@@ -1,14 +1,13 @@
 import logging
 
-from datetime import date
-from pathlib import Path
 from typing import List, Dict
 
 import requests
 from bs4 import BeautifulSoup
 
-from dump import load_from_cache
 from espn.baseball.baseball_stat import BaseballStat
+from scraping.page_cache import shared_page_cache
+from scraping.tables import Column, Table
 from stats import Stats
 from timing.timed import timed
 
@@ -49,32 +48,39 @@ class NumberFireApiException(Exception):
 
 class NumberFireApi:
 
-    def __init__(self):
-        self._cache_dir = Path("cache/numberfire/")
-        if not self._cache_dir.exists():
-            self._cache_dir.mkdir()
+    def __init__(self, page_cache=None):
+        """
+        :param PageCache page_cache: where scraped pages are cached, by default the cache on disk
+        shared by every scraper
+        """
+        self.page_cache = page_cache or shared_page_cache()
 
         # use a session to store cookies that affect the returned projections
         self._session = requests.Session()
+        # the site and slate chosen in those cookies, which pages are cached by
+        self._site_id = None
+        self._slate_id = None
 
     baseball_url = "https://www.numberfire.com/mlb/daily-fantasy/daily-baseball-projections/batters"
 
-    def _cache_key(self, sport):
-        today = date.today()
-        date_string = str(today)
-        sport_dir = self._cache_dir / sport
-        if not sport_dir.exists():
-            sport_dir.mkdir()
-        return sport_dir / f"{date_string}.p"
-
     @timed(LOGGER)
-    def _page(self, projections_url):
+    def _html(self, projections_url):
         """
         Gets the daily fantasy projections page from NumberFire
-        :return BeautifulSoup: the html on the page
+        :return str: the html on the page
+        """
+        return self.page_cache.get(
+            "numberfire",
+            projections_url,
+            session=self._session,
+            variant=[self._site_id, self._slate_id],
+        )
+
+    def _page(self, projections_url):
         """
-        r = self._session.get(projections_url)
-        return BeautifulSoup(r.content)
+        :return BeautifulSoup: the parsed daily fantasy projections page
+        """
+        return BeautifulSoup(self._html(projections_url))
 
     def _get_dropdown_option(self, input_option_key, option_matcher):
         """
@@ -121,76 +127,88 @@ class NumberFireApi:
         return slate_id
 
     def _set_slate(self, slate_id):
+        self._slate_id = slate_id
+        if self.page_cache.offline:
+            return
         form_data = {
             'slate_id': slate_id
         }
         self._session.post("https://www.numberfire.com/mlb/daily-fantasy/set-slate", data=form_data)
 
     def _set_site(self, site_id):
+        self._site_id = site_id
+        if self.page_cache.offline:
+            return
         form_data = {
             'site': site_id
         }
         self._session.post("https://www.numberfire.com/mlb/daily-fantasy/set-dfs-site",
                            data=form_data)
 
-    @staticmethod
-    def _projections_table(page):
-        table_bodies = page.find_all("tbody")
-        return next(
-            filter(
-                lambda tbody: tbody.has_attr("class") and "stat-table__body" in tbody["class"],
-                table_bodies,
-            )
-        )
+    # the projections are in the first stat table body, in cells named by the stat's class
+    basketball_table = Table(
+        "tbody.stat-table__body tr",
+        [
+            Column("name", "a.full"),
+            Column("fp", "td.fp", float),
+            Column("mins", "td.min"),
+            Column("pts", "td.pts"),
+            Column("reb", "td.reb"),
+            Column("ast", "td.ast"),
+            Column("stl", "td.stl"),
+            Column("blk", "td.blk"),
+            Column("to", "td.to"),
+        ],
+        until="tbody.stat-table__body",
+    )
+    baseball_table = Table(
+        "tbody.stat-table__body tr",
+        [
+            Column("name", "a.full"),
+            Column("pa", "td.pa", float),
+            Column("bb", "td.bb", float),
+            Column("singles", "td.1b", float),
+            Column("doubles", "td.2b", float),
+            Column("triples", "td.3b", float),
+            Column("hr", "td.hr", float),
+            Column("r", "td.r", float),
+            Column("rbi", "td.rbi", float),
+            Column("sb", "td.sb", float),
+        ],
+        until="tbody.stat-table__body",
+    )
+
+    def _projections_table(self, projections_url, table):
+        """
+        Parses the projections table on a daily fantasy projections page
+        :param Table table: the columns to take from each row of the projections
+        :return list: the columns of each player's row
+        """
+        return list(table.rows(self._html(projections_url)))
 
     @staticmethod
     def row_to_projection_basketball(row):
-        links = row.find_all("a")
-        tds = row.find_all("td")
-        name = NumberFireApi.find_with_class(links, "full")
-        fp = float(NumberFireApi.find_with_class(tds, "fp"))
-        mins = NumberFireApi.find_with_class(tds, "min")
-        pts = NumberFireApi.find_with_class(tds, "pts")
-        reb = NumberFireApi.find_with_class(tds, "reb")
-        ast = NumberFireApi.find_with_class(tds, "ast")
-        stl = NumberFireApi.find_with_class(tds, "stl")
-        blk = NumberFireApi.find_with_class(tds, "blk")
-        to = NumberFireApi.find_with_class(tds, "to")
-        return PlayerProjection(name, fp, mins, pts, reb, ast, stl, blk, to)
+        return PlayerProjection(
+            row.name, row.fp, row.mins, row.pts, row.reb, row.ast, row.stl, row.blk, row.to
+        )
 
     @staticmethod
     def row_to_projection_baseball(row) -> (str, Stats):
-        links = row.find_all("a")
-        tds = row.find_all("td")
-        name = NumberFireApi.find_with_class(links, "full")
-
-        plate_appearances = float(NumberFireApi.find_with_class(tds, "pa"))
-        walks = float(NumberFireApi.find_with_class(tds, "bb"))
-        singles = float(NumberFireApi.find_with_class(tds, "1b"))
-        doubles = float(NumberFireApi.find_with_class(tds, "2b"))
-        triples = float(NumberFireApi.find_with_class(tds, "3b"))
-        homers = float(NumberFireApi.find_with_class(tds, "hr"))
-        hits = singles + doubles + triples + homers
-        at_bats = plate_appearances - walks
+        hits = row.singles + row.doubles + row.triples + row.hr
+        at_bats = row.pa - row.bb
 
         projection_dict = {
-            BaseballStat.PA: plate_appearances,
-            BaseballStat.BB: walks,
+            BaseballStat.PA: row.pa,
+            BaseballStat.BB: row.bb,
             BaseballStat.AB: at_bats,
             BaseballStat.H: hits,
-            BaseballStat.HR: homers,
-            BaseballStat.R: float(NumberFireApi.find_with_class(tds, "r")),
-            BaseballStat.RBI: float(NumberFireApi.find_with_class(tds, "rbi")),
-            BaseballStat.SB: float(NumberFireApi.find_with_class(tds, "sb"))
+            BaseballStat.HR: row.hr,
+            BaseballStat.R: row.r,
+            BaseballStat.RBI: row.rbi,
+            BaseballStat.SB: row.sb,
         }
 
-        return name, Stats(projection_dict, BaseballStat)
-
-    @staticmethod
-    def find_with_class(elt, target_class):
-        return next(
-            filter(lambda a: a.has_attr("class") and target_class in a["class"], elt)
-        ).text.strip()
+        return row.name, Stats(projection_dict, BaseballStat)
 
     def projections(self) -> List[PlayerProjection]:
         """
@@ -198,11 +216,10 @@ class NumberFireApi:
         :return list: projections for each player with a game today
         """
         basketball_url = "http://www.numberfire.com/nba/fantasy/full-fantasy-basketball-projections"
-        basketball_page = self._page(basketball_url)
         return list(
             map(
                 NumberFireApi.row_to_projection_basketball,
-                self._projections_table(basketball_page).find_all("tr")
+                self._projections_table(basketball_url, self.basketball_table),
             )
         )
 
@@ -213,7 +230,7 @@ class NumberFireApi:
         }
 
     def _get_hitter_projections_from_current_page(self) -> Dict[str, Stats]:
-        projections_rows = self._projections_table(self._page(self.baseball_url)).find_all("tr")
+        projections_rows = self._projections_table(self.baseball_url, self.baseball_table)
         if len(projections_rows) == 0:
             message = "Attempting to find projections from NumberFire and found none."
             raise NumberFireApiException(message)
@@ -251,8 +268,4 @@ class NumberFireApi:
             raise e
 
     def baseball_hitter_projections(self) -> Dict[str, Stats]:
-        projections = load_from_cache(
-            self._cache_key("baseball"),
-            self._baseball_hitter_projections
-        )
-        return projections
+        return self._baseball_hitter_projections()
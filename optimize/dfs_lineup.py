@@ -1,24 +1,28 @@
 import logging
+import math
+import time
+from functools import reduce
+from itertools import accumulate
 from typing import List, Dict, Optional, Set
 
+import numpy as np
+
 from espn.football.football_position import FootballPosition
 from espn.football.football_slot import FootballSlot
 from footballdiehards.dfs_projection import DFSProjection
 
-# 1. Start with top x at each position, see if lineup is possible?
-# 2. expand by 1 player each time, forcing that player into lineup?
-# 3. expand adding next top player by value?
-
 # player pool:
 # Dict[position, List[projection]] - players sorted by proj. points
 #
-# search space:
-# Dict[Position, count] - starting with strictly max possible of each using flex
-#
-# gen all rosters using those params, filter down to possible with salary cap
+# best lineup:
+# depth first over the slots, FLEX last, trying players best projection first; abandon a partial
+# lineup once it is over the salary cap or cannot beat the best lineup found so far
 
 LOGGER = logging.getLogger('optimize.dfs_lineup')
 
+# the most steps that the salary cap is divided into when bounding the points left under it
+MAX_SALARY_STEPS = 1000
+
 positions_for_slot: Dict[FootballSlot, List[FootballPosition]] = {
     FootballSlot.QUARTER_BACK: [FootballPosition.QUARTER_BACK],
     FootballSlot.RUNNING_BACK: [FootballPosition.RUNNING_BACK],
@@ -102,21 +106,6 @@ def player_pool(projections: List[DFSProjection]) -> PlayerPool:
     return pool
 
 
-def expand_search_space(search_space: Dict[FootballPosition, int],
-                        pool: PlayerPool) -> \
-        (Dict[FootballPosition, int], DFSProjection):
-    nexts = []
-    for pos in FootballPosition:
-        next_up = search_space[pos] + 1
-        proj = pool.player_at_rank(pos, next_up)
-        if proj is not None:
-            nexts.append(proj)
-    player = max(nexts, key=lambda proj: proj.value())
-    next_space = search_space.copy()
-    next_space[player.position] += 1
-    return next_space, player
-
-
 def restricted_pool(pool: PlayerPool,
                     search_space: Dict[FootballPosition, List[DFSProjection]]) -> \
         PlayerPool:
@@ -126,30 +115,278 @@ def restricted_pool(pool: PlayerPool,
     })
 
 
-starting_space = {
-    FootballPosition.QUARTER_BACK: 2,
-    FootballPosition.RUNNING_BACK: 4,
-    FootballPosition.WIDE_RECEIVER: 5,
-    FootballPosition.TIGHT_END: 2,
-    FootballPosition.DEFENSE: 4
-}
-
-
-def best_lineup(pool: PlayerPool, slots: Dict[FootballSlot, int], salary: int) -> Lineup:
-    space = starting_space
-    # small_pool = restricted_pool(pool, space)
+def best_lineup(pool: PlayerPool, slots: Dict[FootballSlot, int], salary: int) -> \
+        Optional[Lineup]:
+    """
+    Finds the lineup with the most projected points that fills the given slots from the whole
+    pool without going over the salary cap.
+    :param pool: the players to choose from
+    :param slots: how many players to start in each slot
+    :param salary: the salary cap
+    :return: the best lineup, or None if no lineup is under the cap
+    """
+    search = BranchAndBound(pool, slots, salary)
+    lineup = search.best()
+    LOGGER.info(f"Searched {search.nodes} partial lineups, pruned {search.prunes}.")
+    return lineup
+
+
+def pick_order(slots: Dict[FootballSlot, int]) -> List[FootballSlot]:
+    """
+    :param slots: how many players to start in each slot
+    :return: the slot of each pick, grouped by slot, with FLEX picked last
+    """
+    order = []
+    for slot in FootballSlot:
+        if slot != FootballSlot.FLEX:
+            order += [slot] * slots.get(slot, 0)
+    return order + [FootballSlot.FLEX] * slots.get(FootballSlot.FLEX, 0)
+
+
+class BranchAndBound:
+
+    def __init__(self, pool: PlayerPool, slots: Dict[FootballSlot, int], salary: int,
+                 previous: List[Lineup] = (), max_overlap: Optional[int] = None):
+        """
+        A depth first search for the lineup with the most projected points under a salary cap.
+
+        Each slot's players are tried best projection first, and the players in a slot are picked
+        in that order, so that every set of players is reached by exactly one sequence of picks:
+        RB1/RB2 swaps are never tried, and a FLEX player must rank below every player already in
+        the slot for its position. A partial lineup is abandoned if no completion is under the cap,
+        or if even the best completion under the cap, found by a knapsack over each slot's salaries
+        that lets FLEX repeat players, could not beat the best lineup found.
+        :param pool: the players to choose from
+        :param slots: how many players to start in each slot
+        :param salary: the salary cap
+        :param previous: lineups already chosen, which the lineup found must differ from
+        :param max_overlap: the most players that the lineup found may share with any previous
+        lineup, or None to allow any number
+        """
+        self.salary = salary
+        self.max_overlap = max_overlap
+        # the previous lineups that each player is in, and how many players of each are chosen
+        self.lineups_with = dict()
+        for j, lineup in enumerate(previous):
+            for p in lineup.player_set:
+                self.lineups_with.setdefault(p, []).append(j)
+        self.overlaps = [0] * len(previous)
+        self.picks = pick_order(slots)
+        self.candidates = {
+            slot: sorted(pool.players_for_slot(slot), key=lambda p: p.projection, reverse=True)
+            for slot in set(self.picks)
+        }
+        # each player's rank in the slot for their own position, which a FLEX pick must be below
+        self.ranks = dict()
+        for slot, players in self.candidates.items():
+            if slot != FootballSlot.FLEX:
+                self.ranks.update((p, i) for i, p in enumerate(players))
+        # the total of the best i projections in each slot
+        self.points_prefix = {
+            slot: [0.0] + list(accumulate(p.projection for p in players))
+            for slot, players in self.candidates.items()
+        }
+
+        # salaries are bounded in whole steps, each rounded down, so that a lineup under the cap is
+        # still under it in steps
+        salaries = [p.salary for players in self.candidates.values() for p in players]
+        self.step = max(reduce(math.gcd, salaries, salary), math.ceil(salary / MAX_SALARY_STEPS), 1)
+        num_steps = salary // self.step + 1
+
+        # for each pick, the picks left in its slot including it, the most points of the slots
+        # after it, and the most points that it and every pick after it could add for each number
+        # of salary steps left, ignoring that FLEX may repeat players
+        self.remaining_in_slot = [self.picks[k:].count(slot) for k, slot in enumerate(self.picks)]
+        self.later_points = []
+        for k, slot in enumerate(self.picks):
+            later = {s: self.picks[k:].count(s) for s in set(self.picks[k:]) if s != slot}
+            self.later_points.append(
+                sum(self._best_points(s, count) for s, count in later.items())
+            )
+        self.bounds = [None] * len(self.picks) + [np.zeros(num_steps)]
+        for k in reversed(range(len(self.picks))):
+            remaining = self.remaining_in_slot[k]
+            self.bounds[k] = _max_plus(
+                _best_by_salary(self.candidates[self.picks[k]], remaining, self.step, num_steps),
+                self.bounds[k + remaining],
+            )
+
+        self.last_rank = dict()
+        self.chosen = []
+        self.best_points = -math.inf
+        self.best_players = None
+        self.nodes = 0
+        self.prunes = 0
+
+    def _best_points(self, slot, count):
+        prefix = self.points_prefix[slot]
+        return prefix[min(count, len(prefix) - 1)]
+
+    def _ranks_above_own_slot(self, player: DFSProjection) -> bool:
+        own_slot = slots_for_position[player.position]
+        return self.ranks.get(player, math.inf) <= self.last_rank.get(own_slot, -1)
+
+    def best(self) -> Optional[Lineup]:
+        """
+        :return: the lineup with the most projected points under the cap, or None if there is none
+        """
+        self._search(0, 0, 0, 0.0)
+        return None if self.best_players is None else Lineup(set(self.best_players))
+
+    def _search(self, k: int, start: int, salary: int, points: float):
+        self.nodes += 1
+        if k == len(self.picks):
+            if points > self.best_points:
+                self.best_points = points
+                self.best_players = list(self.chosen)
+            return
+
+        slot = self.picks[k]
+        players = self.candidates[slot]
+        remaining = self.remaining_in_slot[k]
+        points_prefix = self.points_prefix[slot]
+        next_bound = self.bounds[k + 1]
+        for i in range(start, len(players) - remaining + 1):
+            # players are in order of projection, so no later player can do better either
+            best_possible = points_prefix[i + remaining] - points_prefix[i] + self.later_points[k]
+            if points + best_possible <= self.best_points:
+                self.prunes += 1
+                break
+            player = players[i]
+            if slot == FootballSlot.FLEX and self._ranks_above_own_slot(player):
+                continue
+            next_salary = salary + player.salary
+            steps_left = (self.salary - next_salary) // self.step
+            # -inf when the picks after this cannot be made under the cap
+            if steps_left < 0 or \
+                    points + player.projection + next_bound[steps_left] <= self.best_points:
+                self.prunes += 1
+                continue
+            if not self._share(player, 1):
+                self._share(player, -1)
+                self.prunes += 1
+                continue
+            if remaining == 1:
+                self.last_rank[slot] = i
+            self.chosen.append(player)
+            self._search(k + 1, i + 1 if remaining > 1 else 0, next_salary,
+                         points + player.projection)
+            self.chosen.pop()
+            self._share(player, -1)
+
+    def _share(self, player: DFSProjection, change: int) -> bool:
+        """
+        Counts the player as chosen, or no longer chosen, in the overlap with each previous lineup
+        that they are in.
+        :return: whether every overlap is still within the most allowed
+        """
+        within = True
+        for j in self.lineups_with.get(player, ()):
+            self.overlaps[j] += change
+            if self.max_overlap is not None and self.overlaps[j] > self.max_overlap:
+                within = False
+        return within
+
+
+class LineupSolution:
+
+    def __init__(self, lineups: List[Lineup], seconds: float, nodes: int, prunes: int):
+        """
+        The lineups found by best_lineups, and what it took to find them.
+        :param lineups: the lineups, best first
+        :param seconds: how long it took to find them
+        :param nodes: the partial lineups searched
+        :param prunes: the partial lineups abandoned
+        """
+        self.lineups = lineups
+        self.seconds = seconds
+        self.nodes = nodes
+        self.prunes = prunes
+
+    def __str__(self):
+        return f"{len(self.lineups)} lineups in {self.seconds:.2f}s, searching {self.nodes}" \
+               f" partial lineups and pruning {self.prunes}"
+
+
+def best_lineups(projections: List[DFSProjection], slots: Dict[FootballSlot, int], salary: int,
+                 count: int, max_overlap: Optional[int] = None,
+                 max_exposure: float = 1.0) -> LineupSolution:
+    """
+    Finds up to count lineups under the salary cap from the pool of the given projections, each the
+    best lineup that is different enough from those before it.
+
+    Every lineup is found by a branch and bound search bounded by a knapsack over salary, in which
+    a player that has reached their exposure limit is no longer in the pool.
+    :param projections: the players to choose from, filtered and sorted as player_pool does
+    :param slots: how many players to start in each slot
+    :param salary: the salary cap
+    :param count: how many lineups to find
+    :param max_overlap: the most players that any two lineups may share, by default one fewer
+    than a whole lineup
+    :param max_exposure: the largest fraction of the lineups that any player may be in
+    :return: the lineups, best first, which are fewer than count if no more are possible
+    """
+    start = time.time()
+    pool = player_pool(projections)
+    if max_overlap is None:
+        max_overlap = sum(slots.values()) - 1
+    max_uses = max(1, math.floor(max_exposure * count))
+    uses = dict()
     lineups = []
-    while len(lineups) == 0:
-        space, player = expand_search_space(space, pool)
-        LOGGER.info(f"Expanding search space, now includes {player.player}")
-        small_pool = restricted_pool(pool, space)
-        slots_with_player = slots.copy()
-        slot = slots_for_position[player.position]
-        slots_with_player[slot] -= 1
-        lineups = valid_lineups(small_pool, slots_with_player, salary, {player})
-    lineups.sort(key=lambda l: l.total_points(), reverse=True)
-    LOGGER.info(f"Found {len(lineups)} possible lineups.")
-    return lineups[0]
+    nodes = 0
+    prunes = 0
+    while len(lineups) < count:
+        available = PlayerPool({
+            pos: [p for p in players if uses.get(p, 0) < max_uses]
+            for pos, players in pool.player_dict.items()
+        })
+        search = BranchAndBound(available, slots, salary, lineups, max_overlap)
+        lineup = search.best()
+        nodes += search.nodes
+        prunes += search.prunes
+        if lineup is None:
+            break
+        lineups.append(lineup)
+        for p in lineup.player_set:
+            uses[p] = uses.get(p, 0) + 1
+    solution = LineupSolution(lineups, time.time() - start, nodes, prunes)
+    LOGGER.info(f"Found {solution}")
+    return solution
+
+
+def _best_by_salary(players: List[DFSProjection], count: int, step: int, num_steps: int) -> \
+        np.ndarray:
+    """
+    :param players: the players to choose from
+    :param count: how many of them to choose
+    :param step: the salary of one step, which each player's salary is rounded down to
+    :param num_steps: the number of salary steps to find the most points for, from 0
+    :return: the most points of any count players with at most each number of steps of salary, or
+    -inf if there are not that many players that cheap
+    """
+    best = np.full((count + 1, num_steps), -math.inf)
+    best[0] = 0.0
+    for p in players:
+        cost = p.salary // step
+        if cost >= num_steps:
+            continue
+        for chosen in range(count, 0, -1):
+            np.maximum(best[chosen, cost:], best[chosen - 1, :num_steps - cost] + p.projection,
+                       out=best[chosen, cost:])
+    return best[count]
+
+
+def _max_plus(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """
+    :return: for each number of salary steps, the most points of splitting those steps between the
+    first and second choices, given the most points of each for every number of steps
+    """
+    combined = np.full(len(first), -math.inf)
+    for steps, points in enumerate(first):
+        if points > -math.inf:
+            np.maximum(combined[steps:], points + second[:len(second) - steps],
+                       out=combined[steps:])
+    return combined
 
 
 def valid_lineups(pool: PlayerPool, slots: Dict[FootballSlot, int], salary: int,
@@ -2,21 +2,29 @@ import logging
 import operator
 from typing import Dict
 
+import numpy as np
+
 from espn.baseball.baseball_api import BaseballApi
 from espn.baseball.baseball_position import BaseballPosition
 from espn.baseball.baseball_slot import BaseballSlot
 from espn.baseball.baseball_stat import BaseballStat
 from fangraphs.api import FangraphsApi
+from lineup import LineupDistances
 from lineup_transition import LineupTransition
 from notifications.notifier import Notifier
 from numberfire.api import NumberFireApi
-from optimize.lineup_total import LineupTotal
+from optimize.lineup_total import LineupTotals
 from scoring_setting import ScoringSetting
 from stats import Stats
 
 
 LOGGER = logging.getLogger("optimize.optimizer")
 
+# how far below each category's best value best_lineups lowers its bar at a time
+THRESHOLD_STEP = 0.01
+# how many times it may do so before giving up, taking the bar from 99% down to -100%
+MAX_THRESHOLD_STEPS = 200
+
 
 # first - log/notify number of lineups to choose from within 95% of max PA
 # then - choose best: first one to appear within some % of max of all categories
@@ -28,7 +36,8 @@ def optimize_lineup_nf(espn: BaseballApi, nf: NumberFireApi, notifier: Notifier)
     return optimize_lineup_from_projections(espn, nf.baseball_hitter_projections(), notifier)
 
 
-def optimize_lineup_from_projections(espn: BaseballApi, hitter_projections: Dict[str, Stats], notifier: Notifier):
+def optimize_lineup_from_projections(espn: BaseballApi, hitter_projections: Dict[str, Stats],
+                                     notifier: Notifier):
     """
     Optimizes the lineup that is accessible from the given ESPN api object, with
     projections from the given Fangraphs api object. Notifies the notifier object
@@ -41,36 +50,31 @@ def optimize_lineup_from_projections(espn: BaseballApi, hitter_projections: Dict
     LOGGER.info(f"Current lineup: {lineup}")
     l_settings = espn.lineup_settings()
     s_settings = espn.scoring_settings()
-    hitting_settings = filter(
-        lambda s: s.stat
-        not in {
-            BaseballStat.K,
-            BaseballStat.W,
-            BaseballStat.ERA,
-            BaseballStat.WHIP,
-            BaseballStat.SV,
-        },
-        s_settings,
+    hitting_settings = list(
+        filter(
+            lambda s: s.stat
+            not in {
+                BaseballStat.K,
+                BaseballStat.W,
+                BaseballStat.ERA,
+                BaseballStat.WHIP,
+                BaseballStat.SV,
+            },
+            s_settings,
+        )
     )
 
-    possibles = possible_lineup_totals(lineup, l_settings, hitter_projections)
-    best_pa = best_for_stat(lineup, possibles, ScoringSetting(BaseballStat.PA, False, 0.0))
-    threshold = best_pa.stats.value_for_stat(BaseballStat.PA) * 0.95
-    candidates = above_threshold_for_stat(
-        possibles, ScoringSetting(BaseballStat.PA, False, 0.0), threshold
+    distances = LineupDistances(lineup)
+    most_pas_from_best = best_hitting_total(
+        lineup, l_settings, hitter_projections, hitting_settings, distances
     )
+    LOGGER.info(f"Using lineup {most_pas_from_best.lineup}")
 
-    num_candidates = len(candidates)
+    hitting_transitions = distances.transitions(most_pas_from_best.lineup)
     LOGGER.info(
-        f"found {num_candidates} candidates within 95% of max PA's (above threshold {threshold})"
-    )
-    best_list = best_lineups(lineup, candidates, hitting_settings)
-    most_pas_from_best = best_for_stat(
-        lineup, best_list, ScoringSetting(BaseballStat.PA, False, 0.0)
+        f"computed transitions to {distances.misses} lineups,"
+        f" {distances.hits} served from cache"
     )
-    LOGGER.info(f"Using lineup {most_pas_from_best.lineup}")
-
-    hitting_transitions = lineup.transitions(most_pas_from_best.lineup)
     pitching_transitions = optimal_pitching_transitions(lineup, espn)
     notifier.notify_set_lineup(
         espn.team_name(),
@@ -84,109 +88,231 @@ def optimize_lineup_from_projections(espn: BaseballApi, hitter_projections: Dict
         espn.execute_transitions(hitting_transitions + pitching_transitions)
 
 
-def best_lineups(current, candidates, scoring_settings):
+def best_hitting_total(lineup, lineup_settings, projections, hitting_settings, distances=None):
     """
-    Returns the best Lineups given a list of candidate LineupTotals and a list of ScoringSettings.
+    Picks the best hitting lineup by enumerating the totals of every possible lineup, keeping
+    those within 95% of the maximum plate appearances, and choosing from those the lineup that
+    is within the highest percentage of the best value in every category.
+    :param Lineup lineup: the current lineup
+    :param LineupSettings lineup_settings: the restrictions of the current league
+    :param dict projections: the projected Stats of each hitter, by name
+    :param list hitting_settings: the hitting ScoringSettings to optimize over
+    :param LineupDistances distances: the transitions from the current lineup, if already tracked
+    :return LineupTotal: the best lineup, with its projected totals
+    """
+    if distances is None:
+        distances = LineupDistances(lineup)
+    possibles = possible_lineup_totals(lineup, lineup_settings, projections)
+    pa_setting = ScoringSetting(BaseballStat.PA, False, 0.0)
+    best_pa = best_for_stat(distances, possibles, pa_setting)
+    threshold = possibles.values_for_stat(BaseballStat.PA)[best_pa] * 0.95
+    candidates = above_threshold_for_stat(possibles, pa_setting, threshold)
+
+    num_candidates = len(candidates)
+    LOGGER.info(
+        f"found {num_candidates} candidates within 95% of max PA's (above threshold {threshold})"
+    )
+    best_list = best_lineups(candidates, hitting_settings)
+    return best_list.total(best_for_stat(distances, best_list, pa_setting))
+
+
+def best_lineups(candidates, scoring_settings):
+    """
+    Returns the best Lineups given the candidate LineupTotals and a list of ScoringSettings.
     Picks the Lineups that are within the highest possible percentage threshold of each
-    maximum value across all scoring settings.
+    maximum value across all scoring settings, with the threshold lowered in steps of
+    THRESHOLD_STEP until some Lineup passes.
 
-    :param Lineup current: the currently-set Lineup
-    :param list candidates: the LineupTotals from which to choose a Lineup
+    Rather than re-filtering every candidate at each step, the range of steps at which each
+    candidate passes is found directly, in a single pass over the candidates per setting.
+
+    :param LineupTotals candidates: the totals of the Lineups from which to choose
     :param iter scoring_settings: the ScoringSettings to optimize over
-    :return list: the best Lineups from the list
+    :return LineupTotals: the totals of the best Lineups
     """
     max_values = list()
     for setting in scoring_settings:
-        lt = best_for_stat(current, candidates, setting)
-        max_values.append((setting, lt.stats.value_for_stat(setting.stat)))
-
-    threshold = 1.0
-    passing = list()
-    # while list of passing candidates is empty, decr. threshold by .01 and try again
-    while len(passing) == 0:
-        threshold -= 0.01
-        LOGGER.debug(f"filtering candidates at threshold value {threshold}")
-        passing = candidates_above_threshold(candidates, max_values, threshold)
-    num_to_choose = len(passing)
+        values = candidates.values_for_stat(setting.stat)
+        max_values.append((setting, best_value(values, setting)))
+
+    thresholds = threshold_steps(MAX_THRESHOLD_STEPS)
+    first, last = passing_steps(candidates, max_values, thresholds)
+    passes_any = first < last
+    if not passes_any.any():
+        LOGGER.warning(
+            f"no candidates pass for each stat above threshold {round(thresholds[-1], 2)}"
+        )
+        return candidates
+    step = first[passes_any].min()
+    passing = (first <= step) & (step < last)
+    num_to_choose = np.count_nonzero(passing)
     LOGGER.info(
-        f"{num_to_choose} candidates pass for each stat at {round(threshold, 2)}"
+        f"{num_to_choose} candidates pass for each stat at {round(thresholds[step], 2)}"
     )
-    return passing
+    return candidates.subset(passing)
+
+
+def threshold_steps(count):
+    """
+    :param int count: the number of steps to take
+    :return np.ndarray: the thresholds that best_lineups tries in order, starting just below 1.0
+    """
+    thresholds = np.empty(count)
+    threshold = 1.0
+    for i in range(count):
+        # accumulate exactly as repeatedly subtracting would, so every threshold is bit-identical
+        threshold -= THRESHOLD_STEP
+        thresholds[i] = threshold
+    return thresholds
+
+
+def passing_steps(candidates, maxes, thresholds):
+    """
+    Finds, for every candidate, the range of threshold steps at which it is above the given
+    percentage of the maximum value for every ScoringSetting.
+
+    Each bar (the maximum times a threshold) moves monotonically as the threshold decreases, so
+    the steps at which a candidate passes a setting are a prefix or suffix of all the steps, whose
+    length is found by a binary search over the sorted bars.
+    :param LineupTotals candidates: the totals of the candidate Lineups
+    :param list maxes: pairs of ScoringSetting and the best value for it across candidates
+    :param np.ndarray thresholds: the decreasing threshold percentages to try
+    :return tuple: arrays of the first (inclusive) and last (exclusive) passing step per candidate
+    """
+    num_steps = len(thresholds)
+    first = np.zeros(len(candidates), dtype=int)
+    last = np.full(len(candidates), num_steps, dtype=int)
+    for (setting, best) in maxes:
+        bars = best * thresholds
+        sorted_bars = np.sort(bars)
+        values = candidates.values_for_stat(setting.stat)
+        if setting.is_reverse:
+            num_passing = num_steps - np.searchsorted(sorted_bars, values, side="right")
+        else:
+            num_passing = np.searchsorted(sorted_bars, values, side="left")
+        # comparisons with NaN never pass
+        num_passing = np.where(np.isnan(values), 0, num_passing)
+        # bars fall as the threshold does when the maximum is non-negative
+        if (best >= 0) != setting.is_reverse:
+            first = np.maximum(first, num_steps - num_passing)
+        else:
+            last = np.minimum(last, num_passing)
+    return first, last
+
+
+def pareto_frontier(candidates, scoring_settings):
+    """
+    Returns the candidates that are not dominated by any other candidate: no other candidate is at
+    least as good in every ScoringSetting and strictly better in one.
+    :param LineupTotals candidates: the totals of the candidate Lineups
+    :param iter scoring_settings: the ScoringSettings to compare over
+    :return LineupTotals: the totals of the Lineups on the Pareto frontier
+    """
+    columns = list()
+    for setting in scoring_settings:
+        values = candidates.values_for_stat(setting.stat)
+        values = -values if setting.is_reverse else values
+        columns.append(np.where(np.isnan(values), -np.inf, values))
+    if len(columns) == 0 or len(candidates) == 0:
+        return candidates
+    oriented = np.column_stack(columns)
+
+    # in descending lexicographic order, a candidate can only be dominated by an earlier one
+    order = np.lexsort(oriented.T[::-1])[::-1]
+    frontier = list()
+    for i in order:
+        if frontier:
+            kept = oriented[frontier]
+            at_least = (kept >= oriented[i]).all(axis=1)
+            better = (kept > oriented[i]).any(axis=1)
+            if (at_least & better).any():
+                continue
+        frontier.append(i)
+    return candidates.subset(sorted(frontier))
 
 
 def candidates_above_threshold(candidates, maxes, threshold_percentage):
-    passing = candidates.copy()
+    """
+    Checks which candidates are above the given percentage of the maximum value for every
+    ScoringSetting.
+    :param LineupTotals candidates: the totals of the candidate Lineups
+    :param list maxes: pairs of ScoringSetting and the best value for it across candidates
+    :param float threshold_percentage: how close to the best value each candidate must be
+    :return np.ndarray: a boolean mask, True for each passing candidate
+    """
+    passing = np.ones(len(candidates), dtype=bool)
     for (setting, value) in maxes:
-        passing = above_threshold_for_stat(
-            passing, setting, value * threshold_percentage
-        )
-        if len(passing) == 0:
+        passing &= passes_threshold(candidates, setting, value * threshold_percentage)
+        if not passing.any():
             LOGGER.debug(
                 f"none pass for {setting.stat} at value {value * threshold_percentage}"
             )
-            return list()
+            break
+    return passing
 
-    return list(passing)
+
+def passes_threshold(totals, scoring_setting, threshold):
+    """
+    :param LineupTotals totals: the totals to check
+    :param ScoringSetting scoring_setting: the ScoringSetting to check with
+    :param float threshold: the value that each total must exceed
+    :return np.ndarray: a boolean mask, True for each total that exceeds the threshold
+    """
+    comp = operator.lt if scoring_setting.is_reverse else operator.gt
+    return comp(totals.values_for_stat(scoring_setting.stat), threshold)
 
 
 def above_threshold_for_stat(totals, scoring_setting, threshold):
     """
-    Returns the list of LineupTotals from the given list that exceed the given threshold for
-    the given ScoringSetting.
-    :param list totals: the list of LineupTotals to filter
+    Returns the LineupTotals that exceed the given threshold for the given ScoringSetting.
+    :param LineupTotals totals: the totals to filter
     :param ScoringSetting scoring_setting: the ScoringSetting to filter with
     :param float threshold: the value that each LineupTotal must exceed
-    :return list: all LineupTotals that pass the test
+    :return LineupTotals: all totals that pass the test
     """
-    comp = operator.lt if scoring_setting.is_reverse else operator.gt
-    return list(
-        filter(
-            lambda lt: lt.passes_threshold(scoring_setting.stat, threshold, comp),
-            totals,
-        )
-    )
+    return totals.subset(passes_threshold(totals, scoring_setting, threshold))
 
 
-def best_for_stat(current, totals, scoring_setting):
+def best_for_stat(distances, totals, scoring_setting):
     """
-    Determines which LineupTotal from a list of LineupTotals is best for a given stat.
+    Determines which of the given LineupTotals is best for a given stat.
 
     Best is the LineupTotal that produces the maximum (or minimum) for that setting while also
     requiring the minimum transitions from the current lineup.
 
-    :param Lineup current: the currently-set Lineup
-    :param list totals: the LineupTotals that are possible from the given Lineup
+    :param LineupDistances distances: the transitions from the currently-set Lineup
+    :param LineupTotals totals: the totals of the Lineups that are possible from the given Lineup
     :param ScoringSetting scoring_setting: the setting for which to optimize
-    :return LineupTotal: the LineupTotal that is best from the givens
+    :return int: the index of the best total
     """
-    max_total = totals[0]
+    values = totals.values_for_stat(scoring_setting.stat)
+    tied = np.flatnonzero(values == best_value(values, scoring_setting))
+    if len(tied) == 1:
+        return int(tied[0])
+    transitions = [distances.distance(totals.lineups[i]) for i in tied]
+    return int(tied[int(np.argmin(transitions))])
 
-    for cur_total in totals:
-        better_comp = operator.gt if not scoring_setting.is_reverse else operator.lt
-        if cur_total.compare(max_total, scoring_setting.stat, better_comp):
-            max_total = cur_total
-        elif cur_total.compare(max_total, scoring_setting.stat, operator.eq):
-            max_transitions = current.transitions(max_total.lineup)
-            cur_transitions = current.transitions(cur_total.lineup)
-            if len(cur_transitions) < len(max_transitions):
-                max_total = cur_total
 
-    return max_total
+def best_value(values, scoring_setting):
+    """
+    :param np.ndarray values: values for the stat of the given setting
+    :param ScoringSetting scoring_setting: the setting for which to optimize
+    :return float: the maximum (or minimum) of the values, ignoring those that are undefined
+    """
+    return np.nanmin(values) if scoring_setting.is_reverse else np.nanmax(values)
 
 
 def possible_lineup_totals(lineup, lineup_settings, projections):
     """
     From a single lineup (with the settings for that league) and the projections,
-    produces a list of all possible LineupTotals.
+    produces the totals of all possible lineups.
     :param Lineup lineup: the current lineup to examine
     :param LineupSettings lineup_settings: the restrictions of the current league
     :param dict projections: a mapping of Player to projected Stats
-    :return: list
+    :return LineupTotals: the totals of every possible lineup
     """
     possibles = lineup.possible_lineups(lineup_settings, BaseballSlot.hitting_slots())
-    return list(
-        map(lambda l: LineupTotal.total_from_projections(l, projections), possibles)
-    )
+    return LineupTotals.totals_from_projections(possibles, projections)
 
 
 def optimal_pitching_transitions(lineup, espn):
@@ -240,7 +366,8 @@ def must_start_pitchers(lineup, espn):
     pitchers = list(
         filter(lambda player: player.can_play(BaseballSlot.PITCHER), players)
     )
-    probable_pitchers = {p for p in pitchers if espn.is_probable_pitcher(p.espn_id)}
+    probable_ids = espn.probable_pitchers([p.espn_id for p in pitchers])
+    probable_pitchers = {p for p in pitchers if p.espn_id in probable_ids}
     relievers = {p for p in pitchers if p.default_position == BaseballPosition.RELIEVER}
     return probable_pitchers.union(relievers).difference(lineup.injured())
 
@@ -1,3 +1,5 @@
+import numpy as np
+
 from espn.baseball.baseball_stat import BaseballStat
 from stats import Stats
 
@@ -27,7 +29,7 @@ class LineupTotal:
         for starter in lineup.starters():
             projection = projections.get(starter.name)
             if projection is not None:
-                stats += projection
+                stats.iadd(projection)
 
         for stat, value in stats.stat_dict.items():
             stats.stat_dict[stat] = round(value, 2)
@@ -57,3 +59,132 @@ class LineupTotal:
         :return bool: True if this LineupTotal passes
         """
         return comparator(self.stats.value_for_stat(stat), threshold)
+
+
+class LineupTotals:
+    def __init__(self, lineups, sums, stat_enum=BaseballStat):
+        """
+        The totals of many lineups at once: pairs a list of Lineups with a (lineups x stats) array
+        holding their cumulative, total values for each summable stat.
+        :param list lineups: the lineups accruing the stats
+        :param np.ndarray sums: for each lineup, its totals in the order of summed_stats(stat_enum)
+        :param stat_enum: the enum of Stats that are totalled
+        """
+        self.lineups = lineups
+        self.sums = sums
+        self.stat_enum = stat_enum
+        self.columns = {stat: i for i, stat in enumerate(summed_stats(stat_enum))}
+
+    @staticmethod
+    def totals_from_projections(lineups, projections, stat_enum=BaseballStat):
+        """
+        Calculates the accumulated statistics of the starters of every given lineup at once.
+
+        Builds a (players x stats) matrix of projections once, and a (lineups x players) matrix
+        saying which players start in which lineup, so that every total is a single matrix product.
+        :param iter lineups: the lineups to total
+        :param dict projections: the projected stats of each player, by name
+        :param stat_enum: the enum of Stats that are totalled
+        :return LineupTotals: the totals of all the lineups
+        """
+        lineups = list(lineups)
+        stats = summed_stats(stat_enum)
+        starters = [lineup.starters() for lineup in lineups]
+        player_index = dict()
+        for lineup_starters in starters:
+            for player in lineup_starters:
+                player_index.setdefault(player, len(player_index))
+
+        projection_matrix = np.zeros((len(player_index), len(stats)))
+        for player, i in player_index.items():
+            projection = projections.get(player.name)
+            if projection is not None:
+                projection_matrix[i] = [projection.stat_dict.get(s, 0.0) for s in stats]
+
+        starter_matrix = np.zeros((len(lineups), len(player_index)))
+        for j, lineup_starters in enumerate(starters):
+            for player in lineup_starters:
+                starter_matrix[j, player_index[player]] = 1.0
+
+        sums = round_values(starter_matrix @ projection_matrix, 2)
+        return LineupTotals(lineups, sums, stat_enum)
+
+    def __len__(self):
+        return len(self.lineups)
+
+    def subset(self, indices):
+        """
+        :param indices: the indices (or boolean mask) of the lineups to keep
+        :return LineupTotals: the totals of only the selected lineups
+        """
+        indices = np.flatnonzero(indices) if np.asarray(indices).dtype == bool else indices
+        return LineupTotals(
+            [self.lineups[i] for i in indices], self.sums[indices], self.stat_enum
+        )
+
+    def _sum(self, stat):
+        return self.sums[:, self.columns[stat]]
+
+    def values_for_stat(self, stat):
+        """
+        Calculates the value of the given stat for every lineup, rounded as in Stats.value_for_stat
+        :param stat: the stat to calculate
+        :return np.ndarray: the value for each lineup
+        """
+        if stat in self.columns:
+            return round_values(self._sum(stat), stat.num_rounding_digits())
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if stat == BaseballStat.AVG:
+                values = self._sum(BaseballStat.H) / self._sum(BaseballStat.AB)
+            elif stat == BaseballStat.OBP:
+                values = (
+                    self._sum(BaseballStat.H) + self._sum(BaseballStat.BB)
+                ) / self._sum(BaseballStat.PA)
+            elif stat == BaseballStat.ERA:
+                values = self._sum(BaseballStat.ER) * 27.0 / self._sum(BaseballStat.OUTS)
+            elif stat == BaseballStat.WHIP:
+                values = (
+                    self._sum(BaseballStat.P_H) + self._sum(BaseballStat.P_BB)
+                ) / self._sum(BaseballStat.OUTS) * 3.0
+            else:
+                raise ValueError(f"cannot total {stat}")
+        values = round_values(values, 3)
+        # like Stats, ERA and WHIP are rounded to three digits before being rounded to two
+        if stat.num_rounding_digits() < 3:
+            values = round_values(values, stat.num_rounding_digits())
+        return values
+
+    def total(self, index):
+        """
+        :param int index: the index of the lineup
+        :return LineupTotal: the total of the lineup at the given index
+        """
+        stat_dict = {stat: float(self.sums[index, i]) for stat, i in self.columns.items()}
+        return LineupTotal(self.lineups[index], Stats(stat_dict, self.stat_enum))
+
+
+def summed_stats(stat_enum):
+    """
+    :param stat_enum: the enum of Stats
+    :return list: the summable stats of the enum, in a fixed order
+    """
+    return sorted(stat_enum.sum_stats(), key=lambda s: s.value)
+
+
+def round_values(values, digits):
+    """
+    Rounds every value of the given array as the builtin round() would, so that ties between
+    lineups come out exactly as they do between Stats.
+
+    np.round scales each value by a power of ten and rounds that, which only disagrees with
+    round() when the scaled value lands exactly halfway, so only those values are rounded one at
+    a time.
+    :param np.ndarray values: the values to round
+    :param int digits: the number of decimal digits to keep
+    :return np.ndarray: the rounded values
+    """
+    rounded = np.round(values, digits)
+    scaled = values * 10.0 ** digits
+    for i in np.flatnonzero(np.abs(scaled - np.trunc(scaled)) == 0.5):
+        rounded.flat[i] = round(float(values.flat[i]), digits)
+    return rounded
@@ -6,6 +6,7 @@ from typing import Dict
 from espn.basketball.basketball_api import BasketballApi
 from espn.basketball.basketball_slot import BasketballSlot
 from fantasysp.api import FantasySPApi
+from lineup import LineupDistances
 
 LOGGER = logging.getLogger("optimize.optimize_fp")
 
@@ -44,6 +45,7 @@ def optimize_fp(espn, player_to_points: Dict[str, float], notifier):
         else:
             LOGGER.info(f"Projection for {player.name:<30}{projection}")
 
+    distances = LineupDistances(cur_lineup)
     # min/max least transitions, most points
     cur_max_points = 0.0
     cur_least_transitions = 0
@@ -51,20 +53,24 @@ def optimize_fp(espn, player_to_points: Dict[str, float], notifier):
     for l in poss_lineups:
         fp = total_fp_given_starters(player_to_points, l.starters())
         if cur_max_points + 0.1 > fp > cur_max_points - 0.1:
-            num_transitions = len(cur_lineup.transitions(l))
+            num_transitions = distances.distance(l)
             if num_transitions < cur_least_transitions:
                 cur_best_lineup = l
                 cur_least_transitions = num_transitions
                 cur_max_points = fp
         if fp > cur_max_points + 0.1:
             cur_best_lineup = l
-            cur_least_transitions = len(cur_lineup.transitions(l))
+            cur_least_transitions = distances.distance(l)
             cur_max_points = fp
 
     total_points = total_fp_given_starters(player_to_points, cur_best_lineup.starters())
     LOGGER.info(f"Best lineup: {cur_best_lineup}, fp: {total_points}")
 
-    transitions = cur_lineup.transitions(cur_best_lineup)
+    transitions = distances.transitions(cur_best_lineup)
+    LOGGER.info(
+        f"computed transitions to {distances.misses} lineups,"
+        f" {distances.hits} served from cache"
+    )
     notifier.notify_set_fba_lineup(
         espn.team_name(), transitions, total_points, player_to_points
     )
@@ -1,6 +1,5 @@
 # Generate pre-draft rankings based on value above replacement level
 import logging
-from datetime import date
 from math import ceil, floor
 from pathlib import Path
 from typing import Dict, List
@@ -95,14 +94,6 @@ def _players_by_name(football: FootballApi):
     return players_by_name
 
 
-def _cached_projections_by_name(fantasy_pros: FantasyProsApi):
-    today = date.today()
-    date_string = str(today)
-    return load_from_cache(
-        Path(f"cache/fp-proj-{date_string}.p"), fantasy_pros.week_football_projections
-    )
-
-
 def projections_by_player(
     football: FootballApi, fantasy_pros: FantasyProsApi
 ) -> Dict[Player, float]:
@@ -111,7 +102,7 @@ def projections_by_player(
     https://www.fantasypros.com/nfl/projections
     """
     points_map = football.points_per_stat()
-    projections = _cached_projections_by_name(fantasy_pros)
+    projections = fantasy_pros.week_football_projections()
     players = _players_by_name(football)
     projected_points = dict()
     for name, stats in projections.items():
@@ -0,0 +1,270 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+LOGGER = logging.getLogger("scraping.page_cache")
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+# how long a page from each source is used before asking the source whether it has changed
+DEFAULT_TTLS = {
+    # season projections and rankings, which change at most daily
+    "fantasypros": 12 * HOUR,
+    # daily projections, which change as lineups are announced
+    "fangraphs": HOUR,
+    "fantasysp": HOUR,
+    "footballdiehards": HOUR,
+    "numberfire": 30 * MINUTE,
+}
+# the time to live of pages from any other source
+DEFAULT_TTL = HOUR
+
+DEFAULT_DIRECTORY = Path("cache/pages")
+
+# set to "offline" to serve only pages that have already been captured, without the network
+MODE_VARIABLE = "PAGE_CACHE_MODE"
+OFFLINE = "offline"
+
+
+class PageNotCapturedException(Exception):
+    """
+    Raise this exception when a page is requested offline that has never been captured
+    """
+    pass
+
+
+def page_key(method, url, data=None, variant=None):
+    """
+    Identifies a request for a page by everything that can change the page returned.
+    :param str method: the HTTP method, e.g. GET
+    :param str url: the requested URL
+    :param dict data: the form data POSTed with the request
+    :param variant: anything else that the page depends on, e.g. the slate chosen in a cookie
+    :return str: a hash of the request
+    """
+    request = json.dumps([method, url, data or {}, variant], sort_keys=True, default=str)
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+
+class CachedPage:
+    def __init__(self, url, text, fetched_at, etag=None, last_modified=None):
+        """
+        A page as it was last fetched from its source.
+        :param str url: the URL that the page was fetched from
+        :param str text: the HTML of the page
+        :param float fetched_at: when the page was fetched, or last confirmed to be unchanged
+        :param str etag: the ETag header that the page was sent with, if any
+        :param str last_modified: the Last-Modified header that the page was sent with, if any
+        """
+        self.url = url
+        self.text = text
+        self.fetched_at = fetched_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def validators(self):
+        """
+        :return dict: the headers that ask the source to send the page only if it has changed
+        """
+        headers = dict()
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCacheMetrics:
+    def __init__(self):
+        """
+        Counts how a PageCache has been used.
+        """
+        self.hits = 0
+        self.revalidated = 0
+        self.fetched = 0
+        self.replayed = 0
+
+    def __str__(self):
+        return (
+            f"{self.hits} hits, {self.revalidated} revalidated, {self.fetched} fetched, "
+            f"{self.replayed} replayed"
+        )
+
+
+class PageCache:
+    def __init__(
+            self,
+            directory=DEFAULT_DIRECTORY,
+            ttls=None,
+            default_ttl=DEFAULT_TTL,
+            offline=False,
+            clock=time.time,
+    ):
+        """
+        A cache of scraped pages on disk, shared by every source that is scraped.
+
+        Each page is kept gzipped in its own file under a directory per source. A page is used
+        without asking its source until its source's TTL passes, after which it is requested again
+        with its ETag and Last-Modified, so that a source can answer that it has not changed
+        instead of sending it again. Offline, captured pages are replayed however old they are,
+        and no requests are made.
+        :param Path directory: where pages are kept
+        :param dict ttls: map of source to the seconds that its pages are used for
+        :param int default_ttl: the seconds that pages of any other source are used for
+        :param bool offline: whether to serve only pages that have already been captured
+        :param clock: returns the current time, in seconds
+        """
+        self.directory = Path(directory)
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.offline = offline
+        self.clock = clock
+        self.metrics = PageCacheMetrics()
+        self._session = None
+
+    @property
+    def session(self):
+        # a session shared by the sources that do not need their own, which keeps connections
+        # alive between pages
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
+
+    def ttl(self, source):
+        """
+        :param str source: the site that pages are scraped from, e.g. fantasypros
+        :return int: the number of seconds that the source's pages are used for
+        """
+        return self.ttls.get(source, self.default_ttl)
+
+    def get(self, source, url, session=None, method="GET", data=None, variant=None, render=None):
+        """
+        Returns the HTML of the page, from the cache if it can be.
+        :param str source: the site that the page is scraped from, e.g. fantasypros
+        :param str url: the URL of the page
+        :param requests.Session session: the session to request the page with, e.g. one holding
+        cookies that choose what the page shows; by default the cache's own
+        :param str method: the HTTP method, e.g. POST for a form
+        :param dict data: the form data to POST
+        :param variant: anything else that the page depends on, e.g. the slate chosen in a cookie
+        :param render: turns a response into the HTML to keep, e.g. after running its scripts; by
+        default the response's text
+        :return str: the HTML of the page
+        """
+        key = page_key(method, url, data, variant)
+        page = self.load(source, key)
+        if self.offline:
+            if page is None:
+                raise PageNotCapturedException(
+                    f"{method} {url} has not been captured from {source}"
+                )
+            self.metrics.replayed += 1
+            return page.text
+
+        now = self.clock()
+        if page is not None and now < page.fetched_at + self.ttl(source):
+            LOGGER.debug(f"using cached page {url}")
+            self.metrics.hits += 1
+            return page.text
+
+        response = (session or self.session).request(
+            method, url, data=data, headers=page.validators() if page is not None else None
+        )
+        if page is not None and response.status_code == 304:
+            LOGGER.debug(f"cached page {url} has not changed")
+            self.metrics.revalidated += 1
+            page.fetched_at = now
+            self.store(source, key, page)
+            return page.text
+
+        self.metrics.fetched += 1
+        text = response.text if render is None else render(response)
+        if response.ok:
+            self.store(
+                source,
+                key,
+                CachedPage(
+                    url,
+                    text,
+                    now,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                ),
+            )
+        else:
+            LOGGER.warning(f"not caching {url}, which returned {response.status_code}")
+        return text
+
+    def capture(self, source, url, text, method="GET", data=None, variant=None):
+        """
+        Keeps the given HTML as the page for the request, e.g. to replay a recorded page in tests.
+        :param str text: the HTML of the page
+        """
+        self.store(
+            source, page_key(method, url, data, variant), CachedPage(url, text, self.clock())
+        )
+
+    def _path(self, source, key):
+        return self.directory / source / f"{key}.json.gz"
+
+    def load(self, source, key):
+        """
+        :return CachedPage: the page kept for the key, or None if there is none
+        """
+        path = self._path(source, key)
+        if not path.exists():
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return CachedPage(**json.load(f))
+
+    def store(self, source, key, page):
+        """
+        Keeps the page for the key, replacing any page already kept.
+        :param CachedPage page: the page to keep
+        """
+        path = self._path(source, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # written aside and then moved into place, so a page is never read half written, and to a
+        # file of its own, so writers of the same page never write into each other's file
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=path.name, suffix=".partial", delete=False
+        ) as partial:
+            try:
+                with gzip.open(partial, "wt", encoding="utf-8") as f:
+                    json.dump(page.__dict__, f)
+            except BaseException:
+                partial.close()
+                os.remove(partial.name)
+                raise
+        Path(partial.name).replace(path)
+
+
+_shared_page_cache = None
+
+
+def shared_page_cache():
+    """
+    Returns the page cache on disk that every scraper shares by default, which is offline if the
+    PAGE_CACHE_MODE environment variable is "offline".
+    :return PageCache: the shared cache
+    """
+    # pylint: disable=global-statement
+    global _shared_page_cache
+    if _shared_page_cache is None:
+        _shared_page_cache = PageCache(offline=os.getenv(MODE_VARIABLE) == OFFLINE)
+    return _shared_page_cache
+
+
+def shared_page_cache_metrics():
+    """
+    :return PageCacheMetrics: how the shared cache has been used, or None if it has not been
+    """
+    return None if _shared_page_cache is None else _shared_page_cache.metrics
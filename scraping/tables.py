@@ -0,0 +1,199 @@
+import re
+from collections import defaultdict, namedtuple
+from io import BytesIO
+from typing import Iterator
+
+from lxml import etree
+
+# an element type, if any, followed by any number of classes and ids, e.g. td.proj-ppg
+_COMPOUND = re.compile(r"(?P<tag>[\w-]+|\*)?(?P<rest>(?:[.#][\w-]+)*)")
+_CLASS_OR_ID = re.compile(r"([.#])([\w-]+)")
+
+
+class _Compound:
+    def __init__(self, text):
+        """
+        One part of a selector, which an element matches on its own, e.g. tbody.stat-table__body
+        :param str text: the part of the selector
+        """
+        match = _COMPOUND.fullmatch(text)
+        if match is None or text == "":
+            raise ValueError(f"Unsupported selector {text}")
+        self.tag = None if match.group("tag") in {None, "*"} else match.group("tag")
+        found = _CLASS_OR_ID.findall(match.group("rest"))
+        self.classes = frozenset(name for kind, name in found if kind == ".")
+        ids = {name for kind, name in found if kind == "#"}
+        if len(ids) > 1:
+            raise ValueError(f"Unsupported selector {text}")
+        self.id = next(iter(ids), None)
+
+    def matches(self, element):
+        if self.tag is not None and element.tag != self.tag:
+            return False
+        if self.id is not None and element.get("id") != self.id:
+            return False
+        return not self.classes or self.classes.issubset(element.get("class", "").split())
+
+
+class Selector:
+    def __init__(self, text):
+        """
+        A CSS selector of the kind needed to pick out a table: element types, classes and ids, where
+        each part is inside the part before it, e.g. "table.sortable tr.projection-player".
+        :param str text: the selector
+        """
+        self.text = text
+        self.parts = [_Compound(part) for part in text.split()]
+        if len(self.parts) == 0:
+            raise ValueError("Empty selector")
+
+    @property
+    def tag(self):
+        """
+        :return str: the element type that the selector matches, or None if it matches any
+        """
+        return self.parts[-1].tag
+
+    def matches(self, element, within=None):
+        """
+        :param element: an lxml element
+        :param within: if given, the element that the selector's other parts must be inside
+        :return bool: whether the selector matches the element
+        """
+        if not self.parts[-1].matches(element):
+            return False
+        if len(self.parts) == 1:
+            return True
+        # every combinator is a descendant, so matching each part to the nearest ancestor that it
+        # matches never misses a match
+        remaining = len(self.parts) - 2
+        for ancestor in element.iterancestors():
+            if remaining < 0 or ancestor is within:
+                break
+            if self.parts[remaining].matches(ancestor):
+                remaining -= 1
+        return remaining < 0
+
+
+class Column:
+    def __init__(self, name, cell, convert=str, required=False):
+        """
+        A value taken from every row of a table. The value is None in rows without the cell.
+        :param str name: the name of the value in the rows' tuples
+        :param cell: the position of the value's td in the row, counting from 0, or a selector of
+        the first element in the row holding the value, e.g. "a.player-name"
+        :param convert: turns the text of the cell, without surrounding whitespace, into the value
+        :param bool required: whether to skip rows without the cell, or whose value converts to
+        None, before converting the row's other cells
+        """
+        self.name = name
+        self.cell = cell
+        self.convert = convert
+        self.required = required
+
+
+def _text(element):
+    return "".join(element.itertext()).strip()
+
+
+class Table:
+    def __init__(self, rows, columns, until=None, skip=0):
+        """
+        Takes typed rows out of an HTML table as the page is parsed, without building the whole
+        page first. Each row is parsed once, finding every column's cell in a single pass, and is
+        then thrown away.
+        :param str rows: a selector of the table's rows, e.g. "tbody.stat-table__body tr"
+        :param list columns: the Columns to take from each row
+        :param str until: a selector of the element that ends the table, e.g. the first tbody, after
+        which the rest of the page is not parsed; by default the whole page is parsed
+        :param int skip: the number of matching rows to skip at the start, e.g. header rows
+        """
+        self.row_selector = Selector(rows)
+        self.columns = columns
+        self.until = None if until is None else Selector(until)
+        self.skip = skip
+        self.Row = namedtuple("Row", [column.name for column in columns])
+
+        self._by_position = [(i, c.cell) for i, c in enumerate(columns) if isinstance(c.cell, int)]
+        # the columns found by selector, by the element type and one of the classes that they
+        # select, either of which is None if any will do, so that each element in a row is only
+        # matched against the selectors that could match it
+        self._by_key = defaultdict(list)
+        for i, column in enumerate(columns):
+            if not isinstance(column.cell, int):
+                selector = Selector(column.cell)
+                cls = min(selector.parts[-1].classes, default=None)
+                self._by_key[(selector.tag, cls)].append((i, selector))
+        self._required = [i for i, column in enumerate(columns) if column.required]
+        self._optional = [i for i, column in enumerate(columns) if not column.required]
+
+        tags = [self.row_selector.tag] + ([] if self.until is None else [self.until.tag])
+        # only the ends of rows, and of the element ending the table, are reported by the parser
+        self._tags = None if None in tags else sorted(set(tags))
+
+    def rows(self, html) -> Iterator[tuple]:
+        """
+        Parses the rows of the table, lazily.
+        :param str html: the page holding the table
+        :return Iterator: a tuple of the columns' values for each row
+        """
+        events = etree.iterparse(
+            BytesIO(html.encode("utf-8")),
+            events=("end",),
+            tag=self._tags,
+            html=True,
+            encoding="utf-8",
+            remove_comments=True,
+        )
+        skipped = 0
+        for _, element in events:
+            if self.row_selector.matches(element):
+                if skipped < self.skip:
+                    skipped += 1
+                else:
+                    row = self.row(element)
+                    if row is not None:
+                        yield row
+                # the row has been read, so free it and the rows before it
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+            elif self.until is not None and self.until.matches(element):
+                return
+
+    def row(self, element):
+        """
+        :param element: the lxml element of a row
+        :return tuple: the columns' values in the row, or None if it is missing a required value
+        """
+        cells = [None] * len(self.columns)
+        if self._by_position:
+            tds = element.findall("td")
+            for i, position in self._by_position:
+                if position < len(tds):
+                    cells[i] = tds[position]
+        if self._by_key:
+            by_key = self._by_key
+            for descendant in element.iterdescendants(etree.Element):
+                tag = descendant.tag
+                keys = [(tag, None), (None, None)]
+                classes = descendant.get("class")
+                if classes is not None:
+                    for cls in classes.split():
+                        keys.append((tag, cls))
+                        keys.append((None, cls))
+                for key in keys:
+                    for i, selector in by_key.get(key, ()):
+                        if cells[i] is None and selector.matches(descendant, within=element):
+                            cells[i] = descendant
+
+        values = [None] * len(self.columns)
+        for i in self._required:
+            if cells[i] is not None:
+                values[i] = self.columns[i].convert(_text(cells[i]))
+            if values[i] is None:
+                return None
+        for i in self._optional:
+            if cells[i] is not None:
+                values[i] = self.columns[i].convert(_text(cells[i]))
+        return self.Row._make(values)
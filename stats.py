@@ -1,7 +1,88 @@
+from collections.abc import MutableMapping
+
+import numpy as np
+
 from espn.baseball.baseball_stat import BaseballStat
+from espn.stat_registry import stat_registry
+
+_BASEBALL = stat_registry(BaseballStat)
+# the positions of the stats that ratio stats are read from, looked up once, as hashing an enum
+# member to look one up costs more than reading the value
+_AVG, _OBP, _ERA, _WHIP, _H, _AB, _ER, _OUTS, _P_H, _P_BB = (
+    _BASEBALL.index[stat]
+    for stat in (
+        BaseballStat.AVG,
+        BaseballStat.OBP,
+        BaseballStat.ERA,
+        BaseballStat.WHIP,
+        BaseballStat.H,
+        BaseballStat.AB,
+        BaseballStat.ER,
+        BaseballStat.OUTS,
+        BaseballStat.P_H,
+        BaseballStat.P_BB,
+    )
+)
+
+
+def _value(values, present, i, default=None):
+    return values.item(i) if present >> i & 1 else default
+
+
+class StatDict(MutableMapping):
+    __slots__ = ("stats",)
+
+    def __init__(self, stats):
+        """
+        A view of the values in a Stats as a dictionary from stat to float, reading and writing
+        through to its array.
+        :param Stats stats: the Stats to view
+        """
+        self.stats = stats
+
+    def __getitem__(self, stat):
+        stats = self.stats
+        i = stats.registry.index[stat]
+        if not stats.present >> i & 1:
+            raise KeyError(stat)
+        return stats.values.item(i)
+
+    def __setitem__(self, stat, value):
+        stats = self.stats
+        i = stats.registry.index[stat]
+        if value is None:
+            stats.present &= ~(1 << i)
+            stats.values[i] = 0.0
+        else:
+            stats.present |= 1 << i
+            stats.values[i] = value
+
+    def __delitem__(self, stat):
+        if stat not in self:
+            raise KeyError(stat)
+        self[stat] = None
+
+    def __contains__(self, stat):
+        i = self.stats.registry.index.get(stat)
+        return i is not None and bool(self.stats.present >> i & 1)
+
+    def __iter__(self):
+        present = self.stats.present
+        return (s for i, s in enumerate(self.stats.registry.members) if present >> i & 1)
+
+    def __len__(self):
+        return bin(self.stats.present).count("1")
+
+    def get(self, key, default=None):
+        return self.stats.get(key, default)
+
+    def __repr__(self):
+        return repr(dict(self))
 
 
 class Stats:
+    __slots__ = ("values", "present", "stat_enum", "registry")
+
     stat_functions = {
         BaseballStat.AVG: lambda s: s.average(),
         BaseballStat.OBP: lambda s: s.obp(),
@@ -13,31 +94,102 @@ class Stats:
     def __init__(self, stat_dict, stat_enum):
         """
         Accepts a dictionary from Stat to float
-        :param stat_dict: mapping of a stat to its float value
+
+        The values are kept in a float array with a fixed position for each stat of the enum,
+        alongside a bitmask of which stats are present, so that adding and scaling Stats is a few
+        array operations rather than a loop over a dictionary.
+        :param stat_dict: mapping of a stat to its float value; stats mapped to None are missing
         :param stat_enum: the enum of Stats that can be in this Stat object
         """
-        self.stat_dict = stat_dict
+        registry = stat_registry(stat_enum)
+        index = registry.index
+        values = [0.0] * registry.size
+        present = 0
+        for stat, value in stat_dict.items():
+            if value is not None:
+                i = index[stat]
+                values[i] = value
+                present |= 1 << i
+        self.values = np.array(values)
+        self.present = present
         self.stat_enum = stat_enum
+        self.registry = registry
+
+    @classmethod
+    def _from_array(cls, values, present, stat_enum, registry):
+        stats = cls.__new__(cls)
+        stats.values = values
+        stats.present = present
+        stats.stat_enum = stat_enum
+        stats.registry = registry
+        return stats
+
+    @property
+    def stat_dict(self):
+        """
+        :return StatDict: a dictionary-like view of these stats, through which they can be changed
+        """
+        return StatDict(self)
+
+    def get(self, stat, default=None):
+        i = self.registry.index.get(stat)
+        if i is None or not self.present >> i & 1:
+            return default
+        return self.values.item(i)
+
+    def __getstate__(self):
+        return {"stat_dict": dict(self.stat_dict), "stat_enum": self.stat_enum}
+
+    def __setstate__(self, state):
+        # also how Stats pickled before they were array-backed are loaded, as their state was
+        # their __dict__
+        self.__init__(state["stat_dict"], state["stat_enum"])
 
     def __add__(self, other):
-        combined = dict()
-        sum_stats = self.stat_enum.sum_stats()
-        for k in sum_stats:
-            combined[k] = self.stat_dict.get(k, 0.0) + other.stat_dict.get(k, 0.0)
-        return Stats(combined, self.stat_enum)
+        registry = self.registry
+        return Stats._from_array(
+            (self.values + other.values) * registry.sum_mask,
+            registry.sum_bits,
+            self.stat_enum,
+            registry,
+        )
+
+    def copy(self):
+        """
+        :return Stats: new Stats with the same values, which can be changed without changing these
+        """
+        return Stats._from_array(self.values.copy(), self.present, self.stat_enum, self.registry)
+
+    def iadd(self, other):
+        """
+        Adds the other Stats to these, in place, with the same result as `self + other` but
+        without allocating a new Stats.
+        :param Stats other: the stats to add
+        :return Stats: these stats
+        """
+        values = self.values
+        np.add(values, other.values, out=values)
+        np.multiply(values, self.registry.sum_mask, out=values)
+        self.present = self.registry.sum_bits
+        return self
 
     def __mul__(self, other):
-        scaled = dict()
-        for k in self.stat_enum.sum_stats().intersection(self.stat_dict.keys()):
-            scaled[k] = self.stat_dict[k] * other
-        return Stats(scaled, self.stat_enum)
+        registry = self.registry
+        scaled = self.values * other
+        scaled *= registry.sum_mask
+        return Stats._from_array(
+            scaled,
+            self.present & registry.sum_bits,
+            self.stat_enum,
+            registry,
+        )
 
     def __truediv__(self, other):
         return self * (1 / other)
 
     def __str__(self):
         print_pairs = list()
-        for stat in self.stat_enum.sum_stats():
+        for stat in self.registry.sum_stats:
             val = self.value_for_stat(stat)
             if val:
                 print_pairs.append((stat, val))
@@ -51,81 +203,96 @@ class Stats:
                 s += "{}\t{}\n".format(name, stat)
         return s
 
+    def _baseball_values(self):
+        """
+        :return tuple: the array of values and the bitmask of which are present, which must be of
+        BaseballStats
+        """
+        # the enum rather than the registry is compared, as a registry unpickled in another
+        # process is a copy
+        if self.stat_enum is not BaseballStat:
+            raise KeyError(f"{self.stat_enum} are not BaseballStats")
+        return self.values, self.present
+
     def average(self):
-        return round(
-            self.stat_dict.get(
-                BaseballStat.AVG,
-                self.stat_dict.get(BaseballStat.H)
-                / self.stat_dict.get(BaseballStat.AB),
-            ),
-            3,
-        )
+        values, present = self._baseball_values()
+        if present >> _AVG & 1:
+            exact_average = values.item(_AVG)
+        else:
+            exact_average = _value(values, present, _H) / _value(values, present, _AB)
+        return round(exact_average, 3)
 
     # note - adjust calculation to include not just walks + hits but also HBP, etc.
     def obp(self):
-        exact_obp = self.stat_dict.get(BaseballStat.OBP)
-        if exact_obp is None:
-            reached_base = (
-                self.stat_dict[BaseballStat.H] + self.stat_dict[BaseballStat.BB]
-            )
-            exact_obp = reached_base / self.stat_dict[BaseballStat.PA]
+        values, present = self._baseball_values()
+        if present >> _OBP & 1:
+            exact_obp = values.item(_OBP)
+        else:
+            stat_dict = self.stat_dict
+            reached_base = stat_dict[BaseballStat.H] + stat_dict[BaseballStat.BB]
+            exact_obp = reached_base / stat_dict[BaseballStat.PA]
         return round(exact_obp, 3)
 
     def runs(self):
-        return self.stat_dict.get(BaseballStat.R, 0)
+        return self.get(BaseballStat.R, 0)
 
     def home_runs(self):
-        return self.stat_dict.get(BaseballStat.HR, 0)
+        return self.get(BaseballStat.HR, 0)
 
     def steals(self):
-        return self.stat_dict.get(BaseballStat.SB, 0)
+        return self.get(BaseballStat.SB, 0)
 
     def strikeouts(self):
-        return self.stat_dict.get(BaseballStat.K, 0)
+        return self.get(BaseballStat.K, 0)
 
     def wins(self):
-        return self.stat_dict.get(BaseballStat.W, 0)
+        return self.get(BaseballStat.W, 0)
 
     def saves(self):
-        return self.stat_dict.get(BaseballStat.SV, 0)
+        return self.get(BaseballStat.SV, 0)
 
     def era(self):
-        total = self.stat_dict.get(BaseballStat.ERA)
+        values, present = self._baseball_values()
+        total = _value(values, present, _ERA)
         if total:
             return round(total, 3)
 
-        earned_runs = self.stat_dict.get(BaseballStat.ER, 0)
-        outs = self.stat_dict.get(BaseballStat.OUTS, 1.0)
+        earned_runs = _value(values, present, _ER, 0)
+        outs = _value(values, present, _OUTS, 1.0)
 
         return round(earned_runs * 27.0 / outs, 3)
 
     def whip(self):
-        total = self.stat_dict.get(BaseballStat.WHIP)
+        values, present = self._baseball_values()
+        total = _value(values, present, _WHIP)
         if total:
             return round(total, 3)
 
-        hits = self.stat_dict.get(BaseballStat.P_H, 0)
-        walks = self.stat_dict.get(BaseballStat.P_BB, 0)
-        outs = self.stat_dict.get(BaseballStat.OUTS, 1.0)
+        hits = _value(values, present, _P_H, 0)
+        walks = _value(values, present, _P_BB, 0)
+        outs = _value(values, present, _OUTS, 1.0)
 
         return round((walks + hits) / outs * 3.0, 3)
 
     def plate_appearances(self):
-        return self.stat_dict.get(
-            BaseballStat.PA,
-            self.unrounded_value_for_stat(BaseballStat.AB)
-            + self.unrounded_value_for_stat(BaseballStat.BB),
-        )
+        plate_appearances = self.get(BaseballStat.PA)
+        if plate_appearances is None:
+            plate_appearances = self.unrounded_value_for_stat(
+                BaseballStat.AB
+            ) + self.unrounded_value_for_stat(BaseballStat.BB)
+        return plate_appearances
 
     def unrounded_value_for_stat(self, stat):
-        if stat in self.stat_enum.sum_stats():
-            return self.stat_dict.get(stat)
+        if stat in self.registry.sum_stats:
+            return self.get(stat)
         elif stat in Stats.stat_functions:
             return Stats.stat_functions.get(stat)(self)
 
     def value_for_stat(self, stat):
         val = self.unrounded_value_for_stat(stat)
-        return round(val, stat.num_rounding_digits()) if val is not None else val
+        if val is None:
+            return val
+        return round(val, self.registry.rounding_digits[stat])
 
     def points(self, points_map) -> float:
         """
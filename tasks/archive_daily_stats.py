@@ -2,54 +2,100 @@ import logging
 from pathlib import Path
 
 from config import password_reader, team_reader
+from espn.async_espn_api import AsyncEspnApi
 from espn.football.football_api import FootballApi
-from espn.stat_store import StatStore
+from espn.stat_store import DEFAULT_DB_PATH, StatStore
 from tasks.task import Task
 
 LOGGER = logging.getLogger("tasks.archive_daily_stats")
 
 
 class ArchiveDailyStats(Task):
-    def __init__(self, username, password, team_configs, scoring_period):
+    def __init__(
+            self,
+            username,
+            password,
+            team_configs,
+            scoring_period,
+            first_period=None,
+            db_path=DEFAULT_DB_PATH,
+    ):
         """
         Archives the stats accumulated by all users accessible via the given ESPN API access object
+
+        Only the scoring periods that the StatStore is missing are fetched, with one request per
+        period for every team in the league. By default the periods checked start after the
+        store's watermark, so a daily run fetches just the latest period, and catches up on its
+        own after any downtime.
         :param str username: the username of the user in the league where stats are being archived
         :param str password: the password of the user
         :param list team_configs: all the teams for which to archive stats
-        :param int scoring_period: the scoring period for which to archive stats
+        :param int scoring_period: the last scoring period for which to archive stats
+        :param int first_period: the first scoring period to archive, or None to continue from the
+        watermark (or archive only scoring_period, if there is none)
+        :param Path db_path: where the StatStore keeps stats
         """
         super().__init__(username)
         self.username = username
         self.password = password
         self.team_configs = team_configs
         self.scoring_period = scoring_period
+        self.first_period = first_period
+        self.db_path = db_path
 
     def run(self):
-        for cfg in self.team_configs:
-            espn = (
-                FootballApi.Builder()
-                .username(self.username)
-                .password(self.password)
-                .league_id(cfg.league_id)
-                .team_id(cfg.team_id)
-                .build()
-            )
-            LOGGER.info(
-                f"archiving for league {cfg.league_id} in period {self.scoring_period}"
-            )
-            self.archive(espn, cfg)
+        # each league is archived whole, so only one team config per league is needed
+        league_configs = list({cfg.league_id: cfg for cfg in self.team_configs}.values())
+        self.run_for_teams(league_configs, self.archive_team)
+
+    async def archive_team(self, cfg):
+        espn = (
+            FootballApi.Builder()
+            .username(self.username)
+            .password(self.password)
+            .league_id(cfg.league_id)
+            .team_id(cfg.team_id)
+            .build()
+        )
+        LOGGER.info(
+            f"archiving for league {cfg.league_id} through period {self.scoring_period}"
+        )
+        await self.archive(AsyncEspnApi(espn), cfg)
 
-    def archive(self, espn, config):
+    def periods_to_check(self, store):
         """
-        Archives the stats found with the given EspnApi object.
-        :param BaseballApi espn: access to ESPN's API
+        :param StatStore store: the store being archived to
+        :return tuple: the first and last scoring periods that should be archived
+        """
+        if self.first_period is not None:
+            return self.first_period, self.scoring_period
+        watermark = store.watermark()
+        if watermark is None:
+            return self.scoring_period, self.scoring_period
+        return watermark + 1, self.scoring_period
+
+    async def archive(self, espn, config):
+        """
+        Archives the stats found with the given EspnApi object, for every missing period.
+        :param AsyncEspnApi espn: access to ESPN's API
         :param TeamConfig config: the config currently being used to archive
         """
-        period_stats = espn.scoring_period_stats(self.scoring_period)
-        LOGGER.info(f"storing {len(period_stats)} teams' stats")
-        store = StatStore(config.league_id, espn.year)
-        for team, stats in period_stats.items():
-            store.store_stats(stats, team, self.scoring_period)
+        store = StatStore(config.league_id, espn.year, self.db_path)
+        try:
+            first_period, last_period = self.periods_to_check(store)
+            missing = store.missing_periods(first_period, last_period)
+            LOGGER.info(
+                f"{len(missing)} periods missing between {first_period} and {last_period}"
+                f" for league {config.league_id}"
+            )
+            for period in missing:
+                period_stats = await espn.scoring_period_stats(period)
+                LOGGER.info(f"storing {len(period_stats)} teams' stats for period {period}")
+                store.append({(team, period): stats for team, stats in period_stats.items()})
+            # each period was fetched whole, so holds every team in the league at the time
+            store.update_watermark(complete_periods=missing)
+        finally:
+            store.close()
 
     @staticmethod
     def create(username):
@@ -11,15 +11,17 @@ LOGGER = logging.getLogger("tasks.archive_year_stats")
 
 class ArchiveYearlyStats(Task):
     def __init__(self, username, password, configs, cur_period):
+        """
+        Backfills every scoring period of the season that has not been archived yet, up to (but
+        not including) the given one.
+        """
         super().__init__(username)
-        self.all_days = [
-            ArchiveDailyStats(username, password, configs, pd)
-            for pd in range(0, cur_period)
-        ]
+        self.backfill = ArchiveDailyStats(
+            username, password, configs, cur_period - 1, first_period=0
+        )
 
     def run(self):
-        for day in self.all_days:
-            day.execute()
+        self.backfill.run()
 
     @staticmethod
     def create(username):
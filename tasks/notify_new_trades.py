@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 from pathlib import Path
 
 from config import team_reader, password_reader, notifier_config
@@ -11,22 +12,30 @@ LOGGER = logging.getLogger("tasks.notify_new_trades")
 
 
 class NotifyNewTrades(Task):
-    def __init__(self, username, password, configs, notifier):
+    def __init__(self, username, password, configs, new_notifier):
+        """
+        Notifies of new trades in the league of every team. The leagues are checked at once, so
+        each gets its own notifier from the given function.
+        :param str username: the username of the ESPN user whose leagues are checked
+        :param str password: the password of the user
+        :param list configs: the TeamConfigs of the teams whose leagues are checked
+        :param new_notifier: function that takes no arguments and creates a Notifier
+        """
         super().__init__(username)
         self.password = password
         self.configs = configs
-        self.notifier = notifier
+        self.new_notifier = new_notifier
 
     @staticmethod
     def create(username):
         password = password_reader.password(username, Path.cwd() / "config/passwords")
         configs = team_reader.all_teams(Path.cwd() / "config/team_configs/baseball")
-        notifier = notifier_config.current_notifier(username)
-        return NotifyNewTrades(username, password, configs, notifier)
+        return NotifyNewTrades(
+            username, password, configs, partial(notifier_config.current_notifier, username)
+        )
 
     def run(self):
-        for config in self.configs:
-            self.check_for_trades(config)
+        self.run_for_teams(self.configs, self.check_for_trades)
 
     def check_for_trades(self, config):
         LOGGER.info(f"searching for new trades in league {config.league_id}")
@@ -44,20 +53,22 @@ class NotifyNewTrades(Task):
         cur_trades = trade_finder.all_current_trades(espn)
         stored_trades = trade_store.retrieve_trades()
         if cur_trades != stored_trades:
-            self.notify_new(team_name, stored_trades, cur_trades)
+            self.notify_new(self.new_notifier(), team_name, stored_trades, cur_trades)
             LOGGER.info(f"new trades found in league {config.league_id}")
             trade_store.store_trades(cur_trades)
         else:
             LOGGER.info(f"no new trades found in league {config.league_id}")
 
-    def notify_new(self, this_team_name, old_trades, new_trades):
+    @staticmethod
+    def notify_new(notifier, this_team_name, old_trades, new_trades):
         """
         Notifies the notifier of each trade that appears in the new trades, but not
         the old trades (if this team did not initiate the trade)
+        :param Notifier notifier: where the trades are sent
         :param str this_team_name: the name of the owner of this team
         :param set old_trades: the set of trades that used to be current
         :param set new_trades: the set of trades that is now current
         """
         for trade in new_trades - old_trades:
             if trade.from_team != this_team_name:
-                self.notifier.notify_new_trade(trade)
+                notifier.notify_new_trade(trade)
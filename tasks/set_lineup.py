@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 from pathlib import Path
 
 from config import team_reader, password_reader, notifier_config
@@ -16,37 +17,58 @@ USE_NF = True
 
 
 class SetLineup(Task):
-    def __init__(self, username, password, configs, notifier, fangraphs, numberfire):
+    def __init__(
+            self,
+            username,
+            password,
+            configs,
+            new_notifier,
+            new_fangraphs=FangraphsApi,
+            new_numberfire=NumberFireApi,
+    ):
+        """
+        Sets the lineup of every team. The teams are set at once, so each gets its own notifier and
+        projection scrapers, which keep state between requests, from the given functions.
+        :param str username: the username of the ESPN user whose teams are set
+        :param str password: the password of the user
+        :param list configs: the TeamConfigs of the teams to set
+        :param new_notifier: function that takes no arguments and creates a Notifier
+        :param new_fangraphs: function that takes no arguments and creates a FangraphsApi
+        :param new_numberfire: function that takes no arguments and creates a NumberFireApi
+        """
         super().__init__(username)
         self.password = password
         self.configs = configs
-        self.notifier = notifier
-        self.fangraphs = fangraphs
-        self.numberfire = numberfire
+        self.new_notifier = new_notifier
+        self.new_fangraphs = new_fangraphs
+        self.new_numberfire = new_numberfire
 
     def run(self):
-        for team_config in self.configs:
-            LOGGER.info(
-                f"setting lineup for team {team_config.team_id} in league {team_config.league_id}"
-            )
-
-            espn = (
-                BaseballApi.Builder()
-                .username(self.username)
-                .password(self.password)
-                .league_id(team_config.league_id)
-                .team_id(team_config.team_id)
-                .build()
-            )
-
-            if USE_NF:
-                optimize_lineup_nf(espn, self.numberfire, self.notifier)
-            else:
-                optimize_lineup(espn, self.fangraphs, self.notifier)
+        self.run_for_teams(self.configs, self.set_lineup)
+
+    def set_lineup(self, team_config):
+        LOGGER.info(
+            f"setting lineup for team {team_config.team_id} in league {team_config.league_id}"
+        )
+
+        espn = (
+            BaseballApi.Builder()
+            .username(self.username)
+            .password(self.password)
+            .league_id(team_config.league_id)
+            .team_id(team_config.team_id)
+            .build()
+        )
+
+        if USE_NF:
+            optimize_lineup_nf(espn, self.new_numberfire(), self.new_notifier())
+        else:
+            optimize_lineup(espn, self.new_fangraphs(), self.new_notifier())
 
     @staticmethod
     def create(username):
         password = password_reader.password(username, Path.cwd() / "config/passwords")
         configs = team_reader.all_teams(Path.cwd() / "config/team_configs/baseball")
-        notifier = notifier_config.current_notifier(username)
-        return SetLineup(username, password, configs, notifier, FangraphsApi(), NumberFireApi())
+        return SetLineup(
+            username, password, configs, partial(notifier_config.current_notifier, username)
+        )
@@ -1,6 +1,29 @@
+import asyncio
 import logging.config
+from concurrent.futures import ThreadPoolExecutor
 
 from config import logging_config, notifier_config
+from espn.response_cache import shared_cache_metrics
+from scraping.page_cache import shared_page_cache_metrics
+
+# the most teams that a Task works on at once
+MAX_CONCURRENT_TEAMS = 4
+
+
+async def run_concurrently(calls, max_concurrency):
+    """
+    Awaits every call, no more than max_concurrency at a time.
+    :param list calls: functions that take no arguments and return an awaitable
+    :param int max_concurrency: the most calls awaited at once
+    :return list: the result of each call, or the exception it raised
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def limited(call):
+        async with semaphore:
+            return await call()
+
+    return await asyncio.gather(*(limited(c) for c in calls), return_exceptions=True)
 
 
 class Task:
@@ -28,6 +51,42 @@ class Task:
             "Parent Task class does not implement any specific behavior"
         )
 
+    def run_for_teams(self, team_configs, run_team, max_concurrency=MAX_CONCURRENT_TEAMS):
+        """
+        Runs the given function for every team at once, rather than one after another, with at
+        most max_concurrency teams in progress. If the function is a coroutine function it runs on
+        the event loop, otherwise each call runs on its own thread.
+
+        Every team is run even if some fail; the first failure is then raised.
+        :param list team_configs: the TeamConfigs of the teams to run for
+        :param run_team: function that takes a TeamConfig and does this Task's work for it
+        :param int max_concurrency: the most teams worked on at once
+        """
+        logger = logging.getLogger()
+
+        async def run_all():
+            loop = asyncio.get_running_loop()
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                if asyncio.iscoroutinefunction(run_team):
+                    calls = [lambda c=c: run_team(c) for c in team_configs]
+                else:
+                    calls = [
+                        lambda c=c: loop.run_in_executor(executor, run_team, c)
+                        for c in team_configs
+                    ]
+                return await run_concurrently(calls, max_concurrency)
+
+        results = asyncio.run(run_all())
+        errors = [r for r in results if isinstance(r, BaseException)]
+        for config, result in zip(team_configs, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    f"failed for team {config.team_id} in league {config.league_id}",
+                    exc_info=result,
+                )
+        if errors:
+            raise errors[0]
+
     def execute(self):
         """
         Executes this Task in a controlled manner. Calls the method run(), logging and notifying
@@ -48,3 +107,10 @@ class Task:
             logger.exception(e)
             notifier.error_occurred()
             raise e
+        finally:
+            metrics = shared_cache_metrics()
+            if metrics is not None:
+                logger.info(f"ESPN response cache: {metrics}")
+            page_metrics = shared_page_cache_metrics()
+            if page_metrics is not None:
+                logger.info(f"Scraped page cache: {page_metrics}")
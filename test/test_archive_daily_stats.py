@@ -0,0 +1,78 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from config.team_config import EspnTeamConfig
+from espn.async_espn_api import AsyncEspnApi
+from espn.baseball.baseball_stat import BaseballStat
+from espn.stat_store import StatStore
+from stats import Stats
+from tasks.archive_daily_stats import ArchiveDailyStats
+
+
+class FakeEspn:
+    year = 2022
+
+    def __init__(self, first_period_by_team=None):
+        """
+        :param dict first_period_by_team: the scoring period each team joined the league in
+        """
+        self.requested = []
+        self.first_period_by_team = first_period_by_team or {1: 0, 2: 0, 3: 0}
+
+    def scoring_period_stats(self, scoring_period):
+        self.requested.append(scoring_period)
+        return {
+            team: Stats({BaseballStat.H: float(team + scoring_period)}, BaseballStat)
+            for team, first_period in self.first_period_by_team.items()
+            if first_period <= scoring_period
+        }
+
+
+class ArchiveDailyStatsTest(unittest.TestCase):
+    config = EspnTeamConfig("user", 123, 1)
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.dir.name) / "stats.db"
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def archive(self, scoring_period, first_period=None, first_period_by_team=None):
+        espn = FakeEspn(first_period_by_team)
+        task = ArchiveDailyStats(
+            "user", "", [self.config], scoring_period, first_period, self.db_path
+        )
+        asyncio.run(task.archive(AsyncEspnApi(espn), self.config))
+        return espn.requested
+
+    def test_daily_run_fetches_one_period(self):
+        self.assertEqual(self.archive(5), [5])
+        self.assertEqual(self.archive(6), [6])
+        self.assertEqual(self.archive(6), [])
+
+    def test_catches_up_after_downtime(self):
+        self.archive(5)
+        self.assertEqual(self.archive(9), [6, 7, 8, 9])
+
+    def test_team_joining_late_does_not_stop_watermark(self):
+        first_period_by_team = {1: 0, 2: 0, 3: 7}
+        self.assertEqual(self.archive(5, 4, first_period_by_team), [4, 5])
+        self.assertEqual(self.archive(8, None, first_period_by_team), [6, 7, 8])
+        self.assertEqual(self.archive(9, None, first_period_by_team), [9])
+
+    def test_backfill_fills_gaps(self):
+        store = StatStore(123, 2022, self.db_path)
+        store.append(
+            {(team, 2): Stats({}, BaseballStat) for team in [1, 2, 3]}
+        )
+        store.store_stats(Stats({}, BaseballStat), 1, 3)
+        store.close()
+
+        self.assertEqual(self.archive(4, first_period=0), [0, 1, 3, 4])
+        store = StatStore(123, 2022, self.db_path)
+        self.assertEqual(store.watermark(), 4)
+        self.assertEqual(store.retrieve_stats(2)[3].stat_dict, {BaseballStat.H: 5.0})
+        store.close()
@@ -0,0 +1,105 @@
+import json
+import unittest
+
+from espn.baseball.baseball_api import BaseballApi
+from espn.response_cache import MemoryResponseCache
+from test.test_http_session import StubSessionProvider
+
+SCORING_PERIOD = 20
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+def player_entry(player_id, pro_team_id, starter_status):
+    return {
+        "player": {
+            "id": player_id,
+            "fullName": f"Pitcher {player_id}",
+            "firstName": "Pitcher",
+            "lastName": str(player_id),
+            "defaultPositionId": 1,
+            "eligibleSlots": [13, 16],
+            "proTeamId": pro_team_id,
+            "starterStatusByProGame": starter_status,
+        }
+    }
+
+
+def team_entry(team_id, games_today):
+    games = [{"homeProTeamId": team_id, "awayProTeamId": 0, "id": g} for g in games_today]
+    return {
+        "id": team_id,
+        "proGamesByScoringPeriod": {
+            str(SCORING_PERIOD): games,
+            str(SCORING_PERIOD + 1): [{"homeProTeamId": team_id, "awayProTeamId": 0, "id": 999}],
+        },
+    }
+
+
+# pylint: disable=protected-access
+class BaseballApiTest(unittest.TestCase):
+    def setUp(self):
+        self.api = (
+            BaseballApi.Builder()
+            .username(StubSessionProvider.username)
+            .league_id(1)
+            .team_id(1)
+            .response_cache(MemoryResponseCache())
+            .build()
+        )
+        self.api.session_provider = StubSessionProvider()
+        self.requests = []
+        self.players = [
+            # probable in today's game
+            player_entry(1, 10, {"100": "PROBABLE"}),
+            # probable in the second game of a double-header
+            player_entry(2, 11, {"101": "NOT_PROBABLE", "102": "PROBABLE"}),
+            # probable, but only in tomorrow's game
+            player_entry(3, 10, {"999": "PROBABLE"}),
+            # no game today
+            player_entry(4, 12, {}),
+        ]
+        self.schedule = {
+            "settings": {
+                "proTeams": [team_entry(10, [100]), team_entry(11, [101, 102]), team_entry(12, [])]
+            }
+        }
+        self.api._espn_get = self.espn_get
+
+    def espn_get(self, url, headers=None, check_cache=True):
+        self.requests.append((url, headers, check_cache))
+        if url == self.api._player_url():
+            ids = json.loads(headers["X-Fantasy-Filter"])["players"]["filterIds"]["value"]
+            return FakeResponse(
+                {"players": [p for p in self.players if p["player"]["id"] in ids]}
+            )
+        if url == self.api._pro_schedule_url():
+            return FakeResponse(self.schedule)
+        return FakeResponse({"scoringPeriodId": SCORING_PERIOD})
+
+    def test_probable_pitchers(self):
+        self.assertEqual({1, 2}, self.api.probable_pitchers([1, 2, 3, 4]))
+
+    def test_probable_pitchers_in_one_request(self):
+        self.api.probable_pitchers([1, 2, 3, 4])
+        # one request for the players, one for the schedule and one for the scoring period
+        self.assertEqual(3, len(self.requests))
+        player_requests = [r for r in self.requests if r[0] == self.api._player_url()]
+        self.assertEqual(1, len(player_requests))
+        player_filter = json.loads(player_requests[0][1]["X-Fantasy-Filter"])["players"]
+        self.assertEqual([1, 2, 3, 4], player_filter["filterIds"]["value"])
+        self.assertEqual(4, player_filter["limit"])
+
+    def test_probable_pitchers_none_requested(self):
+        self.assertEqual(set(), self.api.probable_pitchers([]))
+        self.assertEqual([], self.requests)
+
+    def test_is_probable_pitcher(self):
+        self.assertTrue(self.api.is_probable_pitcher(2))
+        self.assertFalse(self.api.is_probable_pitcher(3))
@@ -0,0 +1,121 @@
+import random
+import unittest
+
+from espn.football.football_position import FootballPosition
+from espn.football.football_slot import FootballSlot
+from footballdiehards.dfs_projection import DFSProjection
+from optimize.dfs_lineup import (
+    PlayerPool,
+    all_lineups,
+    best_lineup,
+    best_lineups,
+    pick_order,
+    player_pool,
+)
+
+slots = {
+    FootballSlot.QUARTER_BACK: 1,
+    FootballSlot.RUNNING_BACK: 2,
+    FootballSlot.WIDE_RECEIVER: 2,
+    FootballSlot.TIGHT_END: 1,
+    FootballSlot.FLEX: 1,
+    FootballSlot.DEFENSE: 1,
+}
+pool_sizes = {
+    FootballPosition.QUARTER_BACK: 2,
+    FootballPosition.RUNNING_BACK: 4,
+    FootballPosition.WIDE_RECEIVER: 5,
+    FootballPosition.TIGHT_END: 3,
+    FootballPosition.DEFENSE: 2,
+}
+
+
+def random_pool(seed, salary_step=100):
+    rng = random.Random(seed)
+    player_dict = dict()
+    for pos, size in pool_sizes.items():
+        players = [
+            DFSProjection(
+                f"{pos} {i}", pos, rng.randrange(3000, 9000, salary_step), rng.uniform(2, 30)
+            )
+            for i in range(size)
+        ]
+        player_dict[pos] = sorted(players, key=lambda p: p.projection, reverse=True)
+    return PlayerPool(player_dict)
+
+
+def greedy_lineups(pool, salary, count, max_overlap, max_uses):
+    """
+    Picks lineups by going down every lineup under the cap, best first, taking each one that is
+    within the overlap and exposure limits of those already taken.
+    """
+    player_sets = {
+        frozenset(l.player_set) for l in all_lineups(pool, slots, set())
+        if l.total_salary() <= salary
+    }
+    taken = []
+    for player_set in sorted(player_sets, key=lambda s: sum(p.projection for p in s), reverse=True):
+        if len(taken) == count:
+            break
+        if all(len(player_set & t) <= max_overlap for t in taken) and all(
+                sum(p in t for t in taken) < max_uses for p in player_set
+        ):
+            taken.append(player_set)
+    return taken
+
+
+class DfsLineupTest(unittest.TestCase):
+    def test_pick_order_flex_last(self):
+        self.assertEqual(
+            [
+                FootballSlot.QUARTER_BACK,
+                FootballSlot.RUNNING_BACK,
+                FootballSlot.RUNNING_BACK,
+                FootballSlot.WIDE_RECEIVER,
+                FootballSlot.WIDE_RECEIVER,
+                FootballSlot.TIGHT_END,
+                FootballSlot.DEFENSE,
+                FootballSlot.FLEX,
+            ],
+            pick_order(slots),
+        )
+
+    def test_best_lineup_matches_every_lineup(self):
+        # salaries to the dollar, which the bound rounds down to coarser steps
+        for pool in [random_pool(seed) for seed in range(4)] + [random_pool(4, salary_step=1)]:
+            every_lineup = all_lineups(pool, slots, set())
+            for salary in [35000, 42000, 50000, 80000]:
+                lineups = [l for l in every_lineup if l.total_salary() <= salary]
+                best = best_lineup(pool, slots, salary)
+                if len(lineups) == 0:
+                    self.assertIsNone(best)
+                    continue
+                expected = max(lineups, key=lambda l: l.total_points())
+                self.assertEqual(expected.player_set, best.player_set)
+                self.assertLessEqual(best.total_salary(), salary)
+
+    def test_no_lineup_under_cap(self):
+        self.assertIsNone(best_lineup(random_pool(0), slots, 10000))
+
+    def test_not_enough_players(self):
+        pool = random_pool(0)
+        pool.player_dict[FootballPosition.QUARTER_BACK] = []
+        self.assertIsNone(best_lineup(pool, slots, 80000))
+
+    def test_best_lineups_match_greedy_pick_of_every_lineup(self):
+        for seed in range(1, 4):
+            projections = [
+                p for players in random_pool(seed).player_dict.values() for p in players
+            ]
+            pool = player_pool(projections)
+            for max_overlap, max_exposure in [(7, 1.0), (5, 1.0), (7, 0.5), (4, 0.6)]:
+                solution = best_lineups(projections, slots, 50000, 5, max_overlap, max_exposure)
+                expected = greedy_lineups(pool, 50000, 5, max_overlap, int(max_exposure * 5))
+                self.assertEqual(expected, [frozenset(l.player_set) for l in solution.lineups])
+                self.assertGreaterEqual(solution.seconds, 0.0)
+
+    def test_best_lineups_default_to_distinct(self):
+        projections = [p for players in random_pool(1).player_dict.values() for p in players]
+        lineups = best_lineups(projections, slots, 80000, 4).lineups
+        self.assertEqual(4, len(lineups))
+        self.assertEqual(4, len({frozenset(l.player_set) for l in lineups}))
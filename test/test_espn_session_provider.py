@@ -0,0 +1,59 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from espn.sessions.espn_session_provider import EspnSessionProvider
+
+
+class MemorySessionStore:
+    def __init__(self):
+        self.sessions = dict()
+        self.writes = 0
+
+    def store_session(self, key, session):
+        self.writes += 1
+        self.sessions[key] = session
+
+    def retrieve_session(self, key):
+        return self.sessions.get(key)
+
+
+class CountingLogins:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.logins = 0
+
+    def login(self):
+        with self.lock:
+            self.logins += 1
+            login = self.logins
+        time.sleep(0.02)
+        return f"espn-s2-{login}"
+
+
+# pylint: disable=protected-access
+class EspnSessionProviderTest(unittest.TestCase):
+    def provider(self, store, logins):
+        provider = EspnSessionProvider("concurrent-user", "password")
+        provider.session_store = store
+        provider._EspnSessionProvider__login = logins.login
+        return provider
+
+    def test_concurrent_providers_log_in_once(self):
+        store = MemorySessionStore()
+        logins = CountingLogins()
+        providers = [self.provider(store, logins) for _ in range(4)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            sessions = list(executor.map(lambda p: p.get_session(), providers))
+        # the first provider logs in, and the others wait for it and use its session
+        self.assertEqual(["espn-s2-1"] * 4, sessions)
+        self.assertEqual(1, logins.logins)
+        self.assertEqual(1, store.writes)
+
+    def test_refresh_replaces_stored_session(self):
+        store = MemorySessionStore()
+        provider = self.provider(store, CountingLogins())
+        self.assertEqual("espn-s2-1", provider.get_session())
+        self.assertEqual("espn-s2-2", provider.refresh_session())
+        self.assertEqual("espn-s2-2", provider.get_session())
@@ -0,0 +1,139 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from espn.baseball.baseball_api import BaseballApi
+from espn.espn_api import EspnApiException
+from espn.http_session import HttpSettings, PooledSession, session_for_user
+from espn.response_cache import MemoryResponseCache
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+            status = self.server.statuses.pop(0) if self.server.statuses else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubSessionProvider:
+    username = "stub-user"
+
+    def get_session(self):
+        return "espn-s2"
+
+    def refresh_session(self):
+        return "espn-s2"
+
+
+# pylint: disable=protected-access
+class HttpSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.lock = threading.Lock()
+        self.server.connections = 0
+        self.server.requests = 0
+        self.server.statuses = []
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/apis"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_unpooled_requests_connect_every_time(self):
+        for _ in range(5):
+            requests.get(self.url, timeout=5)
+        self.assertEqual(self.server.requests, 5)
+        self.assertEqual(self.server.connections, 5)
+
+    def test_pooled_session_reuses_connection(self):
+        session = PooledSession()
+        for _ in range(5):
+            self.assertTrue(session.get(self.url).ok)
+        session.close()
+        self.assertEqual(self.server.requests, 5)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_retries_with_backoff(self):
+        self.server.statuses = [503, 502]
+        session = PooledSession(HttpSettings(retries=2, backoff_factor=0))
+        response = session.get(self.url)
+        session.close()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.requests, 3)
+
+    def test_shared_per_user(self):
+        self.assertIs(session_for_user("a"), session_for_user("a"))
+        self.assertIsNot(session_for_user("a"), session_for_user("b"))
+
+    def test_apis_for_user_share_connections(self):
+        apis = [
+            BaseballApi.Builder()
+            .username(StubSessionProvider.username)
+            .league_id(league_id)
+            .response_cache(MemoryResponseCache())
+            .build()
+            for league_id in range(3)
+        ]
+        for api in apis:
+            api.session_provider = StubSessionProvider()
+            for _ in range(2):
+                api._espn_get(self.url, check_cache=False)
+        self.assertIs(apis[0].http, apis[2].http)
+        self.assertEqual(self.server.requests, 6)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_failed_requests_retried_once_per_policy(self):
+        self.server.statuses = [503] * 10
+        session_provider = StubSessionProvider()
+        session_provider.username = "retrying-user"
+        api = (
+            BaseballApi.Builder()
+            .username(session_provider.username)
+            .response_cache(MemoryResponseCache())
+            .http_settings(HttpSettings(retries=2, backoff_factor=0))
+            .build()
+        )
+        api.session_provider = session_provider
+        with self.assertRaises(EspnApiException):
+            api._espn_get(self.url, check_cache=False)
+        # only the session retries, rather than the api retrying the session's retries too
+        self.assertEqual(self.server.requests, 3)
+
+    def test_responses_cached_per_user(self):
+        cache = MemoryResponseCache()
+        apis = []
+        for username in ["cached-user-a", "cached-user-b"]:
+            session_provider = StubSessionProvider()
+            session_provider.username = username
+            api = BaseballApi.Builder().username(username).response_cache(cache).build()
+            api.session_provider = session_provider
+            apis.append(api)
+
+        apis[0]._espn_get(self.url, check_cache=False)
+        self.assertEqual(len(cache), 0)
+        apis[0]._espn_get(self.url)
+        apis[0]._espn_get(self.url)
+        self.assertEqual(self.server.requests, 2)
+        # another user may not be allowed to see the first user's response
+        apis[1]._espn_get(self.url)
+        self.assertEqual(self.server.requests, 3)
@@ -1,5 +1,5 @@
 import unittest
-from lineup import Lineup, BaseballSlot
+from lineup import Lineup, LineupDistances, BaseballSlot
 from lineup_settings import LineupSettings
 from lineup_transition import LineupTransition
 from test.test_player import PlayerTest
@@ -158,3 +158,71 @@ class LineupTest(unittest.TestCase):
             )
             in transitions
         )
+
+    def test_possible_lineups_memoized_matches_exhaustive(self):
+        lineup_settings = LineupSettings(
+            {
+                BaseballSlot.CATCHER: 0,
+                BaseballSlot.FIRST: 1,
+                BaseballSlot.SECOND: 0,
+                BaseballSlot.THIRD: 0,
+                BaseballSlot.SHORT: 0,
+                BaseballSlot.MIDDLE_INFIELD: 1,
+                BaseballSlot.CORNER_INFIELD: 0,
+                BaseballSlot.OUTFIELD: 1,
+                BaseballSlot.UTIL: 1,
+            }
+        )
+        memoized = {
+            l.starters(): len(self.simple_lineup.transitions(l))
+            for l in self.simple_lineup.possible_lineups(
+                lineup_settings, BaseballSlot.hitting_slots(), memoize=True
+            )
+        }
+        exhaustive = {
+            l.starters(): len(self.simple_lineup.transitions(l))
+            for l in self.simple_lineup.possible_lineups(
+                lineup_settings, BaseballSlot.hitting_slots(), memoize=False
+            )
+        }
+        self.assertEqual(memoized, exhaustive)
+
+    def test_possible_lineups_streamed(self):
+        info = dict()
+        lineup_settings = LineupSettings(
+            {
+                BaseballSlot.CATCHER: 0,
+                BaseballSlot.FIRST: 1,
+                BaseballSlot.SECOND: 0,
+                BaseballSlot.THIRD: 0,
+                BaseballSlot.SHORT: 0,
+                BaseballSlot.MIDDLE_INFIELD: 1,
+                BaseballSlot.CORNER_INFIELD: 0,
+                BaseballSlot.OUTFIELD: 2,
+                BaseballSlot.UTIL: 1,
+            }
+        )
+        lineups = self.simple_lineup.possible_lineups(
+            lineup_settings, BaseballSlot.hitting_slots(), search_info=info
+        )
+        self.assertIsNotNone(next(lineups))
+        # the first lineup comes before the search is done
+        self.assertEqual(info, dict())
+        self.assertEqual(len(list(lineups)) + 1, info["starters"])
+
+    def test_distances_memoized(self):
+        l1_dict = self.empty_lineup_dict.copy()
+        l1_dict[BaseballSlot.BENCH] = [PlayerTest.merrifield]
+        l1_dict[BaseballSlot.OUTFIELD] = [PlayerTest.yelich]
+        l1 = Lineup(l1_dict, BaseballSlot)
+
+        l2_dict = self.empty_lineup_dict.copy()
+        l2_dict[BaseballSlot.OUTFIELD] = [PlayerTest.merrifield]
+        l2_dict[BaseballSlot.BENCH] = [PlayerTest.yelich]
+        l2 = Lineup(l2_dict, BaseballSlot)
+
+        distances = LineupDistances(l1)
+        self.assertEqual(distances.distance(l2), 2)
+        self.assertEqual(distances.distance(l1), 0)
+        self.assertEqual(distances.transitions(l2), l1.transitions(l2))
+        self.assertEqual((distances.hits, distances.misses), (1, 2))
@@ -1,20 +1,87 @@
+import random
 import unittest
 
+import numpy as np
+
 from espn.baseball.baseball_position import BaseballPosition
+from espn.baseball.baseball_slot import BaseballSlot
+from espn.baseball.baseball_stat import BaseballStat
 from optimize import lineup_optimizer
+from optimize.lineup_total import LineupTotals
+from scoring_setting import ScoringSetting
+from stats import Stats
 from test.test_lineup import LineupTest
+from test.test_lineup_total import LineupTotalsTest
 from test.test_player import PlayerTest
 
 
 class MockEspn:
     def __init__(self, prob_pitcher_ids):
         self.prob_pitcher_ids = prob_pitcher_ids
+        self.requested = []
+
+    def probable_pitchers(self, player_ids):
+        self.requested.append(list(player_ids))
+        return {i for i in player_ids if i in self.prob_pitcher_ids}
+
+
+def threshold_loop_best_lineups(candidates, scoring_settings):
+    """
+    The original best_lineups: lowers the threshold one step at a time, re-filtering every
+    candidate at each step until some pass.
+    """
+    max_values = list()
+    for setting in scoring_settings:
+        values = candidates.values_for_stat(setting.stat)
+        max_values.append((setting, lineup_optimizer.best_value(values, setting)))
+    threshold = 1.0
+    passing = np.zeros(len(candidates), dtype=bool)
+    while not passing.any():
+        threshold -= lineup_optimizer.THRESHOLD_STEP
+        passing = lineup_optimizer.candidates_above_threshold(
+            candidates, max_values, threshold
+        )
+    return candidates.subset(passing)
+
+
+def random_totals(seed):
+    rand = random.Random(seed)
+    lineup = LineupTest.simple_lineup
+    projections = dict()
+    for player in lineup.players():
+        at_bats = rand.uniform(2.5, 4.5)
+        walks = rand.uniform(0.0, 0.8)
+        projections[player.name] = Stats(
+            {
+                BaseballStat.AB: round(at_bats, 2),
+                BaseballStat.BB: round(walks, 2),
+                BaseballStat.PA: round(at_bats + walks, 2),
+                BaseballStat.H: round(at_bats * rand.uniform(0.2, 0.32), 2),
+                BaseballStat.HR: round(rand.uniform(0.0, 0.3), 2),
+                BaseballStat.R: round(rand.uniform(0.3, 0.8), 2),
+                BaseballStat.SB: round(rand.uniform(0.0, 0.2), 2),
+            },
+            BaseballStat,
+        )
+    return LineupTotals.totals_from_projections(
+        lineup.possible_lineups(LineupTotalsTest.settings, BaseballSlot.hitting_slots()),
+        projections,
+    )
+
 
-    def is_probable_pitcher(self, espn_id):
-        return espn_id in self.prob_pitcher_ids
+def starter_sets(totals):
+    return {lineup.starters() for lineup in totals.lineups}
 
 
 class TestLineupOptimizer(unittest.TestCase):
+    hitting_settings = [
+        ScoringSetting(BaseballStat.H, False, 0.0),
+        ScoringSetting(BaseballStat.HR, False, 0.0),
+        ScoringSetting(BaseballStat.R, False, 0.0),
+        ScoringSetting(BaseballStat.SB, False, 0.0),
+        ScoringSetting(BaseballStat.OBP, False, 0.0),
+    ]
+
     def test_must_start_pitchers(self):
         l = LineupTest.simple_lineup
         paddack = PlayerTest.paddack
@@ -34,6 +101,11 @@ class TestLineupOptimizer(unittest.TestCase):
         # includes only probable starters and relievers
         self.assertEqual(len(must_starts), len(relievers) + 1)
 
+        # every pitcher is checked in one request
+        pitchers = [p for p in l.players() if p.can_play(BaseballSlot.PITCHER)]
+        self.assertEqual(1, len(mock_espn.requested))
+        self.assertCountEqual([p.espn_id for p in pitchers], mock_espn.requested[0])
+
     def test_benchable_pitchers(self):
         l = LineupTest.simple_lineup
         must_start = {PlayerTest.paddack}
@@ -52,3 +124,41 @@ class TestLineupOptimizer(unittest.TestCase):
                 PlayerTest.smith,
             },
         )
+
+    def test_best_lineups_matches_threshold_loop(self):
+        for seed in range(5):
+            totals = random_totals(seed)
+            expected = threshold_loop_best_lineups(totals, self.hitting_settings)
+            result = lineup_optimizer.best_lineups(totals, self.hitting_settings)
+            self.assertEqual(starter_sets(result), starter_sets(expected))
+
+    def test_best_lineups_matches_threshold_loop_with_ties(self):
+        totals = random_totals(2)
+        # every lineup twice, so that several candidates pass at once
+        doubled = totals.subset(np.repeat(np.arange(len(totals)), 2))
+        expected = threshold_loop_best_lineups(doubled, self.hitting_settings)
+        result = lineup_optimizer.best_lineups(doubled, self.hitting_settings)
+        self.assertEqual(len(result), len(expected))
+        self.assertEqual(len(result), 2)
+
+    def test_best_lineups_none_pass(self):
+        totals = random_totals(0)
+        # no lineup can have fewer at bats than a fraction of the fewest, at any threshold
+        settings = self.hitting_settings + [ScoringSetting(BaseballStat.AB, True, 0.0)]
+        result = lineup_optimizer.best_lineups(totals, settings)
+        self.assertEqual(len(result), len(totals))
+
+    def test_pareto_frontier(self):
+        totals = random_totals(1)
+        frontier = lineup_optimizer.pareto_frontier(totals, self.hitting_settings)
+        values = np.column_stack(
+            [totals.values_for_stat(s.stat) for s in self.hitting_settings]
+        )
+        expected = set()
+        for i, row in enumerate(values):
+            dominated = any(
+                (other >= row).all() and (other > row).any() for other in values
+            )
+            if not dominated:
+                expected.add(totals.lineups[i].starters())
+        self.assertEqual(starter_sets(frontier), expected)
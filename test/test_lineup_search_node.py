@@ -1,7 +1,7 @@
 import unittest
 
 from espn.baseball.baseball_slot import BaseballSlot
-from lineup import LineupSearchNode, Lineup
+from lineup import LineupSearchNode, Lineup, RosterIndex
 from lineup_settings import LineupSettings
 from player import Player
 
@@ -13,11 +13,13 @@ class Test(unittest.TestCase):
     )
 
     empty_lineup = Lineup(dict(), BaseballSlot)
-    basic_node = LineupSearchNode(empty_lineup, [rizzo], {BaseballSlot.FIRST})
+    basic_node = LineupSearchNode.initial(
+        RosterIndex([rizzo], [BaseballSlot.FIRST], empty_lineup)
+    )
     simple_settings = LineupSettings({BaseballSlot.FIRST: 1})
 
-    two_firsts_left_node = LineupSearchNode(
-        empty_lineup, [rizzo, goldschmidt], {BaseballSlot.FIRST}
+    two_firsts_left_node = LineupSearchNode.initial(
+        RosterIndex([rizzo, goldschmidt], [BaseballSlot.FIRST], empty_lineup)
     )
 
     def test_successors_one_player(self):
@@ -26,6 +28,7 @@ class Test(unittest.TestCase):
         successor = result[0]
         self.assertEqual(len(successor.players_left), 0)
         self.assertEqual(successor.lineup.starters(), {self.rizzo})
+        self.assertTrue(successor.all_slots_filled())
 
     def test_successors_two_players(self):
         result = self.two_firsts_left_node.successors(self.simple_settings)
@@ -41,3 +44,21 @@ class Test(unittest.TestCase):
         self.assertNotEqual(s0rem, s0first)
         self.assertNotEqual(s1rem, s1first)
         self.assertEqual(s0rem, s1first)
+
+    def test_successors_count_transitions(self):
+        current = Lineup({BaseballSlot.FIRST: [self.rizzo]}, BaseballSlot)
+        node = LineupSearchNode.initial(
+            RosterIndex([self.rizzo, self.goldschmidt], [BaseballSlot.FIRST], current)
+        )
+        transitions = {
+            s.lineup.player_dict[BaseballSlot.FIRST][0]: s.transitions
+            for s in node.successors(self.simple_settings)
+        }
+        self.assertEqual(transitions, {self.rizzo: 0, self.goldschmidt: 1})
+
+    def test_successors_not_enough_players(self):
+        settings = LineupSettings({BaseballSlot.FIRST: 3})
+        result = self.two_firsts_left_node.successors(settings)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].num_placed, 0)
+        self.assertEqual(len(result[0].players_left), 2)
@@ -1,7 +1,9 @@
 import operator
 import unittest
 
-from optimize.lineup_total import LineupTotal
+from espn.baseball.baseball_slot import BaseballSlot
+from lineup_settings import LineupSettings
+from optimize.lineup_total import LineupTotal, LineupTotals
 from stats import Stats
 from espn.baseball.baseball_stat import BaseballStat
 from test.test_lineup import LineupTest
@@ -34,3 +36,76 @@ class LineupTotalTest(unittest.TestCase):
         more_hits_lt = LineupTotal(LineupTest.simple_lineup, more_hits)
         self.assertFalse(self.lt1.compare(more_hits_lt, BaseballStat.H, operator.gt))
         self.assertTrue(self.lt1.compare(more_hits_lt, BaseballStat.H, operator.lt))
+
+
+class LineupTotalsTest(unittest.TestCase):
+    settings = LineupSettings(
+        {
+            BaseballSlot.CATCHER: 1,
+            BaseballSlot.FIRST: 1,
+            BaseballSlot.SECOND: 1,
+            BaseballSlot.THIRD: 1,
+            BaseballSlot.SHORT: 1,
+            BaseballSlot.MIDDLE_INFIELD: 1,
+            BaseballSlot.CORNER_INFIELD: 1,
+            BaseballSlot.OUTFIELD: 5,
+            BaseballSlot.UTIL: 1,
+        }
+    )
+
+    @staticmethod
+    def projections(players):
+        projections = dict()
+        for i, player in enumerate(players):
+            projections[player.name] = Stats(
+                {
+                    BaseballStat.AB: 3.0 + i % 3,
+                    BaseballStat.H: 0.7 + (i % 5) * 0.13,
+                    BaseballStat.BB: 0.25 * (i % 4),
+                    BaseballStat.PA: 3.5 + i % 3 + 0.25 * (i % 4),
+                    BaseballStat.HR: 0.05 * (i % 7),
+                    BaseballStat.R: 0.31 * (i % 3),
+                },
+                BaseballStat,
+            )
+        return projections
+
+    def test_values_match_lineup_total(self):
+        lineup = LineupTest.simple_lineup
+        projections = self.projections(lineup.players())
+        lineups = list(
+            lineup.possible_lineups(self.settings, BaseballSlot.hitting_slots())
+        )
+        totals = LineupTotals.totals_from_projections(lineups, projections)
+
+        self.assertEqual(len(totals), len(lineups))
+        for stat in [
+            BaseballStat.PA,
+            BaseballStat.H,
+            BaseballStat.R,
+            BaseballStat.AVG,
+            BaseballStat.OBP,
+        ]:
+            values = totals.values_for_stat(stat)
+            for i, possible in enumerate(lineups):
+                expected = LineupTotal.total_from_projections(
+                    possible, projections
+                ).stats.value_for_stat(stat)
+                self.assertAlmostEqual(values[i], expected, places=6)
+
+    def test_subset_and_total(self):
+        lineup = LineupTest.simple_lineup
+        projections = self.projections(lineup.players())
+        totals = LineupTotals.totals_from_projections(
+            lineup.possible_lineups(self.settings, BaseballSlot.hitting_slots()),
+            projections,
+        )
+        hits = totals.values_for_stat(BaseballStat.H)
+        subset = totals.subset(hits > hits.mean())
+
+        self.assertEqual(len(subset), sum(hits > hits.mean()))
+        total = subset.total(0)
+        self.assertEqual(
+            total.stats.value_for_stat(BaseballStat.H),
+            subset.values_for_stat(BaseballStat.H)[0],
+        )
@@ -0,0 +1,174 @@
+import gzip
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from espn.football.football_position import FootballPosition
+from footballdiehards.api import FbDieHardsApi
+from scraping.page_cache import CachedPage, PageCache, PageNotCapturedException, page_key
+from test.test_response_cache import FakeClock
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, data=None, headers=None):
+        self.requests.append((method, url, data, headers))
+        return self.responses.pop(0)
+
+
+FB_DIE_HARDS_PAGE = """
+<table>
+<tr><th>FanDuel Salaries</th></tr>
+<tr><th>Name</th><th>Pos</th><th>Team</th><th>Opp</th><th>Salary</th><th>Proj</th></tr>
+<tr><td>Josh Allen</td><td>QB</td><td>BUF</td><td>MIA</td><td>$8800</td><td>24.5</td></tr>
+<tr><td>Injured Guy</td><td>RB</td><td>BUF</td><td>MIA</td><td>$4500</td><td>-</td></tr>
+<tr><td>Tyreek Hill</td><td>WR</td><td>MIA</td><td>BUF</td><td>$8500</td><td>17.1</td></tr>
+</table>
+"""
+
+
+class PageCacheTest(unittest.TestCase):
+    url = "https://www.fantasypros.com/mlb/projections/hitters.php"
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def cache(self, offline=False):
+        return PageCache(
+            self.dir.name, ttls={"fantasypros": 100}, default_ttl=10, offline=offline,
+            clock=self.clock,
+        )
+
+    def test_key_includes_form_data_and_variant(self):
+        self.assertNotEqual(
+            page_key("POST", self.url, {"page": 1}), page_key("POST", self.url, {"page": 2})
+        )
+        self.assertNotEqual(
+            page_key("GET", self.url, variant=[1, 2]), page_key("GET", self.url, variant=[1, 3])
+        )
+        self.assertEqual(
+            page_key("POST", self.url, {"a": 1, "b": 2}),
+            page_key("POST", self.url, {"b": 2, "a": 1}),
+        )
+
+    def test_uses_page_until_ttl_passes(self):
+        cache = self.cache()
+        session = FakeSession(FakeResponse(200, "<p>1</p>"), FakeResponse(200, "<p>2</p>"))
+        self.assertEqual(cache.get("fantasypros", self.url, session), "<p>1</p>")
+        self.clock.now += 99
+        self.assertEqual(cache.get("fantasypros", self.url, session), "<p>1</p>")
+        self.assertEqual(len(session.requests), 1)
+
+        self.clock.now += 1
+        self.assertEqual(cache.get("fantasypros", self.url, session), "<p>2</p>")
+        self.assertEqual((cache.metrics.hits, cache.metrics.fetched), (1, 2))
+
+    def test_ttl_per_source(self):
+        cache = self.cache()
+        self.assertEqual(cache.ttl("fantasypros"), 100)
+        self.assertEqual(cache.ttl("numberfire"), 10)
+
+    def test_revalidates_with_etag_and_last_modified(self):
+        cache = self.cache()
+        headers = {"ETag": '"abc"', "Last-Modified": "Sat, 09 Apr 2022 10:00:00 GMT"}
+        session = FakeSession(
+            FakeResponse(200, "<p>1</p>", headers), FakeResponse(304), FakeResponse(304)
+        )
+        cache.get("fantasypros", self.url, session)
+        self.clock.now += 100
+        self.assertEqual(cache.get("fantasypros", self.url, session), "<p>1</p>")
+        self.assertEqual(
+            session.requests[1][3],
+            {"If-None-Match": '"abc"', "If-Modified-Since": "Sat, 09 Apr 2022 10:00:00 GMT"},
+        )
+        # revalidating starts the page's TTL again
+        self.clock.now += 99
+        cache.get("fantasypros", self.url, session)
+        self.assertEqual(len(session.requests), 2)
+        self.assertEqual((cache.metrics.hits, cache.metrics.revalidated), (1, 1))
+
+    def test_stores_gzipped_on_disk(self):
+        self.cache().get("fantasypros", self.url, FakeSession(FakeResponse(200, "<p>1</p>")))
+        (path,) = (Path(self.dir.name) / "fantasypros").iterdir()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["text"], "<p>1</p>")
+        self.assertEqual(
+            self.cache(offline=True).get("fantasypros", self.url, FakeSession()), "<p>1</p>"
+        )
+
+    def test_writers_of_the_same_page_do_not_collide(self):
+        cache = self.cache()
+        key = page_key("GET", self.url)
+        errors = []
+
+        def write(n):
+            try:
+                for _ in range(20):
+                    cache.store("fantasypros", key, CachedPage(self.url, f"<p>{n}</p>" * 1000, 0))
+            except OSError as e:
+                errors.append(e)
+
+        writers = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+        self.assertEqual([], errors)
+        self.assertIn(cache.load("fantasypros", key).text, {f"<p>{n}</p>" * 1000 for n in range(4)})
+        self.assertEqual(1, len(list((Path(self.dir.name) / "fantasypros").iterdir())))
+
+    def test_does_not_store_errors(self):
+        cache = self.cache()
+        session = FakeSession(FakeResponse(503, "busy"), FakeResponse(200, "<p>1</p>"))
+        self.assertEqual(cache.get("fantasypros", self.url, session), "busy")
+        self.assertEqual(cache.get("fantasypros", self.url, session), "<p>1</p>")
+
+    def test_keeps_rendered_page(self):
+        cache = self.cache()
+        session = FakeSession(FakeResponse(200, "<p></p>"))
+        rendered = cache.get("fantasypros", self.url, session, render=lambda r: "<p>1</p>")
+        self.assertEqual(rendered, "<p>1</p>")
+        self.assertEqual(cache.get("fantasypros", self.url, session), "<p>1</p>")
+
+    def test_offline_replays_captured_pages(self):
+        self.cache().capture("fantasypros", self.url, "<p>1</p>", method="POST", data={"a": 1})
+        self.clock.now += 1000
+        cache = self.cache(offline=True)
+        session = FakeSession()
+        self.assertEqual(
+            cache.get("fantasypros", self.url, session, method="POST", data={"a": 1}), "<p>1</p>"
+        )
+        with self.assertRaises(PageNotCapturedException):
+            cache.get("fantasypros", self.url, session)
+        self.assertEqual(session.requests, [])
+        self.assertEqual(cache.metrics.replayed, 1)
+
+    def test_scrapes_captured_page(self):
+        url = "https://www.footballdiehards.com/fantasyfootball/dailygames/FanDuel-Salary-data.cfm"
+        self.cache().capture("footballdiehards", url, FB_DIE_HARDS_PAGE)
+        players = FbDieHardsApi(self.cache(offline=True)).players()
+        self.assertEqual(
+            [("Josh Allen", FootballPosition.QUARTER_BACK, 8800, 24.5),
+             ("Tyreek Hill", FootballPosition.WIDE_RECEIVER, 8500, 17.1)],
+            [(p.player, p.position, p.salary, p.projection) for p in players],
+        )
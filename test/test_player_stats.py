@@ -0,0 +1,152 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from espn.baseball.baseball_api import BaseballApi
+from espn.http_session import RateLimiter
+from espn.response_cache import MemoryResponseCache
+
+
+def player_entry(player_id):
+    return {
+        "id": player_id,
+        "fullName": f"Player {player_id}",
+        "firstName": "Player",
+        "lastName": str(player_id),
+        "defaultPositionId": 5,
+        "eligibleSlots": [3, 7, 19, 12, 16, 17],
+        "proTeamId": 1,
+        "stats": [
+            {
+                "statSourceId": 0,
+                "statSplitTypeId": 1,
+                "seasonId": 2022,
+                "scoringPeriodId": 3,
+                "stats": {"5": float(player_id)},
+            }
+        ],
+    }
+
+
+class PlayerStatsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if "espn_s2=fresh" not in self.headers.get("Cookie", ""):
+                self.respond(401, {})
+                return
+            fantasy_filter = json.loads(self.headers["X-Fantasy-Filter"])
+            ids = fantasy_filter["players"]["filterIds"]["value"]
+            # give other requests the chance to overlap with this one
+            server.overlap.wait(0.05)
+            self.respond(200, {"players": [{"player": player_entry(i)} for i in ids]})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def respond(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StaleSessionProvider:
+    username = "player-stats-user"
+
+    def __init__(self):
+        self.logins = 0
+        self.lock = threading.Lock()
+
+    def get_session(self):
+        return "stale"
+
+    def refresh_session(self):
+        with self.lock:
+            self.logins += 1
+        return "fresh"
+
+
+class StubBaseballApi(BaseballApi):
+    def __init__(self, url, num_players):
+        super().__init__(StaleSessionProvider(), 0, 0, response_cache=MemoryResponseCache())
+        self.year = 2022
+        self.url = url
+        self.num_players = num_players
+
+    def _player_url(self):
+        return self.url
+
+    def _all_players(self):
+        return [{"id": i, "player": {}} for i in range(1, self.num_players + 1)]
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+
+
+class PlayerStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PlayerStatsHandler)
+        self.server.lock = threading.Lock()
+        self.server.overlap = threading.Event()
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/players"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_streams_every_player_concurrently(self):
+        api = StubBaseballApi(self.url, 12)
+        results = list(api.stream_player_stats(max_workers=4, requests_per_second=None))
+
+        self.assertEqual(sorted(p.espn_id for p, _ in results), list(range(1, 13)))
+        for player, stats in results:
+            self.assertEqual(player.name, f"Player {player.espn_id}")
+            self.assertEqual(list(stats.keys()), [3])
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLessEqual(self.server.max_in_flight, 4)
+        # every request was denied with the stale session at once, but only one logged in again
+        self.assertEqual(api.session_provider.logins, 1)
+
+    def test_player_stats_by_player(self):
+        api = StubBaseballApi(self.url, 3)
+        stats = api.player_stats(max_workers=2, requests_per_second=None)
+        self.assertEqual(sorted(p.espn_id for p in stats.keys()), [1, 2, 3])
+
+    def test_rate_limiter_spaces_requests(self):
+        fake_time = FakeTime()
+        limiter = RateLimiter(4.0, clock=fake_time.clock, sleep=fake_time.sleep)
+        for _ in range(3):
+            limiter.wait()
+        self.assertEqual(fake_time.slept, [0.25, 0.5])
+
+    def test_rate_limiter_unlimited(self):
+        fake_time = FakeTime()
+        limiter = RateLimiter(None, clock=fake_time.clock, sleep=fake_time.sleep)
+        for _ in range(3):
+            limiter.wait()
+        self.assertEqual(fake_time.slept, [])
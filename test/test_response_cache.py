@@ -0,0 +1,105 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from espn.response_cache import (
+    CachedResponse,
+    MemoryResponseCache,
+    SqliteResponseCache,
+    TtlPolicy,
+    cache_key,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ResponseCacheTest(unittest.TestCase):
+    url = "http://fantasy.espn.com/apis/v3/games/flb/seasons/2022/segments/0/leagues/1"
+    policy = TtlPolicy([("view=mSettings", 3600), ("view=mRoster", 60)], default_ttl=10)
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.dir.name) / "responses.db"
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def sqlite_cache(self, max_entries=100):
+        return SqliteResponseCache(
+            self.path, max_entries=max_entries, ttl_policy=self.policy, clock=self.clock
+        )
+
+    def test_key_includes_headers(self):
+        self.assertNotEqual(
+            cache_key("GET", self.url, {"X-Fantasy-Filter": "1"}, {}),
+            cache_key("GET", self.url, {"X-Fantasy-Filter": "2"}, {}),
+        )
+        self.assertNotEqual(
+            cache_key("GET", self.url, None, None), cache_key("POST", self.url, None, None)
+        )
+        self.assertEqual(
+            cache_key("GET", self.url, {"a": 1, "b": 2}, None),
+            cache_key("GET", self.url, {"b": 2, "a": 1}, None),
+        )
+        self.assertNotEqual(
+            cache_key("GET", self.url, None, None, "a"), cache_key("GET", self.url, None, None, "b")
+        )
+
+    def test_ttl_per_endpoint(self):
+        self.assertEqual(self.policy.ttl("GET", f"{self.url}?view=mSettings"), 3600)
+        self.assertEqual(self.policy.ttl("GET", f"{self.url}?view=mRoster"), 60)
+        self.assertEqual(self.policy.ttl("GET", self.url), 10)
+        self.assertEqual(self.policy.ttl("POST", f"{self.url}?view=mSettings"), 0)
+
+    def test_expires(self):
+        cache = self.sqlite_cache()
+        url = f"{self.url}?view=mRoster"
+        cache.put("GET", url, None, {}, CachedResponse(200, '{"a": 1}'))
+
+        self.clock.now += 59
+        self.assertEqual(cache.get("GET", url, None, {}).json(), {"a": 1})
+        self.clock.now += 1
+        self.assertIsNone(cache.get("GET", url, None, {}))
+        self.assertEqual(
+            (cache.metrics.hits, cache.metrics.misses, cache.metrics.expired), (1, 1, 1)
+        )
+
+    def test_survives_reopening(self):
+        url = f"{self.url}?view=mSettings"
+        self.sqlite_cache().put("GET", url, None, {}, CachedResponse(200, "[]"))
+        self.assertEqual(self.sqlite_cache().get("GET", url, None, {}).text, "[]")
+
+    def test_evicts_least_recently_used(self):
+        cache = self.sqlite_cache(max_entries=2)
+        for i in range(2):
+            cache.put("GET", f"{self.url}/{i}", None, {}, CachedResponse(200, str(i)))
+            self.clock.now += 1
+        # using the first makes the second the least recently used
+        cache.get("GET", f"{self.url}/0", None, {})
+        self.clock.now += 1
+        cache.put("GET", f"{self.url}/2", None, {}, CachedResponse(200, "2"))
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.metrics.evictions, 1)
+        self.assertIsNotNone(cache.get("GET", f"{self.url}/0", None, {}))
+        self.assertIsNone(cache.get("GET", f"{self.url}/1", None, {}))
+
+    def test_never_stores_posts(self):
+        cache = MemoryResponseCache(self.policy, self.clock)
+        cache.put("POST", self.url, None, {"a": 1}, CachedResponse(200, "{}"))
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate(self):
+        for cache in [MemoryResponseCache(self.policy, self.clock), self.sqlite_cache()]:
+            cache.put("GET", f"{self.url}?view=mRoster", None, {}, CachedResponse(200, "{}"))
+            cache.put("GET", "http://other", None, {}, CachedResponse(200, "{}"))
+            cache.invalidate(self.url)
+            self.assertEqual(len(cache), 1)
+            self.assertIsNotNone(cache.get("GET", "http://other", None, {}))
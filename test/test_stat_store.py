@@ -0,0 +1,107 @@
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+from espn.baseball.baseball_stat import BaseballStat
+from espn.football.football_stat import FootballStat
+from espn.stat_store import StatStore, migrate_pickles
+from stats import Stats
+
+
+def hits(value):
+    return Stats({BaseballStat.H: value, BaseballStat.AB: value * 4}, BaseballStat)
+
+
+class StatStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.dir.name) / "stats.db"
+        self.store = StatStore(123, 2022, self.db_path)
+
+    def tearDown(self):
+        self.store.close()
+        self.dir.cleanup()
+
+    def test_store_and_retrieve(self):
+        self.store.store_stats(hits(3.0), 1, 5)
+        self.store.store_stats(hits(4.0), 1, 6)
+        self.store.store_stats(hits(9.0), 2, 5)
+
+        stats = self.store.retrieve_stats(1)
+        self.assertEqual(sorted(stats.keys()), [5, 6])
+        self.assertEqual(stats[5].stat_dict, hits(3.0).stat_dict)
+        self.assertEqual(stats[6].stat_enum, BaseballStat)
+
+    def test_overwrites(self):
+        self.store.store_stats(hits(3.0), 1, 5)
+        self.store.store_stats(Stats({BaseballStat.HR: 1.0}, BaseballStat), 1, 5)
+        self.assertEqual(
+            self.store.retrieve_stats(1)[5].stat_dict, {BaseballStat.HR: 1.0}
+        )
+
+    def test_range_query(self):
+        self.store.append({(1, period): hits(float(period)) for period in range(1, 11)})
+        stats = self.store.stats_for_periods(1, 3, 5)
+        self.assertEqual(sorted(stats.keys()), [3, 4, 5])
+        self.assertEqual(stats[4].stat_dict[BaseballStat.H], 4.0)
+        self.assertEqual(sorted(self.store.stats_for_periods(1, 9).keys()), [9, 10])
+
+    def test_empty_stats_are_stored(self):
+        self.store.store_stats(Stats({}, FootballStat), 4, 2)
+        self.assertEqual(self.store.stored_periods(), {(4, 2)})
+        self.assertEqual(self.store.retrieve_stats(4)[2].stat_enum, FootballStat)
+
+    def test_separates_leagues_and_years(self):
+        self.store.store_stats(hits(3.0), 1, 5)
+        other_league = StatStore(456, 2022, self.db_path)
+        other_year = StatStore(123, 2021, self.db_path)
+        self.assertEqual(other_league.retrieve_league_stats(), {})
+        self.assertEqual(other_year.retrieve_league_stats(), {})
+        other_league.close()
+        other_year.close()
+
+    def test_league_stats(self):
+        self.store.append({(team, 1): hits(float(team)) for team in range(1, 4)})
+        league = self.store.retrieve_league_stats()
+        self.assertEqual(sorted(league.keys()), [1, 2, 3])
+        self.assertEqual(league[2][1].stat_dict[BaseballStat.H], 2.0)
+
+    def test_migrate_pickles(self):
+        stats_home = Path(self.dir.name) / "stats"
+        for team, period in [(1, 1), (1, 2), (2, 1)]:
+            team_dir = stats_home / "2022" / "123" / str(team)
+            team_dir.mkdir(parents=True, exist_ok=True)
+            (team_dir / f"{period}-stats.p").write_bytes(
+                pickle.dumps(hits(float(team * 10 + period)))
+            )
+
+        self.assertEqual(migrate_pickles(stats_home, self.db_path), 3)
+        self.assertEqual(self.store.stored_periods(), {(1, 1), (1, 2), (2, 1)})
+        self.assertEqual(
+            self.store.retrieve_stats(1)[2].stat_dict, hits(12.0).stat_dict
+        )
+
+    def test_missing_periods(self):
+        self.store.append({(team, period): hits(1.0) for team in [1, 2] for period in [1, 2, 4]})
+        self.store.store_stats(hits(1.0), 1, 3)
+        self.assertEqual(self.store.missing_periods(1, 5), [3, 5])
+        self.assertEqual(self.store.missing_periods(1, 2, team_ids={1, 2, 3}), [1, 2])
+
+    def test_missing_periods_empty_store(self):
+        self.assertEqual(self.store.missing_periods(2, 4), [2, 3, 4])
+
+    def test_watermark(self):
+        self.assertIsNone(self.store.watermark())
+        self.store.append({(team, period): hits(1.0) for team in [1, 2] for period in [1, 2, 4]})
+        self.assertEqual(self.store.update_watermark(), 2)
+        self.store.append({(team, 3): hits(1.0) for team in [1, 2]})
+        self.assertEqual(self.store.update_watermark(), 4)
+        self.assertEqual(StatStore(123, 2022, self.db_path).watermark(), 4)
+
+    def test_watermark_past_complete_periods(self):
+        # team 3 joined the league in period 3
+        self.store.append({(team, period): hits(1.0) for team in [1, 2] for period in [1, 2]})
+        self.store.append({(team, period): hits(1.0) for team in [1, 2, 3] for period in [3, 4]})
+        self.assertEqual(self.store.update_watermark(), 0)
+        self.assertEqual(self.store.update_watermark(complete_periods=[1, 2]), 4)
@@ -1,7 +1,22 @@
+import copyreg
+import pickle
 import unittest
 
 from stats import Stats
 from espn.baseball.baseball_stat import BaseballStat
+from espn.basketball.basketball_stat import BasketballStat
+
+
+class DictBackedStats:
+    def __init__(self, stat_dict):
+        self.stat_dict = stat_dict
+
+    def __reduce__(self):
+        # what a Stats pickled before it was array-backed holds: its class and its __dict__
+        return copyreg._reconstructor, (Stats, object, None), {
+            "stat_dict": self.stat_dict,
+            "stat_enum": BaseballStat,
+        }
 
 
 class StatsTest(unittest.TestCase):
@@ -33,6 +48,26 @@ class StatsTest(unittest.TestCase):
         self.assertEqual(StatsTest.s1.value_for_stat(BaseballStat.AVG), 0.250)
         self.assertEqual(StatsTest.s1.value_for_stat(BaseballStat.OBP), 0.300)
 
+    def test_ratio_stats_with_unpickled_registry(self):
+        # as in a worker process, whose copy of a pickled registry is not the shared one
+        stats = self.s1.copy()
+        stats.registry = pickle.loads(pickle.dumps(stats.registry))
+
+        self.assertEqual(stats.average(), 0.250)
+        self.assertEqual(stats.obp(), 0.300)
+        self.assertEqual(stats.era(), 0.0)
+
+    def test_ratio_stats_only_of_baseball_stats(self):
+        with self.assertRaises(KeyError):
+            Stats({}, BasketballStat).average()
+
+    def test_get_stat_of_another_enum(self):
+        stats = Stats({BaseballStat.H: 1.0}, BaseballStat)
+        self.assertEqual("default", stats.get(BasketballStat.POINTS, "default"))
+        self.assertEqual("default", stats.stat_dict.get(BasketballStat.POINTS, "default"))
+        self.assertIsNone(stats.stat_dict.get(BasketballStat.POINTS))
+        self.assertEqual(1.0, stats.stat_dict.get(BaseballStat.H))
+
     def test_addition(self):
         added = self.s1 + self.s2
 
@@ -40,3 +75,46 @@ class StatsTest(unittest.TestCase):
         self.assertEqual(added.value_for_stat(BaseballStat.AB), 43.0)
         self.assertEqual(added.value_for_stat(BaseballStat.PA), 54.0)
         self.assertEqual(added.value_for_stat(BaseballStat.AVG), round(11.0 / 43.0, 3))
+
+    def test_addition_drops_ratio_stats(self):
+        with_average = Stats({BaseballStat.H: 1.0, BaseballStat.AVG: 0.5}, BaseballStat)
+        added = with_average + self.s2
+
+        self.assertNotIn(BaseballStat.AVG, added.stat_dict)
+        self.assertEqual(added.stat_dict[BaseballStat.HR], 0.0)
+        self.assertEqual(len(added.stat_dict), len(BaseballStat.sum_stats()))
+
+    def test_iadd_matches_addition(self):
+        total = Stats({BaseballStat.AVG: 0.5}, BaseballStat)
+        total.iadd(self.s1).iadd(self.s2)
+
+        self.assertEqual(total.stat_dict, (self.s1 + self.s2).stat_dict)
+        self.assertEqual(self.s1.stat_dict[BaseballStat.H], 10.0)
+
+    def test_multiplication_keeps_present_sum_stats(self):
+        scaled = Stats({BaseballStat.H: 2.0, BaseballStat.OBP: 0.4}, BaseballStat) * 1.5
+
+        self.assertEqual(scaled.stat_dict, {BaseballStat.H: 3.0})
+        self.assertEqual((self.s1 / 2).value_for_stat(BaseballStat.AB), 20.0)
+
+    def test_stat_dict_view(self):
+        stats = Stats({BaseballStat.H: 1.0, BaseballStat.HR: None}, BaseballStat)
+        stats.stat_dict[BaseballStat.AB] = 4.0
+
+        self.assertEqual(stats.stat_dict, {BaseballStat.H: 1.0, BaseballStat.AB: 4.0})
+        self.assertEqual(stats.stat_dict.get(BaseballStat.HR), None)
+        self.assertEqual(stats.value_for_stat(BaseballStat.AVG), 0.25)
+        del stats.stat_dict[BaseballStat.H]
+        self.assertEqual(list(stats.stat_dict.items()), [(BaseballStat.AB, 4.0)])
+
+    def test_pickle_round_trip(self):
+        loaded = pickle.loads(pickle.dumps(self.s1))
+
+        self.assertEqual(loaded.stat_dict, self.s1.stat_dict)
+        self.assertEqual(loaded.stat_enum, BaseballStat)
+
+    def test_loads_dict_backed_pickle(self):
+        loaded = pickle.loads(pickle.dumps(DictBackedStats({BaseballStat.H: 3.0})))
+
+        self.assertIsInstance(loaded, Stats)
+        self.assertEqual(loaded.stat_dict, {BaseballStat.H: 3.0})
@@ -1,5 +1,8 @@
 import unittest
 from espn.baseball.baseball_api import BaseballApi
+from espn.baseball.baseball_stat import BaseballStat
+from espn.football.football_stat import FootballStat
+from espn.stat_registry import stat_registry
 
 
 class Test(unittest.TestCase):
@@ -8,3 +11,19 @@ class Test(unittest.TestCase):
         stats = BaseballApi(None, 0, 0).create_stats(stats_ex)
         self.assertEqual(stats.home_runs(), 2.0)
         self.assertEqual(stats.whip(), 1.111)
+
+    def test_create_stats_from_json_ids(self):
+        stats_ex = {"0": 4.0, "1": "1", "3": 7.0, "999": 2.0}
+        stats = BaseballApi(None, 0, 0).create_stats(stats_ex)
+        self.assertEqual(stats.stat_dict, {BaseballStat.AB: 4.0, BaseballStat.H: 1.0})
+        self.assertEqual(stats.average(), 0.25)
+
+    def test_registry_matches_enum(self):
+        registry = stat_registry(BaseballStat)
+        self.assertEqual(registry.sum_stats, BaseballStat.sum_stats())
+        self.assertEqual(registry.espn_stats["41"], BaseballStat.espn_stat_to_stat(41))
+        self.assertEqual(registry.rounding_digits[BaseballStat.OBP], 3)
+        self.assertEqual(
+            registry.hitting_stats, {s for s in BaseballStat if s.is_hitting_stat()}
+        )
+        self.assertEqual(stat_registry(FootballStat).sum_stats, set(FootballStat))
@@ -0,0 +1,148 @@
+import tempfile
+import unittest
+
+from espn.baseball.baseball_stat import BaseballStat
+from espn.basketball.basketball_stat import BasketballStat
+from fantasypros.api import FantasyProsApi
+from fantasysp.api import FantasySPApi
+from numberfire.api import NumberFireApi
+from scraping.page_cache import PageCache
+from scraping.tables import Column, Selector, Table
+
+PAGE = """
+<html><body>
+<table id="projections" class="table sortable">
+<thead><tr><th>Player</th><th>HR</th><th>AVG</th></tr></thead>
+<tbody>
+<tr class="player"><td><a class="name" href="/1">Aaron Judge</a> NYY</td>
+<td> 45 </td><td>.290</td></tr>
+<tr class="ad"><td colspan="3">Advertisement</td></tr>
+<tr class="player"><td><a class="name" href="/2">Juan Soto</a> SD</td><td>31</td></tr>
+</tbody>
+</table>
+<table><tbody><tr class="player"><td><a class="name">Not A Projection</a></td></tr></tbody></table>
+</body></html>
+"""
+
+
+class SelectorTest(unittest.TestCase):
+    def test_rejects_unsupported_selectors(self):
+        for text in ["", "tr > td", "a[href]", "tr:first-child", "#a#b"]:
+            with self.assertRaises(ValueError):
+                Selector(text)
+
+    def test_matches_inside_ancestors(self):
+        rows = list(Table("table#projections tbody tr.player", [Column("name", "a")]).rows(PAGE))
+        self.assertEqual(["Aaron Judge", "Juan Soto"], [row.name for row in rows])
+        rows = list(Table("table.sortable.table tr", [Column("name", "a")]).rows(PAGE))
+        self.assertEqual(4, len(rows))
+        self.assertEqual([], list(Table("table.missing tr", [Column("name", "a")]).rows(PAGE)))
+
+
+class TableTest(unittest.TestCase):
+    columns = [
+        Column("name", "a.name", required=True),
+        Column("hr", 1, int),
+        Column("avg", 2, float),
+    ]
+
+    def test_typed_rows(self):
+        rows = list(Table("tbody tr", self.columns).rows(PAGE))
+        self.assertEqual(
+            [("Aaron Judge", 45, 0.29), ("Juan Soto", 31, None), ("Not A Projection", None, None)],
+            rows,
+        )
+        self.assertEqual(45, rows[0].hr)
+
+    def test_skips_rows_without_required_value(self):
+        def not_an_ad(text):
+            if text == "Advertisement":
+                raise ValueError(text)
+            return text
+
+        # the advertisement's cell would not convert, but is never converted
+        columns = [Column("name", "a.name", required=True), Column("first", 0, not_an_ad)]
+        self.assertEqual(3, len(list(Table("tr", columns).rows(PAGE))))
+        columns = [Column("name", 0, lambda text: None if "Judge" in text else text, required=True)]
+        self.assertNotIn("Judge", str(list(Table("tbody tr", columns).rows(PAGE))))
+
+    def test_stops_at_end_of_table(self):
+        rows = Table("tbody tr", self.columns, until="tbody").rows(PAGE)
+        self.assertEqual(["Aaron Judge", "Juan Soto"], [row.name for row in rows])
+
+    def test_skips_header_rows(self):
+        rows = list(Table("tr", [Column("first", 0)], skip=2).rows(PAGE))
+        self.assertEqual(
+            ["Advertisement", "Juan Soto SD", "Not A Projection"], [r.first for r in rows]
+        )
+
+
+# pylint: disable=protected-access
+class ScraperTablesTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def captured(self, source, url, html, variant=None):
+        PageCache(self.dir.name).capture(source, url, html, variant=variant)
+        return PageCache(self.dir.name, offline=True)
+
+    def test_fantasy_pros_year_projections(self):
+        cells = "".join(f"<td>{i}</td>" for i in range(1, 14))
+        html = (
+            '<table><tbody>'
+            f'<tr><td><a class="player-name">Mookie Betts</a> (LAD - OF)</td>{cells}</tr>'
+            f'<tr><td>Unlinked Player</td>{cells}</tr>'
+            '</tbody></table>'
+        )
+        page_cache = self.captured(
+            "fantasypros", "https://www.fantasypros.com/mlb/projections/hitters.php", html
+        )
+        projections = FantasyProsApi(page_cache).year_hitter_projections()
+        self.assertEqual(["Mookie Betts"], list(projections))
+        stats = projections["Mookie Betts"]
+        self.assertEqual(1, stats.stat_dict[BaseballStat.AB])
+        self.assertEqual(11, stats.stat_dict[BaseballStat.BB])
+        self.assertEqual(12, stats.stat_dict[BaseballStat.PA])
+
+    def test_number_fire_projections(self):
+        stats = {"pa": 4.5, "bb": 0.5, "1b": 0.7, "2b": 0.2, "3b": 0.1, "hr": 0.3, "r": 0.6,
+                 "rbi": 0.7, "sb": 0.1}
+        cells = "".join(
+            f'<td class="stat {cls}">\n  {value}\n</td>' for cls, value in stats.items()
+        )
+        html = (
+            '<table><tbody class="other"><tr><td class="pa">0</td></tr></tbody>'
+            '<tbody class="stat-table__body">'
+            '<tr><td><a class="full">Freddie Freeman</a><a class="abbrev">F. Freeman</a></td>'
+            f'{cells}</tr>'
+            '</tbody></table>'
+        )
+        page_cache = self.captured(
+            "numberfire", NumberFireApi.baseball_url, html, variant=[None, None]
+        )
+        projections = NumberFireApi(page_cache)._get_hitter_projections_from_current_page()
+        stat_dict = projections["Freddie Freeman"].stat_dict
+        self.assertAlmostEqual(1.3, stat_dict[BaseballStat.H])
+        self.assertAlmostEqual(4.0, stat_dict[BaseballStat.AB])
+        self.assertAlmostEqual(0.7, stat_dict[BaseballStat.RBI])
+
+    def test_fantasy_sp_players(self):
+        values = {cls: 10.0 for cls in FantasySPApi.td_class_to_stat}
+        values.update({"proj-ftper": 80.0, "proj-ftm": 4.0})
+        cells = "".join(f'<td class="{cls}">{value}</td>' for cls, value in values.items())
+        html = (
+            '<table class="stats"><tr class="projection-player"><td><a>Wrong</a></td></tr></table>'
+            '<table class="table sortable"><tr><th>Player</th></tr>'
+            f'<tr class="projection-player"><td><a>Nikola Jokic</a></td>{cells}</tr>'
+            '</table>'
+        )
+        page_cache = self.captured(
+            "fantasysp", "https://www.fantasysp.com/projections/basketball/daily/", html
+        )
+        (player,) = FantasySPApi(page_cache).players()
+        self.assertEqual("Nikola Jokic", player.name)
+        self.assertEqual(10.0, player.stats.stat_dict[BasketballStat.POINTS])
+        self.assertAlmostEqual(5.0, player.stats.stat_dict[BasketballStat.FTA])
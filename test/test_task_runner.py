@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from config.team_config import EspnTeamConfig
+from espn.async_espn_api import AsyncEspnApi
+from tasks.task import Task
+
+
+class FakeEspn:
+    year = 2022
+
+    def scoring_period_stats(self, scoring_period):
+        return {1: scoring_period, "thread": threading.current_thread().name}
+
+    def _private(self):
+        return "private"
+
+
+class CountingTask(Task):
+    def __init__(self):
+        super().__init__("user")
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.done = []
+
+    @staticmethod
+    def create(username):
+        return CountingTask()
+
+    def run(self):
+        self.run_for_teams(configs, self.run_team)
+
+    def start(self):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+    def finish(self, config):
+        with self.lock:
+            self.running -= 1
+            self.done.append(config.league_id)
+
+    def run_team(self, config):
+        self.start()
+        time.sleep(0.02)
+        self.finish(config)
+
+    async def run_team_async(self, config):
+        self.start()
+        await asyncio.sleep(0.02)
+        self.finish(config)
+
+
+configs = [EspnTeamConfig("user", league_id, 1) for league_id in range(6)]
+
+
+# pylint: disable=protected-access
+class TaskRunnerTest(unittest.TestCase):
+    def test_async_api_runs_methods_off_loop(self):
+        espn = AsyncEspnApi(FakeEspn())
+        result = asyncio.run(espn.scoring_period_stats(3))
+        self.assertEqual(result[1], 3)
+        self.assertNotEqual(result["thread"], threading.main_thread().name)
+        self.assertEqual(espn.year, 2022)
+        self.assertEqual(espn._private(), "private")
+
+    def test_runs_teams_concurrently_with_cap(self):
+        task = CountingTask()
+        task.run_for_teams(configs, task.run_team, max_concurrency=3)
+        self.assertEqual(sorted(task.done), list(range(6)))
+        self.assertEqual(task.max_running, 3)
+
+    def test_runs_every_team(self):
+        task = CountingTask.create("user")
+        task.run()
+        self.assertEqual(sorted(task.done), list(range(6)))
+        self.assertLessEqual(task.max_running, 4)
+
+    def test_runs_coroutines_with_cap(self):
+        task = CountingTask()
+        task.run_for_teams(configs, task.run_team_async, max_concurrency=2)
+        self.assertEqual(sorted(task.done), list(range(6)))
+        self.assertEqual(task.max_running, 2)
+
+    def test_runs_every_team_before_raising(self):
+        task = CountingTask()
+
+        def fail_first(config):
+            if config.league_id == 0:
+                raise ValueError("failed")
+            task.run_team(config)
+
+        with self.assertRaises(ValueError):
+            task.run_for_teams(configs, fail_first)
+        self.assertEqual(sorted(task.done), list(range(1, 6)))